@@ -0,0 +1,354 @@
+"""Benchmarks for simulation throughput, server latency, result writers and turn records.
+
+Everything runs against ``MockBackend``, so numbers reflect this codebase's overhead
+on top of a fixed, simulated provider latency rather than the provider itself.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable, Iterable
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from interviewer import (
+    DEFAULT_INTERVIEWER_SYSTEM_PROMPT,
+    DEFAULT_RESPONDENT_SYSTEM_PROMPT,
+    AgentConfig,
+    AgentResponse,
+    LLMCallInfo,
+    Message,
+    MockBackend,
+    Scheduler,
+    Simulation,
+    Transcript,
+    TranscriptWriter,
+    interview_plan,
+)
+from interviewer.metrics import percentile
+from interviewer.records import CallRecord, Reply, Turn, add_to_transcript
+
+Suite = Literal["simulation", "server", "writer", "records", "models"]
+SUITES: tuple[Suite, ...] = ("simulation", "server", "writer", "records", "models")
+
+
+class BenchResult(BaseModel):
+    """One point of a benchmark sweep.
+
+    A unit of work is one simulated interview (one row, for the writer suite).
+    Latencies are per LLM turn for ``simulation``, per LLM-backed HTTP request for ``server`` and
+    per row for ``writer``.
+    """
+
+    suite: Suite
+    num_simulations: int
+    max_turns: int
+    concurrency: int
+    seconds: float
+    sims_per_sec: float
+    turns: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    peak_rss_mib: float
+    peak_heap_mib: float | None = None
+    heap_kib_per_turn: float | None = None
+
+    @property
+    def key(self) -> tuple[str, int, int, int]:
+        return (self.suite, self.num_simulations, self.max_turns, self.concurrency)
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process so far, in MiB (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _configs(max_tokens: int = 200) -> tuple[AgentConfig, AgentConfig]:
+    return (
+        AgentConfig(system_prompt=DEFAULT_INTERVIEWER_SYSTEM_PROMPT, max_tokens=max_tokens),
+        AgentConfig(system_prompt=DEFAULT_RESPONDENT_SYSTEM_PROMPT, max_tokens=max_tokens),
+    )
+
+
+# Each suite runs one sweep point and returns (turns, per-unit latencies, elapsed seconds),
+# timing only the measured work and not its setup.
+Measurement = tuple[int, list[float], float]
+
+
+async def _run_simulations(
+    num_simulations: int, max_turns: int, concurrency: int, latency: float
+) -> Measurement:
+    """Run ``num_simulations`` mock interviews concurrently."""
+    interviewer_config, respondent_config = _configs()
+    scheduler = Scheduler(max_concurrency=concurrency)
+    sim = Simulation(scheduler=scheduler, backend=MockBackend(latency=latency, seed=0))
+    latencies: list[float] = []
+
+    async def run(sim_id: int) -> Transcript:
+        last = time.perf_counter()
+
+        def on_message(_msg) -> None:
+            nonlocal last
+            now = time.perf_counter()
+            latencies.append(now - last)
+            last = now
+
+        return await sim.run(
+            interviewer_config, respondent_config, max_turns=max_turns, on_message=on_message
+        )
+
+    turns = 0
+    start = time.perf_counter()
+    async for _, transcript in scheduler.as_completed(run, range(1, num_simulations + 1)):
+        turns += len(transcript.messages)
+    return turns, latencies, time.perf_counter() - start
+
+
+async def _run_server(
+    num_simulations: int, max_turns: int, concurrency: int, latency: float
+) -> Measurement:
+    """Drive ``/api/sessions/*`` in-process, one session per simulated interview."""
+    import httpx
+
+    from server.app import create_app
+
+    app = create_app(backend=MockBackend(latency=latency, seed=0))
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def post(url: str) -> dict:
+            start = time.perf_counter()
+            response = await client.post(url)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+            return response.json()
+
+        async def run(_: int) -> int:
+            session_id = (await client.post("/api/sessions")).json()["id"]
+            await post(f"/api/sessions/{session_id}/start")
+            for _ in range(max_turns):
+                await post(f"/api/sessions/{session_id}/simulate-turn")
+            await client.delete(f"/api/sessions/{session_id}")
+            return 1 + 2 * max_turns
+
+        turns = 0
+        scheduler = Scheduler(max_concurrency=concurrency)
+        start = time.perf_counter()
+        async for _, n in scheduler.as_completed(run, range(num_simulations)):
+            turns += n
+        return turns, latencies, time.perf_counter() - start
+
+
+async def _run_writer(
+    num_simulations: int, max_turns: int, concurrency: int, latency: float
+) -> Measurement:
+    """Write ``num_simulations`` copies of a mock transcript to CSV, then to JSONL."""
+    interviewer_config, respondent_config = _configs()
+    sim = Simulation(backend=MockBackend(seed=0))
+    transcript = await sim.run(interviewer_config, respondent_config, max_turns=max_turns)
+    latencies: list[float] = []
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        for suffix in (".csv", ".jsonl"):
+            with TranscriptWriter(Path(tmp) / f"results{suffix}") as writer:
+                for sim_id in range(1, num_simulations + 1):
+                    row_start = time.perf_counter()
+                    writer.write(sim_id, transcript)
+                    latencies.append(time.perf_counter() - row_start)
+    seconds = time.perf_counter() - start
+    return 2 * num_simulations * len(transcript.messages), latencies, seconds
+
+
+async def _run_turns(
+    num_simulations: int, max_turns: int, concurrency: int, records: bool
+) -> Measurement:
+    """Keep the per-turn state of ``concurrency`` interviews at a time, without any LLM.
+
+    Each turn adds what an agent reply leaves behind: the message and its call
+    metadata. With ``records``, as in ``Simulation.run``, they are compact records
+    until the interview ends; otherwise they are the transcript's pydantic models
+    from the start. Latencies are per simulation, including the final conversion.
+    """
+    interviewer_config, respondent_config = _configs()
+    plan = interview_plan(max_turns)
+    latencies: list[float] = []
+    turns = 0
+    start = time.perf_counter()
+    for first in range(0, num_simulations, concurrency):
+        batch = range(first, min(first + concurrency, num_simulations))
+        started = time.perf_counter()
+        transcripts: list[Transcript | None] = [
+            Transcript(interviewer_config=interviewer_config, respondent_config=respondent_config)
+            for _ in batch
+        ]
+        pending: list[tuple[list[Turn], list[CallRecord]]] = [([], []) for _ in batch]
+        # Interleave the interviews step by step, as concurrent simulations progress
+        for step, (role, _) in enumerate(plan):
+            for transcript, (recorded, calls) in zip(transcripts, pending):
+                now = time.time()
+                fields = {
+                    "model": interviewer_config.model,
+                    "perspective": role,
+                    "system_prompt_hash": "0" * 16,
+                    "message_range": (0, step),
+                    "params": {"temperature": 0.7, "max_completion_tokens": 200},
+                    "input_tokens": 100 + 40 * step,
+                    "output_tokens": 40,
+                    "status_code": 200,
+                    "queued_at": now,
+                    "sent_at": now,
+                    "completed_at": now,
+                }
+                text = f"reply {step} " + "word " * 30
+                if records:
+                    reply = Reply(text, CallRecord(**fields))
+                    recorded.append(Turn.of(role, reply.text))
+                    calls.append(reply.call)
+                else:
+                    response = AgentResponse(text=text, llm_call_info=LLMCallInfo(**fields))
+                    transcript.messages.append(Message(role=role, text=response.text))
+                    transcript.add_llm_call(response.llm_call_info)
+        # Finish the interviews one by one, each transcript handed off (here, dropped)
+        # before the next is built, so the peak heap is the state of those in flight
+        for i, (recorded, calls) in enumerate(pending):
+            transcript, transcripts[i] = transcripts[i], None
+            add_to_transcript(transcript, recorded, calls)
+            recorded.clear()
+            calls.clear()
+            turns += len(transcript.messages)
+        elapsed = time.perf_counter() - started
+        latencies.extend([elapsed / len(batch)] * len(batch))
+    return turns, latencies, time.perf_counter() - start
+
+
+async def _run_records(
+    num_simulations: int, max_turns: int, concurrency: int, latency: float
+) -> Measurement:
+    return await _run_turns(num_simulations, max_turns, concurrency, records=True)
+
+
+async def _run_models(
+    num_simulations: int, max_turns: int, concurrency: int, latency: float
+) -> Measurement:
+    return await _run_turns(num_simulations, max_turns, concurrency, records=False)
+
+
+_RUNNERS: dict[Suite, Callable[[int, int, int, float], Awaitable[Measurement]]] = {
+    "simulation": _run_simulations,
+    "server": _run_server,
+    "writer": _run_writer,
+    "records": _run_records,
+    "models": _run_models,
+}
+
+
+def run_point(
+    suite: Suite,
+    num_simulations: int,
+    max_turns: int,
+    concurrency: int,
+    latency: float = 0.05,
+    allocations: bool = True,
+) -> BenchResult:
+    """Measure one sweep point, in this process.
+
+    Throughput and latency come from an untraced run. With ``allocations``, the point
+    is run a second time under ``tracemalloc`` to record the peak Python heap, which
+    is also reported per turn in flight at the peak.
+    """
+    if suite == "writer":
+        concurrency = 1
+    runner = _RUNNERS[suite]
+
+    turns, latencies, seconds = asyncio.run(
+        runner(num_simulations, max_turns, concurrency, latency)
+    )
+    units = 2 * num_simulations if suite == "writer" else num_simulations
+    result = BenchResult(
+        suite=suite,
+        num_simulations=num_simulations,
+        max_turns=max_turns,
+        concurrency=concurrency,
+        seconds=round(seconds, 4),
+        sims_per_sec=round(units / seconds, 2) if seconds else 0.0,
+        turns=turns,
+        p50_ms=round(percentile(latencies, 50) * 1000, 3),
+        p95_ms=round(percentile(latencies, 95) * 1000, 3),
+        p99_ms=round(percentile(latencies, 99) * 1000, 3),
+        peak_rss_mib=round(peak_rss_mib(), 1),
+    )
+
+    if allocations:
+        tracemalloc.start()
+        try:
+            asyncio.run(runner(num_simulations, max_turns, concurrency, latency))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        in_flight = min(num_simulations, concurrency) * (turns / units if units else 0)
+        result.peak_heap_mib = round(peak / (1024 * 1024), 2)
+        result.heap_kib_per_turn = round(peak / 1024 / in_flight, 2) if in_flight else None
+    return result
+
+
+def sweep(
+    suites: Iterable[Suite],
+    num_simulations: Iterable[int],
+    max_turns: Iterable[int],
+    concurrency: Iterable[int],
+    latency: float = 0.05,
+    allocations: bool = True,
+) -> Iterable[BenchResult]:
+    """Run every combination of the given parameters, yielding results as they finish.
+
+    Each point runs in a fresh process, so its peak RSS is its own rather than the
+    highest of the points before it.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    context = multiprocessing.get_context("spawn")
+    for suite in suites:
+        # Concurrency does not apply to the writers
+        levels = [1] if suite == "writer" else list(concurrency)
+        for n, turns, c in itertools.product(num_simulations, max_turns, levels):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                point = pool.submit(run_point, suite, n, turns, c, latency, allocations)
+                yield point.result()
+
+
+def save_results(results: list[BenchResult], path: str | Path) -> None:
+    Path(path).write_text(json.dumps([r.model_dump() for r in results], indent=2))
+
+
+def load_results(path: str | Path) -> list[BenchResult]:
+    return [BenchResult.model_validate(r) for r in json.loads(Path(path).read_text())]
+
+
+def regressions(
+    results: list[BenchResult], baseline: list[BenchResult], tolerance: float = 0.2
+) -> list[tuple[BenchResult, BenchResult]]:
+    """(result, baseline) pairs whose throughput fell more than ``tolerance`` below baseline."""
+    previous = {b.key: b for b in baseline}
+    return [
+        (r, previous[r.key])
+        for r in results
+        if r.key in previous and r.sims_per_sec < previous[r.key].sims_per_sec * (1 - tolerance)
+    ]
@@ -1,32 +1,54 @@
 from __future__ import annotations
 
-import asyncio
-import csv
+import math
+from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
-from interviewer import (
+# Only what every command needs is imported up front: each command imports the rest
+# of the package (and with it pydantic and the OpenAI SDK) as it needs them
+from interviewer.defaults import (
     DEFAULT_INTERVIEWER_SYSTEM_PROMPT,
     DEFAULT_MODEL,
     DEFAULT_RESPONDENT_SYSTEM_PROMPT,
-    AgentConfig,
-    Interviewer,
-    Message,
-    Simulation,
-    Transcript,
     load_prompt,
-    save_transcript,
 )
 
+if TYPE_CHECKING:
+    from interviewer import PromptBuffer, ResultsIndex
+
 app = typer.Typer(name="interview", help="AI Interviewer CLI")
 console = Console()
 
 
+class BackendName(str, Enum):
+    """Choices of ``--backend``, as accepted by ``interviewer.create_backend``."""
+
+    openai = "openai"
+    mock = "mock"
+
+
+class HistoryStrategy(str, Enum):
+    """Choices of ``--history``, the strategies of ``HistoryPolicy``."""
+
+    full = "full"
+    window = "window"
+    token_budget = "token_budget"
+    summarize = "summarize"
+
+
+class PromptLayout(str, Enum):
+    """Choices of ``--prompt-layout``, the values of ``AgentConfig.prompt_layout``."""
+
+    standard = "standard"
+    prefix_stable = "prefix_stable"
+
+
 @app.command()
 def chat(
     system_prompt: str = typer.Option(
@@ -39,9 +61,17 @@ def chat(
     temperature: float = typer.Option(0.7, "--temperature", "-t", help="Sampling temperature"),
     max_tokens: int = typer.Option(200, "--max-tokens", help="Max tokens per response"),
     save: Optional[str] = typer.Option(None, "--save", help="Save transcript to file (json/csv)"),
+    stream: bool = typer.Option(
+        True, "--stream/--no-stream", help="Print interviewer replies token by token"
+    ),
 ):
     """Interactive CLI chat — you are the respondent."""
-    asyncio.run(_chat(system_prompt, model, temperature, max_tokens, save))
+    import asyncio
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    asyncio.run(_chat(system_prompt, model, temperature, max_tokens, save, stream))
 
 
 async def _chat(
@@ -50,8 +80,17 @@ async def _chat(
     temperature: float,
     max_tokens: int,
     save_path: str | None,
+    stream: bool = True,
 ):
-    from interviewer import Transcript
+    from interviewer import (
+        AgentConfig,
+        AgentResponse,
+        Interviewer,
+        Message,
+        PromptBuffer,
+        Transcript,
+        save_transcript_async,
+    )
 
     resolved_prompt = load_prompt(system_prompt)
     config = AgentConfig(
@@ -63,6 +102,7 @@ async def _chat(
 
     interviewer = Interviewer()
     messages: list[Message] = []
+    prompt_buffer = PromptBuffer("interviewer")
     transcript = Transcript(interviewer_config=config)
 
     console.print(
@@ -73,24 +113,35 @@ async def _chat(
         )
     )
 
-    def _print_interviewer(text: str):
+    async def _interviewer_says(message_type: str, buffer: PromptBuffer | None = None):
+        """Generate, print and record the interviewer's next message."""
         console.print()
         console.print(Text("Interviewer: ", style="bold blue"), end="")
-        console.print(text)
+        if stream:
+            async for chunk in interviewer.stream_response(
+                messages, config, message_type=message_type, prompt_buffer=buffer
+            ):
+                if isinstance(chunk, AgentResponse):
+                    resp = chunk
+                else:
+                    console.print(chunk, end="", markup=False, highlight=False)
+            console.print()
+        else:
+            resp = await interviewer.generate_response(
+                messages, config, message_type=message_type, prompt_buffer=buffer
+            )
+            console.print(resp.text, markup=False, highlight=False)
 
-    def _track(resp):
+        msg = Message(role="interviewer", text=resp.text)
+        messages.append(msg)
+        transcript.messages.append(msg)
+        for call in prompt_buffer.summary.drain():
+            transcript.add_llm_call(call.to_info())
         if resp.llm_call_info:
-            transcript.llm_calls.append(resp.llm_call_info)
-            transcript.total_input_tokens += resp.llm_call_info.input_tokens
-            transcript.total_output_tokens += resp.llm_call_info.output_tokens
+            transcript.add_llm_call(resp.llm_call_info)
 
     # Opening message
-    opening = await interviewer.generate_response(messages, config, message_type="opening_message")
-    msg = Message(role="interviewer", text=opening.text)
-    messages.append(msg)
-    transcript.messages.append(msg)
-    _track(opening)
-    _print_interviewer(opening.text)
+    await _interviewer_says("opening_message")
 
     while True:
         console.print()
@@ -102,25 +153,11 @@ async def _chat(
         cmd = user_input.lower()
 
         if cmd == "/last_question":
-            last_q = await interviewer.generate_response(
-                messages, config, message_type="last_question"
-            )
-            msg = Message(role="interviewer", text=last_q.text)
-            messages.append(msg)
-            transcript.messages.append(msg)
-            _track(last_q)
-            _print_interviewer(last_q.text)
+            await _interviewer_says("last_question")
             continue
 
         if cmd == "/end":
-            end = await interviewer.generate_response(
-                messages, config, message_type="end_of_interview"
-            )
-            msg = Message(role="interviewer", text=end.text)
-            messages.append(msg)
-            transcript.messages.append(msg)
-            _track(end)
-            _print_interviewer(end.text)
+            await _interviewer_says("end_of_interview")
             break
 
         # Add respondent message
@@ -129,18 +166,16 @@ async def _chat(
         transcript.messages.append(msg)
 
         # Get interviewer response
-        response = await interviewer.generate_response(
-            messages, config, message_type="next_message"
-        )
-        msg = Message(role="interviewer", text=response.text)
-        messages.append(msg)
-        transcript.messages.append(msg)
-        _track(response)
-        _print_interviewer(response.text)
+        await _interviewer_says("next_message", prompt_buffer)
+
+    # Count a summary still being written in the transcript's usage
+    await prompt_buffer.summary.wait()
+    for call in prompt_buffer.summary.drain():
+        transcript.add_llm_call(call.to_info())
 
     if save_path:
         fmt = "csv" if save_path.endswith(".csv") else "json"
-        save_transcript(transcript, save_path, format=fmt)
+        await save_transcript_async(transcript, save_path, format=fmt)
         console.print(f"\nTranscript saved to {save_path}")
 
     console.print(
@@ -167,152 +202,233 @@ def simulate(
     temperature: float = typer.Option(0.7, "--temperature", "-t"),
     max_tokens: int = typer.Option(200, "--max-tokens"),
     max_turns: int = typer.Option(5, "--max-turns", help="Number of conversation turns"),
-    num_simulations: int = typer.Option(1, "--num-simulations", "-n", help="Number of simulations to run in parallel"),
-    save: str = typer.Option(..., "--save", "-o", help="Output CSV file path"),
+    num_simulations: int = typer.Option(
+        1, "--num-simulations", "-n", help="Number of simulations to run in parallel"
+    ),
+    save: str | None = typer.Option(None, "--save", "-o", help="Output file path (.csv or .jsonl)"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Print conversation to terminal"),
+    concurrency: int = typer.Option(
+        16, "--concurrency", "-c", help="Max simulations in flight at once"
+    ),
+    rpm: float | None = typer.Option(None, "--rpm", help="Max LLM requests per minute"),
+    tpm: float | None = typer.Option(None, "--tpm", help="Max LLM tokens per minute (estimated)"),
+    resume: str | None = typer.Option(
+        None, "--resume", help="Append to an existing results file, skipping completed simulations"
+    ),
+    checkpoint_dir: str | None = typer.Option(
+        None, "--checkpoint-dir", help="Directory for per-turn checkpoints of in-progress runs"
+    ),
+    max_attempts: int = typer.Option(
+        5, "--max-attempts", help="Attempts per LLM call before giving up"
+    ),
+    call_timeout: float | None = typer.Option(
+        120.0, "--call-timeout", help="Seconds allowed per LLM call attempt"
+    ),
+    interview_timeout: float | None = typer.Option(
+        None, "--interview-timeout", help="Seconds allowed per simulated interview"
+    ),
+    cache: str | None = typer.Option(
+        None, "--cache", help="SQLite file caching LLM responses across reruns"
+    ),
+    backend: BackendName = typer.Option(
+        BackendName.openai,
+        "--backend",
+        help="LLM backend: openai, or mock for offline synthetic responses",
+    ),
+    mock_latency: float = typer.Option(
+        0.5, "--mock-latency", help="Median seconds per call for --backend mock"
+    ),
+    history: HistoryStrategy = typer.Option(
+        HistoryStrategy.full,
+        "--history",
+        help="History sent per call: full, window, token_budget or summarize",
+    ),
+    history_messages: int = typer.Option(
+        20, "--history-messages", help="Recent messages kept by window and summarize"
+    ),
+    history_tokens: int = typer.Option(
+        8000, "--history-tokens", help="Prompt token budget for token_budget"
+    ),
+    prompt_layout: PromptLayout = typer.Option(
+        PromptLayout.standard,
+        "--prompt-layout",
+        help="standard, or prefix_stable to maximize provider prompt-cache hits",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Project the run's tokens and cost without calling the LLM"
+    ),
+    token_budget: int | None = typer.Option(
+        None, "--token-budget", help="Stop before total LLM usage could exceed this many tokens"
+    ),
+    batch: bool = typer.Option(
+        False, "--batch", help="Send each turn of all simulations as one provider batch"
+    ),
+    batch_poll: float = typer.Option(
+        60.0, "--batch-poll", help="Seconds between status checks of a submitted batch"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Processes to spread the simulations across"
+    ),
 ):
     """Fully automated simulation — both sides are AI."""
-    asyncio.run(
-        _simulate(
-            interviewer_prompt, respondent_prompt, model, temperature, max_tokens,
-            max_turns, num_simulations, save, verbose,
-        )
-    )
+    import asyncio
 
+    from dotenv import load_dotenv
 
-async def _run_one_simulation(
-    sim_id: int,
-    interviewer_config: AgentConfig,
-    respondent_config: AgentConfig,
-    max_turns: int,
-    on_message: callable | None = None,
-) -> Transcript:
-    """Run a single simulation and return its transcript."""
-    sim = Simulation()
-    return await sim.run(
-        interviewer_config, respondent_config, max_turns=max_turns, on_message=on_message
+    from cli.simulate import (
+        Shard,
+        agent_configs,
+        batch_backend,
+        print_estimate,
+        run_sharded,
+        run_simulations,
     )
+    from interviewer import HistoryPolicy, RetryPolicy, Scheduler, create_backend, estimate_run
 
+    load_dotenv()
+    history_policy = HistoryPolicy(
+        strategy=history.value, max_messages=history_messages, max_input_tokens=history_tokens
+    )
+    if dry_run:
+        configs = agent_configs(
+            interviewer_prompt,
+            respondent_prompt,
+            model,
+            temperature,
+            max_tokens,
+            history_policy,
+            prompt_layout.value,
+        )
+        estimate = asyncio.run(estimate_run(*configs, max_turns, num_simulations))
+        print_estimate(estimate, token_budget)
+        return
 
-async def _simulate(
-    interviewer_prompt: str,
-    respondent_prompt: str,
-    model: str,
-    temperature: float,
-    max_tokens: int,
-    max_turns: int,
-    num_simulations: int,
-    save_path: str,
-    verbose: bool,
-):
-    resolved_interviewer = load_prompt(interviewer_prompt)
-    resolved_respondent = load_prompt(respondent_prompt)
+    if save and resume and Path(save) != Path(resume):
+        console.print("[red]--save and --resume must point to the same file.[/red]")
+        raise typer.Exit(1)
+    save_path = resume or save
+    if not save_path:
+        console.print("[red]Missing option --save (or --resume).[/red]")
+        raise typer.Exit(1)
+    if batch and not checkpoint_dir:
+        console.print("[red]--batch needs --checkpoint-dir, to resume after a restart.[/red]")
+        raise typer.Exit(1)
 
-    interviewer_config = AgentConfig(
-        system_prompt=resolved_interviewer,
-        model=model,
-        temperature=temperature,
-        max_tokens=max_tokens,
+    if batch and workers > 1:
+        console.print("[red]--batch runs in a single process; drop --workers.[/red]")
+        raise typer.Exit(1)
+
+    retry_policy = RetryPolicy(
+        max_attempts=max_attempts, call_timeout=call_timeout, interview_timeout=interview_timeout
     )
-    respondent_config = AgentConfig(
-        system_prompt=resolved_respondent,
-        model=model,
-        temperature=temperature,
-        max_tokens=max_tokens,
+    if workers > 1 and num_simulations > 1:
+        workers = min(workers, num_simulations)
+        interviewer_config, respondent_config = agent_configs(
+            interviewer_prompt,
+            respondent_prompt,
+            model,
+            temperature,
+            max_tokens,
+            history_policy,
+            prompt_layout.value,
+        )
+        shard = Shard(
+            worker=0,
+            simulation_ids=list(range(1, num_simulations + 1)),
+            interviewer_config=interviewer_config,
+            respondent_config=respondent_config,
+            max_turns=max_turns,
+            retry_policy=retry_policy,
+            max_concurrency=math.ceil(concurrency / workers),
+            requests_per_minute=rpm / workers if rpm else None,
+            tokens_per_minute=tpm / workers if tpm else None,
+            token_budget=token_budget // workers if token_budget else None,
+            cache_path=cache,
+            backend=backend.value,
+            mock_latency=mock_latency,
+            checkpoint_dir=checkpoint_dir,
+            resume=resume is not None,
+        )
+        run_sharded(shard, workers, save_path, verbose)
+        return
+
+    llm_backend = None
+    if backend is BackendName.mock:
+        llm_backend = create_backend(backend.value, latency=mock_latency)
+    if batch:
+        llm_backend = batch_backend(
+            llm_backend, checkpoint_dir, batch_poll, mock_latency, resume is not None
+        )
+        # Every simulation advances in lockstep, and a batch can take hours
+        concurrency = num_simulations
+        retry_policy.call_timeout = None
+
+    scheduler = Scheduler(
+        max_concurrency=concurrency,
+        requests_per_minute=rpm,
+        tokens_per_minute=tpm,
+        token_budget=token_budget,
     )
-
-    on_message = None
-    if verbose and num_simulations == 1:
-        console.print(
-            Panel(f"[bold]Simulated Interview[/bold] — {max_turns} turns, model: {model}")
+    asyncio.run(
+        run_simulations(
+            interviewer_prompt=interviewer_prompt,
+            respondent_prompt=respondent_prompt,
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            max_turns=max_turns,
+            num_simulations=num_simulations,
+            save_path=save_path,
+            verbose=verbose,
+            scheduler=scheduler,
+            resume=resume is not None,
+            checkpoint_dir=checkpoint_dir,
+            retry_policy=retry_policy,
+            cache_path=cache,
+            backend=llm_backend,
+            history=history_policy,
+            prompt_layout=prompt_layout.value,
         )
-
-        def on_message(msg: Message):
-            console.print()
-            if msg.role == "interviewer":
-                console.print(Text("Interviewer: ", style="bold blue"), end="")
-            else:
-                console.print(Text("Respondent: ", style="bold green"), end="")
-            console.print(msg.text)
-
-    # Run simulations in parallel
-    tasks = [
-        _run_one_simulation(i, interviewer_config, respondent_config, max_turns, on_message)
-        for i in range(num_simulations)
-    ]
-    transcripts = await asyncio.gather(*tasks)
-
-    # Write results to CSV: each row is the JSON of one conversation
-    path = Path(save_path)
-    with open(path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["simulation_id", "transcript"])
-        for i, transcript in enumerate(transcripts):
-            transcript_json = transcript.model_dump_json(
-                exclude={"llm_calls": {"__all__": {"messages"}}}
-            )
-            writer.writerow([i + 1, transcript_json])
-
-    if verbose:
-        total_input = sum(t.total_input_tokens for t in transcripts)
-        total_output = sum(t.total_output_tokens for t in transcripts)
-        console.print(f"\n{num_simulations} simulation(s) saved to {save_path}")
-        console.print(f"Total tokens: {total_input} input, {total_output} output")
+    )
 
 
 @app.command()
 def show(
-    csv_file: str = typer.Argument(..., help="Path to simulation results CSV file"),
+    results_file: str = typer.Argument(
+        ..., help="Path to simulation results file (.csv or .jsonl)"
+    ),
+    simulation_id: int | None = typer.Option(
+        None, "--id", help="Show this simulation directly instead of listing them"
+    ),
+    search: str | None = typer.Option(
+        None, "--search", "-s", help="Only list simulations whose transcript contains this text"
+    ),
+    page_size: int = typer.Option(20, "--page-size", help="Simulations listed per page"),
 ):
-    """Browse simulated interviews from a CSV results file."""
-    import json as json_mod
-
-    path = Path(csv_file)
+    """Browse simulated interviews from a CSV or JSONL results file."""
+    path = Path(results_file)
     if not path.exists():
-        console.print(f"[red]File not found: {csv_file}[/red]")
+        console.print(f"[red]File not found: {results_file}[/red]")
         raise typer.Exit(1)
 
-    # Read transcripts from CSV
-    transcripts: list[tuple[int, Transcript]] = []
-    with open(path, newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            sim_id = int(row["simulation_id"])
-            data = json_mod.loads(row["transcript"])
-            transcripts.append((sim_id, Transcript(**data)))
-
-    if not transcripts:
-        console.print("[yellow]No simulations found in file.[/yellow]")
-        raise typer.Exit(0)
-
-    # Display list of simulations
-    console.print(Panel(f"[bold]{len(transcripts)} simulated interview(s)[/bold] in {csv_file}"))
-    console.print()
-    for sim_id, t in transcripts:
-        n_messages = len(t.messages)
-        first_msg = t.messages[0].text[:80] + "..." if t.messages and len(t.messages[0].text) > 80 else (t.messages[0].text if t.messages else "")
-        console.print(f"  [bold]{sim_id}[/bold]. {n_messages} messages — {first_msg}")
-    console.print()
+    from interviewer import ResultsIndex
+
+    # The sidecar index lists the file without parsing it; only the chosen row is read
+    with ResultsIndex(path) as index:
+        if not index.entries:
+            console.print("[yellow]No simulations found in file.[/yellow]")
+            raise typer.Exit(0)
+        if simulation_id is None:
+            simulation_id = _choose_simulation(index, search, page_size)
+            if simulation_id is None:
+                return
+        if index.entry(simulation_id) is None:
+            console.print(f"[red]No simulation {simulation_id} in {results_file}[/red]")
+            raise typer.Exit(1)
+        transcript = index.load(simulation_id)
 
-    # Let user select one
-    while True:
-        choice = console.input(
-            f"[bold]Select interview (1-{len(transcripts)}), or q to quit: [/bold]"
-        ).strip()
-        if choice.lower() == "q":
-            return
-        try:
-            idx = int(choice)
-            if 1 <= idx <= len(transcripts):
-                break
-        except ValueError:
-            pass
-        console.print("[red]Invalid selection.[/red]")
-
-    # Display the selected interview
-    _, transcript = transcripts[idx - 1]
     console.print()
-    console.print(Panel(f"[bold]Interview {idx}[/bold]"))
+    console.print(Panel(f"[bold]Interview {simulation_id}[/bold]"))
     for msg in transcript.messages:
         console.print()
         if msg.role == "interviewer":
@@ -322,11 +438,48 @@ def show(
         console.print(msg.text)
     console.print()
     console.print(
-        f"Tokens: {transcript.total_input_tokens} input, "
-        f"{transcript.total_output_tokens} output"
+        f"Tokens: {transcript.total_input_tokens} input, {transcript.total_output_tokens} output"
     )
 
 
+def _choose_simulation(index: ResultsIndex, search: str | None, page_size: int) -> int | None:
+    """List the indexed simulations a page at a time and return the one picked, if any."""
+    from interviewer import PREVIEW_CHARS
+
+    entries = sorted(index.entries, key=lambda e: e.simulation_id)
+    listed = index.search(search, entries) if search else entries
+    page = 0
+    while True:
+        pages = max(math.ceil(len(listed) / page_size), 1)
+        title = f"[bold]{len(index)} simulated interview(s)[/bold] in {index.path}"
+        if search:
+            title += f" — {len(listed)} matching {search!r}"
+        console.print(Panel(title))
+        console.print()
+        for e in listed[page * page_size : (page + 1) * page_size]:
+            preview = e.preview + ("..." if len(e.preview) >= PREVIEW_CHARS else "")
+            console.print(f"  [bold]{e.simulation_id}[/bold]. {e.messages} messages — {preview}")
+        console.print()
+        choice = console.input(
+            f"[bold]Page {page + 1}/{pages}. Select a simulation id, n/p for next/previous "
+            "page, /text to search, or q to quit: [/bold]"
+        ).strip()
+        if choice.lower() == "q":
+            return None
+        if choice.lower() == "n":
+            page = min(page + 1, pages - 1)
+        elif choice.lower() == "p":
+            page = max(page - 1, 0)
+        elif choice.startswith("/"):
+            search = choice[1:].strip() or None
+            listed = index.search(search, entries) if search else entries
+            page = 0
+        elif choice.isdigit() and index.entry(int(choice)) is not None:
+            return int(choice)
+        else:
+            console.print("[red]Invalid selection.[/red]")
+
+
 @app.command()
 def preview(
     system_prompt: str = typer.Option(
@@ -341,5 +494,97 @@ def preview(
     console.print(Panel(resolved, title="System Prompt"))
 
 
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+@app.command()
+def bench(
+    suite: str = typer.Option(
+        "simulation,server,writer", "--suite", help="Comma-separated suites to run"
+    ),
+    num_simulations: str = typer.Option(
+        "10,100", "--num-simulations", "-n", help="Comma-separated simulation counts"
+    ),
+    max_turns: str = typer.Option("3,10", "--max-turns", help="Comma-separated turn counts"),
+    concurrency: str = typer.Option(
+        "1,16,64", "--concurrency", "-c", help="Comma-separated concurrency levels"
+    ),
+    latency: float = typer.Option(0.05, "--latency", help="Median seconds per mock LLM call"),
+    allocations: bool = typer.Option(
+        True, "--allocations/--no-allocations", help="Also measure heap usage (tracemalloc)"
+    ),
+    save: str | None = typer.Option(None, "--save", "-o", help="Write results as JSON"),
+    baseline: str | None = typer.Option(
+        None, "--baseline", help="Fail if throughput regressed against this saved JSON"
+    ),
+    tolerance: float = typer.Option(
+        0.2, "--tolerance", help="Allowed fractional throughput drop against --baseline"
+    ),
+):
+    """Benchmark simulation throughput, server latency and result writers on a mock LLM."""
+    from rich.table import Table
+
+    from cli.bench import SUITES, load_results, regressions, save_results, sweep
+
+    suites = [s.strip() for s in suite.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        console.print(f"[red]Unknown suite(s): {', '.join(sorted(unknown))}[/red]")
+        raise typer.Exit(1)
+
+    table = Table(title=f"Benchmarks (mock latency {latency}s)")
+    columns = ["suite", "n", "turns", "conc", "sims/s", "p50 ms", "p95 ms", "p99 ms", "RSS MiB"]
+    if allocations:
+        columns += ["heap MiB", "KiB/turn"]
+    for column in columns:
+        table.add_column(column, justify="left" if column == "suite" else "right")
+
+    results = []
+    points = sweep(
+        suites,
+        _int_list(num_simulations),
+        _int_list(max_turns),
+        _int_list(concurrency),
+        latency=latency,
+        allocations=allocations,
+    )
+    for r in points:
+        results.append(r)
+        console.print(
+            f"  {r.suite} n={r.num_simulations} turns={r.max_turns} c={r.concurrency}: "
+            f"{r.sims_per_sec} sims/s"
+        )
+        row = [
+            r.suite,
+            r.num_simulations,
+            r.max_turns,
+            r.concurrency,
+            r.sims_per_sec,
+            r.p50_ms,
+            r.p95_ms,
+            r.p99_ms,
+            r.peak_rss_mib,
+        ]
+        if allocations:
+            row += [r.peak_heap_mib, r.heap_kib_per_turn]
+        table.add_row(*(str(v) for v in row))
+    console.print(table)
+
+    if save:
+        save_results(results, save)
+        console.print(f"Results saved to {save}")
+    if baseline:
+        slower = regressions(results, load_results(baseline), tolerance)
+        for r, b in slower:
+            console.print(
+                f"[red]Regression: {r.suite} n={r.num_simulations} turns={r.max_turns} "
+                f"c={r.concurrency}: {r.sims_per_sec} sims/s vs {b.sims_per_sec} baseline[/red]"
+            )
+        if slower:
+            raise typer.Exit(1)
+        console.print(f"[green]No throughput regressions against {baseline}.[/green]")
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,563 @@
+"""``interview simulate``: running simulations and saving them as they complete.
+
+A run happens in this process (``run_simulations``), or is split across worker
+processes whose rows are merged into one results file (``run_sharded``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing, nullcontext
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+from rich.panel import Panel
+from rich.text import Text
+
+from cli.main import console
+from interviewer import (
+    AgentConfig,
+    AsyncTranscriptWriter,
+    BatchBackend,
+    BudgetExceededError,
+    CacheStats,
+    CallStats,
+    CheckpointStore,
+    CircuitBreaker,
+    CircuitOpenError,
+    HistoryPolicy,
+    LLMBackend,
+    LocalBatchService,
+    Message,
+    OpenAIBatchService,
+    ResponseCache,
+    RetryPolicy,
+    RunEstimate,
+    Scheduler,
+    Simulation,
+    Transcript,
+    TranscriptWriter,
+    call_metrics,
+    completed_simulation_ids,
+    create_backend,
+    encode_row,
+    load_prompt,
+)
+from interviewer.metrics import percentile
+
+
+def batch_backend(
+    backend: LLMBackend | None,
+    checkpoint_dir: str,
+    poll_interval: float,
+    mock_latency: float,
+    resume: bool,
+) -> BatchBackend:
+    """A batch backend for ``simulate --batch``, keeping its state in the checkpoint dir.
+
+    With ``--backend mock``, batches go to a local stand-in service answered by the
+    mock backend after ``--mock-latency`` seconds.
+    """
+    directory = Path(checkpoint_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = directory / "batches.json"
+    if not resume:
+        manifest.unlink(missing_ok=True)
+    if backend is None:
+        service = OpenAIBatchService()
+    else:
+        service = LocalBatchService(directory / "local-batches", backend, delay=mock_latency)
+    return BatchBackend(service, poll_interval=poll_interval, manifest=manifest)
+
+
+def agent_configs(
+    interviewer_prompt: str,
+    respondent_prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    history: HistoryPolicy,
+    prompt_layout: str = "standard",
+) -> tuple[AgentConfig, AgentConfig]:
+    """Interviewer and respondent configs for ``simulate``, resolving prompt files."""
+    return tuple(
+        AgentConfig(
+            system_prompt=load_prompt(prompt),
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            history=history,
+            prompt_layout=prompt_layout,
+        )
+        for prompt in (interviewer_prompt, respondent_prompt)
+    )
+
+
+def print_estimate(estimate: RunEstimate, token_budget: int | None) -> None:
+    from rich.table import Table
+
+    n = estimate.num_simulations
+    table = Table(title=f"Dry run: {n} simulation(s) of {estimate.max_turns} turns")
+    table.add_column("")
+    table.add_column("Per simulation", justify="right")
+    table.add_column("Total", justify="right")
+    calls = estimate.calls_per_simulation
+    table.add_row("LLM calls", f"{calls:,}", f"{calls * n:,}")
+    table.add_row(
+        "Input tokens",
+        f"{estimate.input_tokens_per_simulation:,}",
+        f"{estimate.total_input_tokens:,}",
+    )
+    table.add_row(
+        "Output tokens (max)",
+        f"{estimate.output_tokens_per_simulation:,}",
+        f"{estimate.total_output_tokens:,}",
+    )
+    console.print(table)
+    if estimate.cost_usd is not None:
+        console.print(f"Estimated cost, at most: ${estimate.cost_usd:,.2f}")
+    else:
+        console.print("Estimated cost: unknown (no price for this model)")
+    if estimate.tokenizer == "estimate":
+        console.print("Tokens estimated at ~4 characters each; install tiktoken for exact counts.")
+    else:
+        console.print(f"Tokens counted with the {estimate.tokenizer} tokenizer.")
+    if token_budget is not None and estimate.total_tokens > token_budget:
+        console.print(
+            f"[yellow]May exceed --token-budget {token_budget:,}; "
+            "the run will stop once the budget is reached.[/yellow]"
+        )
+
+
+def _print_call_stats(latencies: list[float], stats: list[CallStats]) -> None:
+    """Summarize the timing of a run's LLM calls, and the errors seen along the way."""
+    queue = sum(s.queue_seconds for s in stats)
+    rates = [s.output_tokens_per_second for s in stats if s.output_tokens_per_second]
+    console.print(
+        f"LLM calls: {len(latencies):,} ({sum(s.retries for s in stats):,} retries); latency "
+        f"p50 {percentile(latencies, 50):.2f}s, p95 {percentile(latencies, 95):.2f}s, "
+        f"p99 {percentile(latencies, 99):.2f}s; mean queue wait {queue / len(latencies):.2f}s"
+        + (f"; {sum(rates) / len(rates):,.0f} output tokens/s" if rates else "")
+    )
+    errors = call_metrics.errors.values
+    if errors:
+        counts = ", ".join(
+            f"{name} ({status}) {n:g}" if status else f"{name} {n:g}"
+            for (name, status), n in sorted(errors.items())
+        )
+        console.print(f"LLM errors, including retried attempts: {counts}")
+
+
+async def _run_one_simulation(
+    sim: Simulation,
+    sim_id: int,
+    interviewer_config: AgentConfig,
+    respondent_config: AgentConfig,
+    max_turns: int,
+    on_message: callable | None = None,
+    checkpoints: CheckpointStore | None = None,
+    resume: bool = False,
+) -> Transcript:
+    """Run a single simulation and return its transcript."""
+    partial = checkpoints.load(sim_id) if checkpoints and resume else None
+    on_checkpoint = (lambda t: checkpoints.save_async(sim_id, t)) if checkpoints else None
+    return await sim.run(
+        interviewer_config,
+        respondent_config,
+        max_turns=max_turns,
+        on_message=on_message,
+        transcript=partial,
+        on_checkpoint=on_checkpoint,
+        replica=sim_id,
+    )
+
+
+class _RunTotals:
+    """What a ``simulate`` run reports at the end, accumulated as rows are saved."""
+
+    def __init__(self):
+        self.saved = 0
+        self.failed: list[int] = []
+        self.input_tokens = self.output_tokens = self.cached_tokens = 0
+        self.latencies: list[float] = []
+        self.call_stats: list[CallStats] = []
+
+    def add(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cached_tokens: int,
+        latencies: list[float],
+        call_stats: CallStats,
+    ) -> None:
+        self.saved += 1
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        self.cached_tokens += cached_tokens
+        self.latencies.extend(latencies)
+        self.call_stats.append(call_stats)
+
+
+def _row_stats(transcript: Transcript) -> tuple[int, int, int, list[float], CallStats]:
+    """The arguments of ``_RunTotals.add`` for one transcript, cheap to send between processes."""
+    latencies = [c.latency_seconds for c in transcript.llm_calls if c.latency_seconds is not None]
+    return (
+        transcript.total_input_tokens,
+        transcript.total_output_tokens,
+        transcript.total_cached_tokens,
+        latencies,
+        transcript.call_stats,
+    )
+
+
+async def _handle_results(
+    results: AsyncIterator[tuple[int, Transcript | BaseException]],
+    on_transcript: Callable[[int, Transcript], Awaitable[None]],
+    on_failed: Callable[[int, BaseException], None],
+    on_stopped: Callable[[BaseException], None],
+) -> None:
+    """Hand each result of ``Scheduler.as_completed`` to the matching callback.
+
+    A failed simulation is reported and skipped; it does not cancel the others. An
+    open circuit or an exhausted token budget stops the run, cancelling the
+    simulations still in flight.
+    """
+    # aclosing: stopping early cancels the simulations still in flight
+    async with aclosing(results):
+        async for sim_id, transcript in results:
+            if isinstance(transcript, (CircuitOpenError, BudgetExceededError)):
+                on_stopped(transcript)
+                break
+            if isinstance(transcript, Exception):
+                on_failed(sim_id, transcript)
+                continue
+            await on_transcript(sim_id, transcript)
+
+
+def _pending_ids(save_path: str, num_simulations: int, resume: bool) -> list[int]:
+    """The simulation ids still to run, skipping those already saved when resuming."""
+    completed = completed_simulation_ids(save_path) if resume else set()
+    pending = [i for i in range(1, num_simulations + 1) if i not in completed]
+    if completed:
+        console.print(
+            f"Resuming: {len(completed)} simulation(s) already in {save_path}, "
+            f"{len(pending)} remaining"
+        )
+    return pending
+
+
+def _report(
+    totals: _RunTotals,
+    save_path: str,
+    verbose: bool,
+    cache_stats: CacheStats | None = None,
+    token_budget: int | None = None,
+    tokens_used: int = 0,
+    backend: LLMBackend | None = None,
+) -> None:
+    if cache_stats:
+        console.print(
+            f"Cache: {cache_stats.hits} hit(s), {cache_stats.misses} miss(es) "
+            f"({cache_stats.hit_ratio:.0%} hit ratio), {cache_stats.evictions} eviction(s)"
+        )
+    if totals.input_tokens:
+        console.print(
+            f"Prompt cache: {totals.cached_tokens:,} of {totals.input_tokens:,} input tokens "
+            f"cached ({totals.cached_tokens / totals.input_tokens:.0%} hit ratio)"
+        )
+    if totals.latencies:
+        _print_call_stats(totals.latencies, totals.call_stats)
+    if isinstance(backend, BatchBackend):
+        console.print(
+            f"Batch API: {backend.requests_submitted:,} request(s) "
+            f"in {backend.batches_submitted:,} batch(es)"
+        )
+    if token_budget is not None:
+        console.print(f"Token budget: {tokens_used:,} of {token_budget:,} used")
+    if totals.failed:
+        console.print(
+            f"[yellow]{len(totals.failed)} simulation(s) failed; "
+            "rerun with --resume to retry them.[/yellow]"
+        )
+    if verbose:
+        console.print(f"\n{totals.saved} simulation(s) saved to {save_path}")
+        console.print(f"Total tokens: {totals.input_tokens} input, {totals.output_tokens} output")
+
+
+async def run_simulations(
+    interviewer_prompt: str,
+    respondent_prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    max_turns: int,
+    num_simulations: int,
+    save_path: str,
+    verbose: bool,
+    scheduler: Scheduler | None = None,
+    resume: bool = False,
+    checkpoint_dir: str | None = None,
+    retry_policy: RetryPolicy | None = None,
+    cache_path: str | None = None,
+    backend: LLMBackend | None = None,
+    history: HistoryPolicy | None = None,
+    prompt_layout: str = "standard",
+):
+    scheduler = scheduler or Scheduler()
+    retry_policy = retry_policy or RetryPolicy()
+    cache = ResponseCache(cache_path) if cache_path else None
+    sim = Simulation(
+        scheduler=scheduler,
+        retry_policy=retry_policy,
+        circuit_breaker=CircuitBreaker.from_policy(retry_policy),
+        cache=cache,
+        backend=backend,
+    )
+    checkpoints = CheckpointStore(checkpoint_dir) if checkpoint_dir else None
+    pending = _pending_ids(save_path, num_simulations, resume)
+
+    interviewer_config, respondent_config = agent_configs(
+        interviewer_prompt,
+        respondent_prompt,
+        model,
+        temperature,
+        max_tokens,
+        history or HistoryPolicy(),
+        prompt_layout,
+    )
+
+    on_message = None
+    if verbose and num_simulations == 1:
+        console.print(
+            Panel(f"[bold]Simulated Interview[/bold] — {max_turns} turns, model: {model}")
+        )
+
+        def on_message(msg: Message):
+            console.print()
+            if msg.role == "interviewer":
+                console.print(Text("Interviewer: ", style="bold blue"), end="")
+            else:
+                console.print(Text("Respondent: ", style="bold green"), end="")
+            console.print(msg.text)
+
+    # Run simulations with bounded concurrency, paced by the scheduler's rate budget
+    # With a batch backend, each simulation counts towards the requests in a full batch
+    lockstep = backend.participant if isinstance(backend, BatchBackend) else nullcontext
+
+    async def run(sim_id: int) -> Transcript:
+        with lockstep():
+            return await _run_one_simulation(
+                sim,
+                sim_id,
+                interviewer_config,
+                respondent_config,
+                max_turns,
+                on_message,
+                checkpoints,
+                resume,
+            )
+
+    totals = _RunTotals()
+
+    def on_failed(sim_id: int, error: BaseException) -> None:
+        totals.failed.append(sim_id)
+        console.print(f"[red]Simulation {sim_id} failed: {error!r}[/red]")
+
+    def on_stopped(error: BaseException) -> None:
+        console.print(f"[red]Stopping: {error}. Rerun with --resume.[/red]")
+
+    # Write each transcript as soon as it completes: each row is the JSON of one conversation.
+    try:
+        async with AsyncTranscriptWriter(save_path, append=resume) as writer:
+
+            async def on_transcript(sim_id: int, transcript: Transcript) -> None:
+                await writer.write(sim_id, transcript)
+                if checkpoints:
+                    await writer.flush()
+                    checkpoints.discard(sim_id)
+                totals.add(*_row_stats(transcript))
+
+            results = scheduler.as_completed(run, pending, return_exceptions=True)
+            await _handle_results(results, on_transcript, on_failed, on_stopped)
+    finally:
+        if cache:
+            cache.close()
+    _report(
+        totals,
+        save_path,
+        verbose,
+        cache.stats if cache else None,
+        scheduler.token_budget,
+        scheduler.tokens_used,
+        backend,
+    )
+
+
+class Shard(BaseModel):
+    """One worker process's share of a ``simulate --workers`` run."""
+
+    worker: int
+    simulation_ids: list[int]
+    interviewer_config: AgentConfig
+    respondent_config: AgentConfig
+    max_turns: int
+    retry_policy: RetryPolicy
+    max_concurrency: int
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    token_budget: int | None = None
+    cache_path: str | None = None
+    backend: Literal["openai", "mock"] = "openai"
+    mock_latency: float = 0.5
+    checkpoint_dir: str | None = None
+    resume: bool = False
+
+
+def _shard_worker(shard: Shard, queue) -> None:
+    """Entry point of a worker process: run its shard on its own event loop."""
+    asyncio.run(_run_shard(shard, queue))
+
+
+async def _run_shard(shard: Shard, queue) -> None:
+    """Run ``shard``, sending each result to the parent as soon as it is ready.
+
+    Messages are tuples starting with a kind and the worker number: ``row`` (an
+    encoded results row and its stats), ``failed``, ``stopped`` and finally ``done``.
+    Rows are serialized here, so the parent only has to write them.
+    """
+    scheduler = Scheduler(
+        max_concurrency=shard.max_concurrency,
+        requests_per_minute=shard.requests_per_minute,
+        tokens_per_minute=shard.tokens_per_minute,
+        token_budget=shard.token_budget,
+    )
+    cache = ResponseCache(shard.cache_path) if shard.cache_path else None
+    sim = Simulation(
+        scheduler=scheduler,
+        retry_policy=shard.retry_policy,
+        circuit_breaker=CircuitBreaker.from_policy(shard.retry_policy),
+        cache=cache,
+        backend=create_backend("mock", latency=shard.mock_latency)
+        if shard.backend == "mock"
+        else None,
+    )
+    checkpoints = CheckpointStore(shard.checkpoint_dir) if shard.checkpoint_dir else None
+
+    async def run(sim_id: int) -> Transcript:
+        return await _run_one_simulation(
+            sim,
+            sim_id,
+            shard.interviewer_config,
+            shard.respondent_config,
+            shard.max_turns,
+            None,
+            checkpoints,
+            shard.resume,
+        )
+
+    async def on_transcript(sim_id: int, transcript: Transcript) -> None:
+        row = encode_row(sim_id, transcript)
+        queue.put(("row", shard.worker, sim_id, *row, _row_stats(transcript)))
+
+    def on_failed(sim_id: int, error: BaseException) -> None:
+        queue.put(("failed", shard.worker, sim_id, repr(error)))
+
+    def on_stopped(error: BaseException) -> None:
+        queue.put(("stopped", shard.worker, str(error)))
+
+    results = scheduler.as_completed(run, shard.simulation_ids, return_exceptions=True)
+    try:
+        await _handle_results(results, on_transcript, on_failed, on_stopped)
+    finally:
+        if cache:
+            cache.close()
+    errors = dict(call_metrics.errors.values)
+    summary = {
+        "tokens_used": scheduler.tokens_used,
+        "cache_stats": cache.stats if cache else None,
+        "errors": errors,
+    }
+    queue.put(("done", shard.worker, summary))
+
+
+def run_sharded(shard: Shard, workers: int, save_path: str, verbose: bool) -> None:
+    """Run a ``simulate`` across ``workers`` processes, merging their rows into one file.
+
+    Simulation ids are dealt out round-robin, so they stay unique and every worker gets
+    a similar mix. Each worker has its share of the concurrency, rate and token
+    budgets. Rows are written by this process as workers send them.
+    """
+    import multiprocessing
+    import queue as queue_module
+
+    pending = _pending_ids(save_path, len(shard.simulation_ids), shard.resume)
+    shards = [
+        shard.model_copy(update={"worker": w, "simulation_ids": pending[w::workers]})
+        for w in range(workers)
+    ]
+    # spawn: each worker starts clean, without copies of this process's threads or clients
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = {
+        s.worker: context.Process(target=_shard_worker, args=(s, queue), daemon=True)
+        for s in shards
+        if s.simulation_ids
+    }
+    for process in processes.values():
+        process.start()
+
+    checkpoints = CheckpointStore(shard.checkpoint_dir) if shard.checkpoint_dir else None
+    totals = _RunTotals()
+    cache_stats = CacheStats() if shard.cache_path else None
+    tokens_used = 0
+    running = set(processes)
+    try:
+        with TranscriptWriter(save_path, append=shard.resume) as writer:
+            while running:
+                try:
+                    kind, worker, *payload = queue.get(timeout=0.5)
+                except queue_module.Empty:
+                    for worker in list(running):
+                        code = processes[worker].exitcode
+                        if code is not None and code != 0:
+                            console.print(
+                                f"[red]Worker {worker} exited with code {code}. "
+                                "Rerun with --resume.[/red]"
+                            )
+                            running.discard(worker)
+                    continue
+                if kind == "row":
+                    sim_id, transcript_json, entry, row_stats = payload
+                    writer.write_encoded(sim_id, transcript_json, entry)
+                    if checkpoints:
+                        writer.flush()
+                        checkpoints.discard(sim_id)
+                    totals.add(*row_stats)
+                elif kind == "failed":
+                    sim_id, error = payload
+                    totals.failed.append(sim_id)
+                    console.print(f"[red]Simulation {sim_id} failed: {error}[/red]")
+                elif kind == "stopped":
+                    # The other workers keep their own budgets and circuit breakers
+                    console.print(
+                        f"[red]Worker {worker} stopping: {payload[0]}. Rerun with --resume.[/red]"
+                    )
+                elif kind == "done":
+                    summary = payload[0]
+                    running.discard(worker)
+                    tokens_used += summary["tokens_used"]
+                    if cache_stats and summary["cache_stats"]:
+                        for field, value in summary["cache_stats"]:
+                            setattr(cache_stats, field, getattr(cache_stats, field) + value)
+                    for (name, status), n in summary["errors"].items():
+                        call_metrics.errors.inc(n, type=name, status=status)
+    finally:
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    token_budget = shard.token_budget * workers if shard.token_budget is not None else None
+    _report(totals, save_path, verbose, cache_stats, token_budget, tokens_used)
@@ -1,5 +1,6 @@
 import { useCallback, useEffect, useRef, useState } from "react";
 import type { AgentConfig, Defaults, Message } from "./types";
+import { FINISHED_JOB_STATUSES } from "./types";
 import * as api from "./api";
 import Layout from "./components/Layout";
 import ChatPanel from "./components/ChatPanel";
@@ -16,6 +17,7 @@ export default function App() {
   const [respondentConfig, setRespondentConfig] =
     useState<AgentConfig | null>(null);
   const [loading, setLoading] = useState(false);
+  const [jobId, setJobId] = useState<string | null>(null);
   const [defaults, setDefaults] = useState<Defaults | null>(null);
 
   // Debounce timer for config updates
@@ -56,37 +58,63 @@ export default function App() {
     }
   }, [interviewerConfig, respondentConfig]);
 
+  // Appends streamed tokens to the interviewer message at the end of the list
+  const appendToLast = useCallback((delta: string) => {
+    setMessages((prev) => {
+      const last = prev[prev.length - 1];
+      return [...prev.slice(0, -1), { ...last, text: last.text + delta }];
+    });
+  }, []);
+
+  // Replaces the streamed text with the final message; a replayed request has no deltas
+  const setLast = useCallback((text: string) => {
+    setMessages((prev) => [
+      ...prev.slice(0, -1),
+      { ...prev[prev.length - 1], text },
+    ]);
+  }, []);
+
+  // Takes back messages added ahead of a stream that failed; the server saved none of them
+  const dropLast = useCallback((count: number) => {
+    setMessages((prev) => prev.slice(0, -count));
+  }, []);
+
   const handleStart = useCallback(async () => {
     if (!sessionId) return;
     setLoading(true);
+    setMessages((prev) => [...prev, { role: "interviewer", text: "" }]);
     try {
-      const result = await api.startSession(sessionId);
-      setMessages((prev) => [
-        ...prev,
-        { role: "interviewer", text: result.message.text },
-      ]);
+      const result = await api.startSessionStream(sessionId, appendToLast);
+      setLast(result.message.text);
       setStatus("active");
+    } catch (err) {
+      dropLast(1);
+      throw err;
     } finally {
       setLoading(false);
     }
-  }, [sessionId]);
+  }, [sessionId, appendToLast, setLast, dropLast]);
 
   const handleSend = useCallback(
     async (text: string) => {
       if (!sessionId) return;
       setLoading(true);
+      setMessages((prev) => [
+        ...prev,
+        { role: "respondent", text },
+        { role: "interviewer", text: "" },
+      ]);
       try {
-        const result = await api.sendMessage(sessionId, text);
-        setMessages((prev) => [
-          ...prev,
-          { role: "respondent", text: result.respondent_message.text },
-          { role: "interviewer", text: result.interviewer_message.text },
-        ]);
+        const result = await api.sendMessageStream(sessionId, text, appendToLast);
+        setLast(result.interviewer_message.text);
+      } catch (err) {
+        dropLast(2);
+        throw err;
       } finally {
         setLoading(false);
       }
     },
-    [sessionId]
+    [sessionId, appendToLast, setLast, dropLast]
   );
 
   const handleSimulateTurn = useCallback(async () => {
@@ -104,24 +132,32 @@ export default function App() {
     }
   }, [sessionId]);
 
+  // Simulate All runs as a background job; messages arrive as they are generated
   const handleSimulateAll = useCallback(async () => {
     if (!sessionId) return;
     setLoading(true);
-    try {
-      const result = await api.simulateAll(sessionId);
-      setMessages((prev) => [
-        ...prev,
-        ...result.new_messages.map((m) => ({
-          role: m.role as "interviewer" | "respondent",
-          text: m.text,
-        })),
-      ]);
-      setStatus("ended");
-    } finally {
+    const job = await api.simulateAll(sessionId).catch((err) => {
       setLoading(false);
-    }
+      throw err;
+    });
+    setJobId(job.id);
+    api.followJob(
+      job.id,
+      (message) => setMessages((prev) => [...prev, message]),
+      (summary) => {
+        if (!FINISHED_JOB_STATUSES.includes(summary.status)) return;
+        setJobId(null);
+        setLoading(false);
+        if (summary.status === "completed") setStatus("ended");
+        if (summary.error) console.error(summary.error);
+      }
+    );
   }, [sessionId]);
 
+  const handleCancelJob = useCallback(async () => {
+    if (jobId) await api.cancelJob(jobId);
+  }, [jobId]);
+
   const handleDownload = useCallback(async () => {
     if (!sessionId) return;
     const data = await api.getTranscript(sessionId, "json");
@@ -183,6 +219,7 @@ export default function App() {
           onSend={handleSend}
           onSimulateTurn={handleSimulateTurn}
           onSimulateAll={handleSimulateAll}
+          onCancelJob={jobId ? handleCancelJob : undefined}
           onDownload={handleDownload}
         />
       }
@@ -1,4 +1,14 @@
-import type { AgentConfig, Defaults, Session } from "./types";
+import type {
+  AgentConfig,
+  BatchLine,
+  BatchRequest,
+  Defaults,
+  Job,
+  JobSummary,
+  Message,
+  Session,
+} from "./types";
+import { FINISHED_JOB_STATUSES } from "./types";
 
 const BASE = "/api";
 
@@ -14,6 +24,55 @@ async function request<T>(path: string, opts?: RequestInit): Promise<T> {
   return res.json();
 }
 
+// Headers for a request that adds messages. The server applies a given key at most
+// once, so a request retried after a dropped connection is not applied twice.
+function idempotent(): Record<string, string> {
+  return {
+    "Content-Type": "application/json",
+    "Idempotency-Key": crypto.randomUUID(),
+  };
+}
+
+// Reads a Server-Sent Events response, calling onDelta for each "delta" event and
+// resolving with the payload of the final "done" event.
+async function streamRequest<T>(
+  path: string,
+  onDelta: (text: string) => void,
+  opts?: RequestInit
+): Promise<T> {
+  const res = await fetch(`${BASE}${path}`, {
+    headers: { "Content-Type": "application/json" },
+    ...opts,
+  });
+  if (!res.ok || !res.body) {
+    const detail = await res.text();
+    throw new Error(`API error ${res.status}: ${detail}`);
+  }
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let end;
+    while ((end = buffer.indexOf("\n\n")) !== -1) {
+      const block = buffer.slice(0, end);
+      buffer = buffer.slice(end + 2);
+      let event = "message";
+      let data = "";
+      for (const line of block.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      const payload = JSON.parse(data);
+      if (event === "delta") onDelta(payload.text);
+      else if (event === "done") return payload as T;
+      else if (event === "error") throw new Error(payload.detail);
+    }
+  }
+  throw new Error("Stream ended before the response was complete");
+}
+
 export async function createSession(
   interviewerConfig?: AgentConfig,
   respondentConfig?: AgentConfig
@@ -52,7 +111,10 @@ export async function updateConfig(
 export async function startSession(
   id: string
 ): Promise<{ message: { role: string; text: string } }> {
-  return request(`/sessions/${id}/start`, { method: "POST" });
+  return request(`/sessions/${id}/start`, {
+    method: "POST",
+    headers: idempotent(),
+  });
 }
 
 export async function sendMessage(
@@ -64,6 +126,32 @@ export async function sendMessage(
 }> {
   return request(`/sessions/${id}/messages`, {
     method: "POST",
+    headers: idempotent(),
+    body: JSON.stringify({ text }),
+  });
+}
+
+export async function startSessionStream(
+  id: string,
+  onDelta: (text: string) => void
+): Promise<{ message: { role: string; text: string } }> {
+  return streamRequest(`/sessions/${id}/start/stream`, onDelta, {
+    method: "POST",
+    headers: idempotent(),
+  });
+}
+
+export async function sendMessageStream(
+  id: string,
+  text: string,
+  onDelta: (text: string) => void
+): Promise<{
+  respondent_message: { role: string; text: string };
+  interviewer_message: { role: string; text: string };
+}> {
+  return streamRequest(`/sessions/${id}/messages/stream`, onDelta, {
+    method: "POST",
+    headers: idempotent(),
     body: JSON.stringify({ text }),
   });
 }
@@ -74,21 +162,85 @@ export async function simulateTurn(
   respondent_message: { role: string; text: string };
   interviewer_message: { role: string; text: string };
 }> {
-  return request(`/sessions/${id}/simulate-turn`, { method: "POST" });
+  return request(`/sessions/${id}/simulate-turn`, {
+    method: "POST",
+    headers: idempotent(),
+  });
 }
 
 export async function simulateAll(
   id: string,
   maxTurns: number = 5
-): Promise<{
-  new_messages: { role: string; text: string }[];
-  total_messages: number;
-}> {
+): Promise<Job> {
   return request(`/sessions/${id}/simulate-all?max_turns=${maxTurns}`, {
     method: "POST",
   });
 }
 
+export async function getJob(jobId: string): Promise<Job> {
+  return request(`/jobs/${jobId}`);
+}
+
+export async function cancelJob(jobId: string): Promise<void> {
+  await request(`/jobs/${jobId}/cancel`, { method: "POST" });
+}
+
+// Subscribes to a job's progress. Every message generated so far is replayed
+// first; onStatus receives each status change, ending with the final one.
+// Returns a function that closes the subscription.
+export function followJob(
+  jobId: string,
+  onMessage: (message: Message) => void,
+  onStatus: (summary: JobSummary) => void
+): () => void {
+  const source = new EventSource(`${BASE}/jobs/${jobId}/events`);
+  source.addEventListener("message", (e) =>
+    onMessage(JSON.parse((e as MessageEvent).data))
+  );
+  source.addEventListener("status", (e) => {
+    const summary: JobSummary = JSON.parse((e as MessageEvent).data);
+    if (FINISHED_JOB_STATUSES.includes(summary.status)) source.close();
+    onStatus(summary);
+  });
+  // Don't let EventSource reconnect: a new connection would replay every message
+  source.onerror = () => {
+    source.close();
+    onStatus({ status: "failed", error: "Lost connection to job", total_messages: 0 });
+  };
+  return () => source.close();
+}
+
+// Runs a batch of simulations, calling onLine for each NDJSON line as it arrives.
+// Aborting the signal cancels the simulations still running on the server.
+export async function runBatch(
+  req: BatchRequest,
+  onLine: (line: BatchLine) => void,
+  signal?: AbortSignal
+): Promise<void> {
+  const res = await fetch(`${BASE}/simulations/batch`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(req),
+    signal,
+  });
+  if (!res.ok || !res.body) {
+    const detail = await res.text();
+    throw new Error(`API error ${res.status}: ${detail}`);
+  }
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    const lines = buffer.split("\n");
+    buffer = lines.pop() ?? "";
+    for (const line of lines) {
+      if (line.trim()) onLine(JSON.parse(line));
+    }
+  }
+}
+
 export async function getTranscript(
   id: string,
   format: "json" | "csv" = "json"
@@ -0,0 +1,148 @@
+import { useRef, useState } from "react";
+import type { AgentConfig, BatchProgress } from "../types";
+import * as api from "../api";
+
+interface Props {
+  interviewerConfig: AgentConfig;
+  respondentConfig: AgentConfig;
+}
+
+export default function BatchPanel({ interviewerConfig, respondentConfig }: Props) {
+  const [count, setCount] = useState(100);
+  const [maxTurns, setMaxTurns] = useState(5);
+  const [concurrency, setConcurrency] = useState(16);
+  const [progress, setProgress] = useState<BatchProgress | null>(null);
+  const [running, setRunning] = useState(false);
+  const [error, setError] = useState<string | null>(null);
+  // Completed rows in JSONL results format, for download
+  const rowsRef = useRef<string[]>([]);
+  const abortRef = useRef<AbortController | null>(null);
+
+  const handleRun = async () => {
+    rowsRef.current = [];
+    setProgress(null);
+    setError(null);
+    setRunning(true);
+    const controller = new AbortController();
+    abortRef.current = controller;
+    try {
+      await api.runBatch(
+        {
+          interviewer_config: interviewerConfig,
+          respondent_config: respondentConfig,
+          max_turns: maxTurns,
+          count,
+          concurrency,
+        },
+        (line) => {
+          if (line.type === "transcript") {
+            const { simulation_id, transcript } = line;
+            rowsRef.current.push(JSON.stringify({ simulation_id, transcript }));
+          } else if (line.type !== "error") {
+            setProgress(line);
+          }
+        },
+        controller.signal
+      );
+    } catch (err) {
+      if (!controller.signal.aborted) setError(String(err));
+    } finally {
+      setRunning(false);
+      abortRef.current = null;
+    }
+  };
+
+  const handleDownload = () => {
+    const blob = new Blob([rowsRef.current.join("\n") + "\n"], {
+      type: "application/x-ndjson",
+    });
+    const url = URL.createObjectURL(blob);
+    const a = document.createElement("a");
+    a.href = url;
+    a.download = `batch-${progress?.id ?? "results"}.jsonl`;
+    a.click();
+    URL.revokeObjectURL(url);
+  };
+
+  const numberInput = (
+    label: string,
+    value: number,
+    onChange: (value: number) => void,
+    max: number
+  ) => (
+    <div>
+      <label className="text-sm font-medium text-gray-700 block mb-1">{label}</label>
+      <input
+        type="number"
+        min={1}
+        max={max}
+        value={value}
+        disabled={running}
+        onChange={(e) => onChange(Math.min(max, Math.max(1, parseInt(e.target.value) || 1)))}
+        className="w-full border rounded-lg px-3 py-2 text-sm focus:outline-none focus:ring-2 focus:ring-blue-500"
+      />
+    </div>
+  );
+
+  const done = progress ? progress.completed + progress.failed : 0;
+
+  return (
+    <div className="space-y-4">
+      <p className="text-sm text-gray-500">
+        Run many independent simulations with the current interviewer and
+        respondent configuration.
+      </p>
+      {numberInput("Simulations", count, setCount, 10000)}
+      {numberInput("Turns per interview", maxTurns, setMaxTurns, 50)}
+      {numberInput("Concurrency", concurrency, setConcurrency, 64)}
+
+      <div className="flex gap-2">
+        {running ? (
+          <button
+            onClick={() => abortRef.current?.abort()}
+            className="text-sm px-3 py-1.5 rounded bg-red-100 text-red-800 hover:bg-red-200"
+          >
+            Cancel
+          </button>
+        ) : (
+          <button
+            onClick={handleRun}
+            className="text-sm px-3 py-1.5 rounded bg-orange-100 text-orange-800 hover:bg-orange-200"
+          >
+            Run Batch
+          </button>
+        )}
+        {!running && rowsRef.current.length > 0 && (
+          <button
+            onClick={handleDownload}
+            className="text-sm px-3 py-1.5 rounded bg-gray-100 hover:bg-gray-200"
+          >
+            Download Results (.jsonl)
+          </button>
+        )}
+      </div>
+
+      {progress && (
+        <div className="space-y-1 text-sm text-gray-700">
+          <div className="w-full bg-gray-100 rounded h-2">
+            <div
+              className="bg-orange-400 h-2 rounded"
+              style={{ width: `${(100 * done) / progress.total}%` }}
+            />
+          </div>
+          <div>
+            {progress.completed} completed, {progress.failed} failed of {progress.total}
+            {progress.status !== "running" && ` (${progress.status})`}
+          </div>
+          <div>
+            Tokens: {progress.input_tokens.toLocaleString()} input,{" "}
+            {progress.output_tokens.toLocaleString()} output
+            {progress.input_tokens > 0 &&
+              ` (${Math.round((100 * progress.cached_tokens) / progress.input_tokens)}% of input cached)`}
+          </div>
+        </div>
+      )}
+      {error && <div className="text-sm text-red-600">{error}</div>}
+    </div>
+  );
+}
@@ -13,6 +13,7 @@ interface Props {
   onSend: (text: string) => void;
   onSimulateTurn: () => void;
   onSimulateAll: () => void;
+  onCancelJob?: () => void;
   onDownload: () => void;
 }
 
@@ -26,6 +27,7 @@ export default function ChatPanel({
   onSend,
   onSimulateTurn,
   onSimulateAll,
+  onCancelJob,
   onDownload,
 }: Props) {
   const messagesEndRef = useRef<HTMLDivElement>(null);
@@ -75,6 +77,15 @@ export default function ChatPanel({
           </>
         )}
 
+        {onCancelJob && (
+          <button
+            onClick={onCancelJob}
+            className="text-sm px-3 py-1.5 rounded bg-red-100 text-red-800 hover:bg-red-200"
+          >
+            Cancel Simulation
+          </button>
+        )}
+
         {sessionId && messages.length > 0 && (
           <button
             onClick={onDownload}
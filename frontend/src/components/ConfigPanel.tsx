@@ -1,5 +1,6 @@
 import { useState } from "react";
 import type { AgentConfig } from "../types";
+import BatchPanel from "./BatchPanel";
 import PromptPreview from "./PromptPreview";
 
 interface Props {
@@ -8,7 +9,7 @@ interface Props {
   onConfigChange: (type: "interviewer" | "respondent", config: AgentConfig) => void;
 }
 
-type Tab = "interviewer" | "respondent" | "model";
+type Tab = "interviewer" | "respondent" | "model" | "batch";
 
 export default function ConfigPanel({
   interviewerConfig,
@@ -22,6 +23,7 @@ export default function ConfigPanel({
     { key: "interviewer", label: "Interviewer" },
     { key: "respondent", label: "Respondent" },
     { key: "model", label: "Model" },
+    { key: "batch", label: "Batch" },
   ];
 
   const handleFileLoad = (type: "interviewer" | "respondent") => {
@@ -206,6 +208,14 @@ export default function ConfigPanel({
             </div>
           </div>
         )}
+
+        {/* Kept mounted so a running batch survives switching tabs */}
+        <div className={tab === "batch" ? "" : "hidden"}>
+          <BatchPanel
+            interviewerConfig={interviewerConfig}
+            respondentConfig={respondentConfig}
+          />
+        </div>
       </div>
 
       {/* Prompt Preview Modal */}
@@ -3,11 +3,21 @@ export interface Message {
   text: string;
 }
 
+export interface HistoryPolicy {
+  strategy: "full" | "window" | "token_budget" | "summarize";
+  max_messages: number;
+  max_input_tokens: number;
+  summary_model: string | null;
+  summary_max_tokens: number;
+}
+
 export interface AgentConfig {
   system_prompt: string;
   model: string;
   temperature: number;
   max_tokens: number;
+  history?: HistoryPolicy;
+  prompt_layout?: "standard" | "prefix_stable";
 }
 
 export interface Session {
@@ -16,6 +26,7 @@ export interface Session {
   respondent_config: AgentConfig;
   messages: Message[];
   status: "created" | "active" | "ended";
+  version: number;
 }
 
 export interface Defaults {
@@ -25,3 +36,47 @@ export interface Defaults {
   temperature: number;
   max_tokens: number;
 }
+
+export type JobStatus = "queued" | "running" | "completed" | "failed" | "cancelled";
+
+export const FINISHED_JOB_STATUSES: JobStatus[] = ["completed", "failed", "cancelled"];
+
+export interface JobSummary {
+  status: JobStatus;
+  error: string | null;
+  total_messages: number;
+}
+
+export interface Job {
+  id: string;
+  session_id: string;
+  max_turns: number;
+  status: JobStatus;
+  messages: Message[];
+  error: string | null;
+}
+
+export interface BatchRequest {
+  interviewer_config: AgentConfig;
+  respondent_config: AgentConfig;
+  max_turns: number;
+  count: number;
+  concurrency: number;
+}
+
+export interface BatchProgress {
+  id: string;
+  total: number;
+  completed: number;
+  failed: number;
+  input_tokens: number;
+  output_tokens: number;
+  cached_tokens: number;
+  status: "running" | "completed" | "stopped" | "cancelled";
+  error: string | null;
+}
+
+export type BatchLine =
+  | ({ type: "started" | "progress" | "summary" } & BatchProgress)
+  | { type: "transcript"; simulation_id: number; transcript: unknown }
+  | { type: "error"; simulation_id: number; detail: string };
@@ -1,32 +1,201 @@
-"""Standalone AI Interviewer — symmetric LLM agents for qualitative research."""
-
-from .core import Interviewer
-from .defaults import (
-    DEFAULT_INTERVIEWER_SYSTEM_PROMPT,
-    DEFAULT_MAX_TOKENS,
-    DEFAULT_MODEL,
-    DEFAULT_RESPONDENT_SYSTEM_PROMPT,
-    DEFAULT_TEMPERATURE,
-)
-from .logging import save_transcript
-from .models import AgentConfig, AgentResponse, LLMCallInfo, Message, Transcript, load_prompt
-from .respondent import SimulatedRespondent
-from .simulation import Simulation
+"""Standalone AI Interviewer — symmetric LLM agents for qualitative research.
+
+Names are imported from their submodules on first access, so ``import interviewer``
+is cheap and the OpenAI SDK is only loaded by code that talks to the API.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .backends import Completion, LLMBackend, MockBackend, OpenAIBackend, create_backend
+    from .batch_api import (
+        BatchBackend,
+        BatchFailedError,
+        BatchService,
+        LocalBatchService,
+        OpenAIBatchService,
+    )
+    from .cache import CacheStats, ResponseCache
+    from .checkpoint import CheckpointStore
+    from .client import ClientSettings, aclose_clients, configure_clients, get_client
+    from .core import Interviewer
+    from .defaults import (
+        DEFAULT_INTERVIEWER_SYSTEM_PROMPT,
+        DEFAULT_MAX_TOKENS,
+        DEFAULT_MODEL,
+        DEFAULT_RESPONDENT_SYSTEM_PROMPT,
+        DEFAULT_TEMPERATURE,
+        load_prompt,
+    )
+    from .estimate import MODEL_PRICES, RunEstimate, estimate_run
+    from .logging import (
+        AsyncTranscriptWriter,
+        TranscriptWriter,
+        completed_simulation_ids,
+        encode_row,
+        jsonl_record,
+        read_transcripts,
+        save_transcript,
+        save_transcript_async,
+        transcript_csv,
+    )
+    from .metrics import CallMetrics, CallTimer, call_metrics
+    from .models import (
+        AgentConfig,
+        AgentResponse,
+        CallStats,
+        HistoryPolicy,
+        LLMCallInfo,
+        Message,
+        Transcript,
+    )
+    from .prompt import PromptBuffer
+    from .respondent import SimulatedRespondent
+    from .results_index import PREVIEW_CHARS, IndexEntry, ResultsIndex
+    from .retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+    from .scheduler import BudgetExceededError, RateLimiter, Scheduler
+    from .simulation import Simulation, interview_plan
+    from .tokens import count_tokens
+
+_EXPORTS = {
+    "Completion": "backends",
+    "LLMBackend": "backends",
+    "MockBackend": "backends",
+    "OpenAIBackend": "backends",
+    "create_backend": "backends",
+    "BatchBackend": "batch_api",
+    "BatchFailedError": "batch_api",
+    "BatchService": "batch_api",
+    "LocalBatchService": "batch_api",
+    "OpenAIBatchService": "batch_api",
+    "CacheStats": "cache",
+    "ResponseCache": "cache",
+    "CheckpointStore": "checkpoint",
+    "ClientSettings": "client",
+    "aclose_clients": "client",
+    "configure_clients": "client",
+    "get_client": "client",
+    "Interviewer": "core",
+    "DEFAULT_INTERVIEWER_SYSTEM_PROMPT": "defaults",
+    "DEFAULT_MAX_TOKENS": "defaults",
+    "DEFAULT_MODEL": "defaults",
+    "DEFAULT_RESPONDENT_SYSTEM_PROMPT": "defaults",
+    "DEFAULT_TEMPERATURE": "defaults",
+    "MODEL_PRICES": "estimate",
+    "RunEstimate": "estimate",
+    "estimate_run": "estimate",
+    "AsyncTranscriptWriter": "logging",
+    "TranscriptWriter": "logging",
+    "completed_simulation_ids": "logging",
+    "encode_row": "logging",
+    "jsonl_record": "logging",
+    "read_transcripts": "logging",
+    "save_transcript": "logging",
+    "save_transcript_async": "logging",
+    "transcript_csv": "logging",
+    "CallMetrics": "metrics",
+    "CallTimer": "metrics",
+    "call_metrics": "metrics",
+    "AgentConfig": "models",
+    "AgentResponse": "models",
+    "CallStats": "models",
+    "HistoryPolicy": "models",
+    "LLMCallInfo": "models",
+    "Message": "models",
+    "Transcript": "models",
+    "load_prompt": "defaults",
+    "PromptBuffer": "prompt",
+    "SimulatedRespondent": "respondent",
+    "PREVIEW_CHARS": "results_index",
+    "IndexEntry": "results_index",
+    "ResultsIndex": "results_index",
+    "CircuitBreaker": "retry",
+    "CircuitOpenError": "retry",
+    "RetryPolicy": "retry",
+    "BudgetExceededError": "scheduler",
+    "RateLimiter": "scheduler",
+    "Scheduler": "scheduler",
+    "Simulation": "simulation",
+    "interview_plan": "simulation",
+    "count_tokens": "tokens",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
 
 __all__ = [
     "AgentConfig",
     "AgentResponse",
+    "AsyncTranscriptWriter",
+    "BatchBackend",
+    "BatchFailedError",
+    "BatchService",
+    "BudgetExceededError",
+    "CacheStats",
+    "CallMetrics",
+    "CallStats",
+    "CallTimer",
+    "CheckpointStore",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ClientSettings",
+    "Completion",
     "DEFAULT_INTERVIEWER_SYSTEM_PROMPT",
     "DEFAULT_MAX_TOKENS",
     "DEFAULT_MODEL",
     "DEFAULT_RESPONDENT_SYSTEM_PROMPT",
     "DEFAULT_TEMPERATURE",
+    "HistoryPolicy",
+    "IndexEntry",
     "Interviewer",
+    "LLMBackend",
     "LLMCallInfo",
+    "LocalBatchService",
+    "MODEL_PRICES",
     "Message",
+    "MockBackend",
+    "OpenAIBackend",
+    "OpenAIBatchService",
+    "PREVIEW_CHARS",
+    "PromptBuffer",
+    "RateLimiter",
+    "ResponseCache",
+    "ResultsIndex",
+    "RetryPolicy",
+    "RunEstimate",
+    "Scheduler",
     "SimulatedRespondent",
     "Simulation",
     "Transcript",
+    "TranscriptWriter",
+    "aclose_clients",
+    "call_metrics",
+    "completed_simulation_ids",
+    "configure_clients",
+    "count_tokens",
+    "create_backend",
+    "encode_row",
+    "estimate_run",
+    "get_client",
+    "interview_plan",
+    "jsonl_record",
     "load_prompt",
+    "read_transcripts",
     "save_transcript",
+    "save_transcript_async",
+    "transcript_csv",
 ]
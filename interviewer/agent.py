@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+from .backends import Completion, LLMBackend, OpenAIBackend
+from .cache import ResponseCache
+from .defaults import SUMMARY_SYSTEM_PROMPT
+from .history import history_start
+from .metrics import CallMetrics, CallTimer
+from .models import AgentConfig, Message
+from .prompt import Perspective, PromptBuffer, format_messages, prompt_hash, summary_message
+from .records import CallRecord, Reply
+from .retry import CircuitBreaker, RetryPolicy, call_with_retry
+from .scheduler import Scheduler
+
+
+class BaseAgent:
+    """Shared plumbing for LLM-backed agents: backend, pacing, retries, caching."""
+
+    perspective: Perspective
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        scheduler: Scheduler | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+        cache_replica: int | None = None,
+        backend: LLMBackend | None = None,
+        metrics: CallMetrics | None = None,
+    ):
+        self._backend = backend or OpenAIBackend(api_key, base_url)
+        self._scheduler = scheduler
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._circuit_breaker = circuit_breaker
+        self._cache = cache
+        self._cache_replica = cache_replica
+        self._metrics = metrics
+
+    @property
+    def backend(self) -> LLMBackend:
+        return self._backend
+
+    def _call_info(
+        self,
+        model: str,
+        api_messages: list[dict],
+        params: dict[str, Any],
+        message_range: tuple[int, int] | None,
+        instruction: str | None,
+        summary: str | None = None,
+    ) -> dict[str, Any]:
+        if message_range is None:
+            return {"model": model, "messages": api_messages, "params": params}
+        return {
+            "model": model,
+            "perspective": self.perspective,
+            "system_prompt_hash": prompt_hash(api_messages[0]["content"]),
+            "message_range": message_range,
+            "instruction": instruction,
+            "summary": summary,
+            "params": params,
+        }
+
+    def _format_messages(self, messages: list[Message], config: AgentConfig) -> list[dict]:
+        return format_messages(config.system_prompt, messages, self.perspective)
+
+    def _history(
+        self,
+        messages: list[Message],
+        config: AgentConfig,
+        prompt_buffer: PromptBuffer | None,
+    ) -> tuple[list[dict], tuple[int, int], str | None]:
+        """The prompt for a call carrying ``messages``, trimmed per ``config.history``.
+
+        Returns the API messages, the range of ``messages`` they include and the summary
+        sent in place of the messages before that range, if any. The ``summarize``
+        policy keeps its summary on the ``PromptBuffer``; without one it falls back to
+        a plain window.
+        """
+        if prompt_buffer:
+            api_messages = prompt_buffer.build(config.system_prompt, messages)
+        else:
+            api_messages = self._format_messages(messages, config)
+        policy = config.history
+        start = history_start(
+            policy,
+            api_messages,
+            lambda m: self._backend.count_tokens(config.model, m),
+            stable=config.prompt_layout == "prefix_stable",
+        )
+        summary = None
+        if policy.strategy == "summarize" and prompt_buffer:
+            rolling = prompt_buffer.summary
+            summary, covered = rolling.current(messages)
+            if start - covered >= policy.max_messages:
+
+                def summarize(previous: str | None, begin: int, end: int):
+                    return self._summarize(config, previous, messages[begin:end], (begin, end))
+
+                rolling.refresh(summarize, messages, start)
+            start = covered
+        if start == 0:
+            return api_messages, (0, len(messages)), None
+        head = [api_messages[0], summary_message(summary)] if summary else api_messages[:1]
+        return head + api_messages[start + 1 :], (start, len(messages)), summary
+
+    async def _summarize(
+        self,
+        config: AgentConfig,
+        previous: str | None,
+        messages: list[Message],
+        message_range: tuple[int, int],
+    ) -> Reply:
+        """Fold ``messages`` into the ``previous`` summary with one LLM call."""
+        policy = config.history
+        lines = "\n".join(f"{m.role.capitalize()}: {m.text}" for m in messages)
+        content = f"Summary so far:\n{previous}\n\n" if previous else ""
+        content += f"New messages:\n{lines}"
+        api_messages = [
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": content},
+        ]
+        params = {"temperature": 0, "max_completion_tokens": policy.summary_max_tokens}
+        model = policy.summary_model or config.model
+        reply = await self._complete(model, api_messages, params, None)
+        return reply._replace(call=reply.call._replace(summary_of=message_range))
+
+    def _cached(
+        self, model: str, api_messages: list[dict], params: dict[str, Any]
+    ) -> tuple[str | None, Completion | None]:
+        """Cache key for this request (None without a cache) and the cached completion."""
+        if not self._cache:
+            return None, None
+        key = ResponseCache.key(model, params, api_messages, self._cache_replica)
+        return key, self._cache.get(key)
+
+    @staticmethod
+    def _params(config: AgentConfig, max_tokens: int) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "temperature": config.temperature,
+            "max_completion_tokens": max_tokens,
+        }
+        if config.prompt_layout == "prefix_stable":
+            # Routes requests sharing a system prompt to the same provider-side cache
+            params["prompt_cache_key"] = prompt_hash(config.system_prompt)
+        return params
+
+    def _reserve(self, model: str, api_messages: list[dict], params: dict[str, Any]) -> int:
+        """Reserve the call's worst-case tokens in the scheduler's budget; 0 without one."""
+        if not self._scheduler:
+            return 0
+        estimated = (
+            self._backend.count_tokens(model, api_messages) + params["max_completion_tokens"]
+        )
+        self._scheduler.reserve(estimated)
+        return estimated
+
+    def _settle(self, reserved: int, completion: Completion | None) -> None:
+        """Replace a reservation with the tokens the call used (none if it failed)."""
+        if self._scheduler:
+            used = completion.input_tokens + completion.output_tokens if completion else 0
+            self._scheduler.settle(reserved, used)
+
+    def _before_attempt(self, estimated: int):
+        """Hook that waits for a scheduler slot before each attempt, or None without one."""
+        if not self._scheduler:
+            return None
+
+        async def before_attempt():
+            await self._scheduler.acquire(estimated)
+
+        return before_attempt
+
+    @staticmethod
+    def _response(
+        call_info: dict[str, Any],
+        completion: Completion,
+        timer: CallTimer,
+        retries: int = 0,
+        cache_hit: bool = False,
+    ) -> Reply:
+        timer.completed(completion, retries, cache_hit)
+        return Reply(
+            completion.text,
+            CallRecord(
+                **call_info,
+                input_tokens=completion.input_tokens,
+                output_tokens=completion.output_tokens,
+                cached_tokens=completion.cached_tokens,
+                retries=retries,
+                cache_hit=cache_hit,
+                status_code=None if cache_hit else completion.status_code,
+                **timer.timing(),
+            ),
+        )
+
+    async def _complete(
+        self,
+        model: str,
+        api_messages: list[dict],
+        params: dict[str, Any],
+        message_range: tuple[int, int] | None,
+        instruction: str | None = None,
+        summary: str | None = None,
+    ) -> Reply:
+        """Send one chat completion request, paced by the scheduler and retried per policy.
+
+        ``message_range``, ``instruction`` and ``summary`` describe how ``api_messages``
+        was built from the transcript, so the returned ``CallRecord`` can reference the
+        prompt instead of holding a copy of it (pass None as the range to keep a copy).
+        With a cache configured, identical requests for the same replica are answered
+        without calling the provider. With a scheduler, the call's worst-case tokens
+        count against its token budget until the actual usage is known. The call is
+        timed from here, and its timestamps are saved on the ``CallRecord``.
+        """
+        call_info = self._call_info(
+            model, api_messages, params, message_range, instruction, summary
+        )
+        timer = CallTimer(model, self._metrics)
+        cache_key, cached = self._cached(model, api_messages, params)
+        if cached:
+            return self._response(call_info, cached, timer, cache_hit=True)
+
+        async def attempt() -> Completion:
+            timer.sent()
+            return await self._backend.generate(model, api_messages, params)
+
+        completion: Completion | None = None
+        reserved = 0
+        try:
+            reserved = self._reserve(model, api_messages, params)
+            completion, retries = await call_with_retry(
+                attempt,
+                self._retry_policy,
+                self._circuit_breaker,
+                self._before_attempt(reserved),
+                timer.failed,
+            )
+        finally:
+            timer.close()
+            self._settle(reserved, completion)
+        if cache_key:
+            self._cache.put(cache_key, completion)
+        return self._response(call_info, completion, timer, retries)
+
+    async def _stream(
+        self,
+        model: str,
+        api_messages: list[dict],
+        params: dict[str, Any],
+        message_range: tuple[int, int],
+        instruction: str | None = None,
+        summary: str | None = None,
+    ) -> AsyncIterator[str | Reply]:
+        """Streaming ``_complete``: yield text deltas, then the final ``Reply``.
+
+        Retries cover the wait for the first delta; once text has been yielded a failure
+        is raised rather than retried, since it cannot be taken back. ``call_timeout``
+        bounds the wait for the first delta and for each one after it, so a stream that
+        stalls part way raises ``asyncio.TimeoutError``. A cache hit is yielded as a
+        single delta.
+        """
+        call_info = self._call_info(
+            model, api_messages, params, message_range, instruction, summary
+        )
+        timer = CallTimer(model, self._metrics)
+        cache_key, cached = self._cached(model, api_messages, params)
+        if cached:
+            yield cached.text
+            yield self._response(call_info, cached, timer, cache_hit=True)
+            return
+
+        stream = None
+
+        async def first_chunk() -> str | Completion:
+            nonlocal stream
+            timer.sent()
+            stream = self._backend.stream(model, api_messages, params)
+            try:
+                chunk = await anext(stream)
+            except BaseException:
+                await stream.aclose()
+                raise
+            timer.first_token()
+            return chunk
+
+        chunk = None
+        reserved = 0
+        try:
+            reserved = self._reserve(model, api_messages, params)
+            chunk, retries = await call_with_retry(
+                first_chunk,
+                self._retry_policy,
+                self._circuit_breaker,
+                self._before_attempt(reserved),
+                timer.failed,
+            )
+            try:
+                while not isinstance(chunk, Completion):
+                    yield chunk
+                    chunk = await asyncio.wait_for(anext(stream), self._retry_policy.call_timeout)
+            except Exception as exc:
+                timer.failed(exc)
+                raise
+            finally:
+                await stream.aclose()
+        finally:
+            timer.close()
+            self._settle(reserved, chunk if isinstance(chunk, Completion) else None)
+
+        if cache_key:
+            self._cache.put(cache_key, chunk)
+        yield self._response(call_info, chunk, timer, retries)
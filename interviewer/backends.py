@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import random
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+from pydantic import BaseModel
+
+from .client import get_client
+from .tokens import TOKENS_PER_MESSAGE, count_text_tokens, count_tokens
+
+if TYPE_CHECKING:
+    import openai
+    from openai import AsyncOpenAI
+
+
+class Completion(BaseModel):
+    """Provider-independent result of one chat completion."""
+
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    status_code: int | None = None
+
+
+@runtime_checkable
+class LLMBackend(Protocol):
+    """What the agents need from an LLM provider."""
+
+    async def generate(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> Completion: ...
+
+    def stream(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> AsyncIterator[str | Completion]:
+        """Yield text deltas as they arrive, then a final ``Completion`` with usage."""
+        ...
+
+    def count_tokens(self, model: str, messages: list[dict[str, Any]]) -> int: ...
+
+
+class OpenAIBackend:
+    """Chat completions via the shared, pooled ``AsyncOpenAI`` client."""
+
+    def __init__(self, api_key: str | None = None, base_url: str | None = None):
+        self._api_key = api_key or os.environ.get("OPENAI_API_KEY")
+        if not self._api_key:
+            raise ValueError("OpenAI API key required. Pass api_key or set OPENAI_API_KEY env var.")
+        self._base_url = base_url or os.environ.get("OPENAI_BASE_URL")
+
+    @property
+    def api_key(self) -> str:
+        return self._api_key
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        return get_client(self._api_key, self._base_url)
+
+    async def generate(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> Completion:
+        raw = await self.client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            **_sdk_params(params),
+        )
+        response = raw.parse()
+        return _completion(
+            response.choices[0].message.content or "", response.usage, raw.status_code
+        )
+
+    async def stream(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> AsyncIterator[str | Completion]:
+        raw = await self.client.chat.completions.with_raw_response.create(
+            model=model,
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            **_sdk_params(params),
+        )
+        response = raw.parse()
+        parts: list[str] = []
+        usage = None
+        async for chunk in response:
+            if chunk.usage:
+                usage = chunk.usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                delta = chunk.choices[0].delta.content
+                parts.append(delta)
+                yield delta
+        yield _completion("".join(parts), usage, raw.status_code)
+
+    def count_tokens(self, model: str, messages: list[dict[str, Any]]) -> int:
+        return count_tokens(model, messages)
+
+
+def _sdk_params(params: dict[str, Any]) -> dict[str, Any]:
+    """``params`` as SDK arguments, with ``prompt_cache_key`` sent in the request body.
+
+    SDK releases older than the parameter reject it as a keyword argument; the API
+    accepts it either way.
+    """
+    if "prompt_cache_key" not in params:
+        return params
+    params = dict(params)
+    key = params.pop("prompt_cache_key")
+    return {**params, "extra_body": {"prompt_cache_key": key}}
+
+
+def _completion(text: str, usage: Any, status_code: int | None = None) -> Completion:
+    """A ``Completion`` from an OpenAI usage payload (which may be missing)."""
+    if usage is None:
+        return Completion(text=text, status_code=status_code)
+    details = getattr(usage, "prompt_tokens_details", None)
+    return Completion(
+        text=text,
+        input_tokens=usage.prompt_tokens,
+        output_tokens=usage.completion_tokens,
+        cached_tokens=(getattr(details, "cached_tokens", None) or 0) if details else 0,
+        status_code=status_code,
+    )
+
+
+_MOCK_WORDS = [
+    "that",
+    "is",
+    "a",
+    "really",
+    "interesting",
+    "point",
+    "could",
+    "you",
+    "tell",
+    "me",
+    "more",
+    "about",
+    "how",
+    "it",
+    "felt",
+    "at",
+    "the",
+    "time",
+    "and",
+    "what",
+    "you",
+    "would",
+    "do",
+    "differently",
+    "next",
+    "time",
+    "around",
+]
+
+
+class MockBackend:
+    """Offline stand-in for an LLM provider, for tests and load testing.
+
+    Responses are synthetic text of a random length, delivered after a log-normally
+    distributed delay. A fraction of calls fail with the same errors a real provider
+    raises (HTTP 500 and 429), so retry and circuit-breaker paths are exercised too.
+
+    Prompt caching is simulated the way OpenAI's works: the longest prefix of whole
+    messages seen in an earlier request is reported as ``cached_tokens``, once it
+    reaches ``prompt_cache_min_tokens``, in increments of ``prompt_cache_increment``.
+
+    Args:
+        latency: Median delay per call, in seconds.
+        latency_sigma: Spread of the log-normal latency distribution.
+        output_tokens: Inclusive (min, max) range of output tokens per response,
+            further capped by the request's ``max_completion_tokens``.
+        error_rate: Probability that a call fails with HTTP 500.
+        rate_limit_rate: Probability that a call fails with HTTP 429.
+        seed: Seed for reproducible latencies, lengths and failures.
+        record: Keep every request in ``requests`` (for tests; unbounded).
+        prompt_cache_min_tokens: Shortest prefix, in tokens, that can be served from
+            the simulated prompt cache.
+        prompt_cache_increment: Granularity, in tokens, of cached prefixes.
+        prompt_cache_size: Number of message prefixes remembered by the prompt cache.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_sigma: float = 0.5,
+        output_tokens: tuple[int, int] = (20, 80),
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: int | None = None,
+        record: bool = False,
+        prompt_cache_min_tokens: int = 1024,
+        prompt_cache_increment: int = 128,
+        prompt_cache_size: int = 100_000,
+    ):
+        self.latency = latency
+        self.latency_sigma = latency_sigma
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.calls = 0
+        self.requests: list[dict[str, Any]] | None = [] if record else None
+        self.prompt_cache_min_tokens = prompt_cache_min_tokens
+        self.prompt_cache_increment = prompt_cache_increment
+        self.prompt_cache_size = prompt_cache_size
+        self._prefixes: OrderedDict[int, None] = OrderedDict()
+        self._random = random.Random(seed)
+
+    def _delay(self) -> float:
+        if self.latency <= 0:
+            return 0.0
+        return self._random.lognormvariate(math.log(self.latency), self.latency_sigma)
+
+    def _maybe_fail(self) -> None:
+        import openai
+
+        roll = self._random.random()
+        if roll < self.error_rate:
+            raise _status_error(openai.InternalServerError, 500, "Mock server error")
+        if roll < self.error_rate + self.rate_limit_rate:
+            raise _status_error(openai.RateLimitError, 429, "Mock rate limit")
+
+    def _cached_tokens(self, model: str, messages: list[dict[str, Any]]) -> int:
+        """Tokens in the longest previously seen prefix, then remember this prompt's prefixes."""
+        prefix, tokens, cached = 0, 0, 0
+        for message in messages:
+            prefix = hash((prefix, message["role"], message.get("content") or ""))
+            tokens += TOKENS_PER_MESSAGE + count_text_tokens(message.get("content") or "", model)
+            if prefix in self._prefixes:
+                self._prefixes.move_to_end(prefix)
+                cached = tokens
+            else:
+                self._prefixes[prefix] = None
+        while len(self._prefixes) > self.prompt_cache_size:
+            self._prefixes.popitem(last=False)
+        if cached < self.prompt_cache_min_tokens:
+            return 0
+        return cached - (cached - self.prompt_cache_min_tokens) % self.prompt_cache_increment
+
+    def _respond(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> Completion:
+        self.calls += 1
+        if self.requests is not None:
+            self.requests.append({"model": model, "messages": messages, **params})
+        low, high = self.output_tokens
+        n = self._random.randint(low, high)
+        n = min(n, params.get("max_completion_tokens") or n)
+        words = [self._random.choice(_MOCK_WORDS) for _ in range(max(n - 2, 0))]
+        return Completion(
+            text=" ".join([f"reply {self.calls}", *words]).strip(),
+            input_tokens=self.count_tokens(model, messages),
+            output_tokens=n,
+            cached_tokens=self._cached_tokens(model, messages),
+            status_code=200,
+        )
+
+    async def generate(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> Completion:
+        await asyncio.sleep(self._delay())
+        self._maybe_fail()
+        return self._respond(model, messages, params)
+
+    async def stream(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> AsyncIterator[str | Completion]:
+        delay = self._delay()
+        self._maybe_fail()
+        completion = self._respond(model, messages, params)
+        words = completion.text.split(" ")
+        # Time to first token is a fraction of the total; the rest is spread across tokens
+        await asyncio.sleep(delay * 0.3)
+        for i, word in enumerate(words):
+            yield word if i == 0 else f" {word}"
+            await asyncio.sleep(delay * 0.7 / len(words))
+        yield completion
+
+    def count_tokens(self, model: str, messages: list[dict[str, Any]]) -> int:
+        return count_tokens(model, messages)
+
+
+def _status_error(cls: type[openai.APIStatusError], status: int, message: str):
+    import httpx
+
+    request = httpx.Request("POST", "https://mock.invalid/v1/chat/completions")
+    response = httpx.Response(status, request=request, headers={"retry-after-ms": "10"})
+    return cls(message, response=response, body=None)
+
+
+def create_backend(
+    name: str = "openai",
+    api_key: str | None = None,
+    base_url: str | None = None,
+    **kwargs: Any,
+) -> LLMBackend:
+    """Build a backend by name: "openai" (default) or "mock" (kwargs go to MockBackend)."""
+    if name == "openai":
+        return OpenAIBackend(api_key=api_key, base_url=base_url)
+    if name == "mock":
+        return MockBackend(**kwargs)
+    raise ValueError(f"Unknown backend: {name!r}. Use 'openai' or 'mock'.")
@@ -0,0 +1,322 @@
+"""Offline simulation studies through a provider's batch API.
+
+Batch APIs trade latency for price: requests are uploaded as a JSONL file and answered
+within hours, at a discount. ``BatchBackend`` lets unmodified simulations use one by
+holding each chat completion until every running simulation is waiting on one, then
+submitting them together, so a study advances turn by turn with one batch per turn.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Protocol
+
+import openai
+from openai.types import CompletionUsage
+
+from .backends import Completion, LLMBackend, OpenAIBackend, _completion, _status_error
+from .cache import ResponseCache
+from .retry import is_retryable
+from .tokens import count_tokens
+
+CHAT_COMPLETIONS_URL = "/v1/chat/completions"
+
+
+class BatchFailedError(RuntimeError):
+    """A batch, or one request in it, could not be completed by the provider."""
+
+
+class BatchService(Protocol):
+    """What ``BatchBackend`` needs from a provider's batch API."""
+
+    async def submit(self, requests: list[dict[str, Any]]) -> str:
+        """Submit request lines (``custom_id``, ``method``, ``url``, ``body``); return batch id."""
+        ...
+
+    async def fetch(self, batch_id: str) -> list[str] | None:
+        """Output lines of a finished batch, or None while it is still running."""
+        ...
+
+
+def parse_results(lines: list[str]) -> dict[str, Completion | Exception]:
+    """Completions (or per-request errors) by ``custom_id`` from batch output lines."""
+    results: dict[str, Completion | Exception] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        status = response.get("status_code") or 500
+        if status == 200:
+            body = response["body"]
+            text = body["choices"][0]["message"].get("content") or ""
+            usage = body.get("usage")
+            usage = CompletionUsage.model_validate(usage) if usage else None
+            results[record["custom_id"]] = _completion(text, usage, status)
+        else:
+            error = record.get("error") or (response.get("body") or {}).get("error") or {}
+            message = error.get("message") or f"Batch request failed with HTTP {status}"
+            # Same exception type as a direct call, so the retry policy treats it alike
+            results[record["custom_id"]] = _status_error(openai.APIStatusError, status, message)
+    return results
+
+
+class OpenAIBatchService:
+    """OpenAI's Batch API, via the shared ``AsyncOpenAI`` client."""
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        completion_window: str = "24h",
+    ):
+        self._openai = OpenAIBackend(api_key=api_key, base_url=base_url)
+        self.completion_window = completion_window
+
+    async def submit(self, requests: list[dict[str, Any]]) -> str:
+        client = self._openai.client
+        data = "".join(json.dumps(request) + "\n" for request in requests).encode()
+        file = await client.files.create(file=("batch.jsonl", data), purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=file.id,
+            endpoint=CHAT_COMPLETIONS_URL,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    async def fetch(self, batch_id: str) -> list[str] | None:
+        client = self._openai.client
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status == "failed":
+            raise BatchFailedError(f"Batch {batch_id} failed: {batch.errors}")
+        if batch.status not in ("completed", "expired", "cancelled"):
+            return None
+        # Expired and cancelled batches still return whatever finished in time
+        lines: list[str] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await client.files.content(file_id)
+                lines.extend(content.text.splitlines())
+        return lines
+
+
+class LocalBatchService:
+    """Stand-in for a provider batch API, for tests and offline trial runs.
+
+    Batches are JSONL files in ``directory``, answered by ``backend`` (a ``MockBackend``,
+    typically) once ``delay`` seconds have passed since submission. State lives only on
+    disk, so a new process pointed at the same directory picks up earlier batches.
+    """
+
+    def __init__(self, directory: str | Path, backend: LLMBackend, delay: float = 0.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
+        self.delay = delay
+
+    async def submit(self, requests: list[dict[str, Any]]) -> str:
+        batch_id = f"batch_{uuid.uuid4().hex}"
+        path = self.directory / f"{batch_id}.input.jsonl"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("".join(json.dumps(request) + "\n" for request in requests))
+        os.replace(tmp, path)
+        return batch_id
+
+    async def fetch(self, batch_id: str) -> list[str] | None:
+        input_path = self.directory / f"{batch_id}.input.jsonl"
+        output_path = self.directory / f"{batch_id}.output.jsonl"
+        if not input_path.exists():
+            raise BatchFailedError(f"Unknown batch {batch_id}")
+        if not output_path.exists():
+            if time.time() - input_path.stat().st_mtime < self.delay:
+                return None
+            requests = [json.loads(line) for line in input_path.read_text().splitlines()]
+            lines = await asyncio.gather(*(self._answer(request) for request in requests))
+            tmp = output_path.with_suffix(".tmp")
+            tmp.write_text("".join(line + "\n" for line in lines))
+            os.replace(tmp, output_path)
+        return output_path.read_text().splitlines()
+
+    async def _answer(self, request: dict[str, Any]) -> str:
+        params = dict(request["body"])
+        model, messages = params.pop("model"), params.pop("messages")
+        try:
+            completion = await self.backend.generate(model, messages, params)
+        except openai.APIStatusError as exc:
+            response = {"status_code": exc.status_code, "body": {"error": {"message": str(exc)}}}
+        else:
+            response = {
+                "status_code": 200,
+                "body": {
+                    "model": model,
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": completion.text}}
+                    ],
+                    "usage": {
+                        "prompt_tokens": completion.input_tokens,
+                        "completion_tokens": completion.output_tokens,
+                        "total_tokens": completion.input_tokens + completion.output_tokens,
+                        "prompt_tokens_details": {"cached_tokens": completion.cached_tokens},
+                    },
+                },
+            }
+        return json.dumps({"custom_id": request["custom_id"], "response": response, "error": None})
+
+
+class BatchBackend:
+    """An ``LLMBackend`` that sends chat completions through a batch API.
+
+    Each request is held until every participating simulation is waiting on one, then
+    all of them are submitted as a single batch; when it finishes, each caller gets its
+    own completion. Run every simulation inside ``participant()`` so the backend knows
+    how many requests make a full round. Without participants, every request becomes
+    a batch of its own. Batches take far longer than single calls, so pair this backend
+    with a ``RetryPolicy`` whose ``call_timeout`` is None.
+
+    Submitted batches are recorded in ``manifest``. A process restarted from checkpoints
+    rebuilds the same requests, finds them there and waits for the batches already
+    submitted instead of paying for them again.
+
+    Args:
+        service: Where batches go, e.g. ``OpenAIBatchService``.
+        poll_interval: Seconds between checks on a submitted batch.
+        manifest: JSON file recording the batch each unanswered request was sent in.
+    """
+
+    def __init__(
+        self,
+        service: BatchService,
+        poll_interval: float = 60.0,
+        manifest: str | Path | None = None,
+    ):
+        self.service = service
+        self.poll_interval = poll_interval
+        self.manifest = Path(manifest) if manifest else None
+        self.batches_submitted = 0
+        self.requests_submitted = 0
+        self._submitted: dict[str, str] = {}
+        if self.manifest and self.manifest.exists():
+            self._submitted = json.loads(self.manifest.read_text())
+        self._occurrences: Counter[str] = Counter()
+        self._pending: list[tuple[str, dict[str, Any], asyncio.Future]] = []
+        self._participants = 0
+        self._flushing: asyncio.Task | None = None
+
+    @contextmanager
+    def participant(self) -> Iterator[None]:
+        """Count one simulation towards the requests that make a full round."""
+        self._participants += 1
+        try:
+            yield
+        finally:
+            self._participants -= 1
+            self._maybe_flush()
+
+    async def generate(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> Completion:
+        # Identical requests (e.g. every simulation's opening question) get distinct ids
+        # in a stable order, so a restarted run maps them onto the same submitted ones
+        key = ResponseCache.key(model, params, messages)
+        custom_id = f"{key}-{self._occurrences[key]}"
+        self._occurrences[key] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((custom_id, {"model": model, "messages": messages, **params}, future))
+        self._maybe_flush()
+        return await future
+
+    async def stream(
+        self, model: str, messages: list[dict[str, Any]], params: dict[str, Any]
+    ) -> AsyncIterator[str | Completion]:
+        completion = await self.generate(model, messages, params)
+        yield completion.text
+        yield completion
+
+    def count_tokens(self, model: str, messages: list[dict[str, Any]]) -> int:
+        return count_tokens(model, messages)
+
+    def _maybe_flush(self) -> None:
+        if self._flushing is None and self._pending and len(self._pending) >= self._participants:
+            self._flushing = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        try:
+            pending, self._pending = self._pending, []
+            waiting: dict[str, list[tuple[str, asyncio.Future]]] = defaultdict(list)
+            new = []
+            for custom_id, body, future in pending:
+                batch_id = self._submitted.get(custom_id)
+                if batch_id is None:
+                    new.append((custom_id, body, future))
+                else:
+                    waiting[batch_id].append((custom_id, future))
+            if new:
+                lines = [
+                    {"custom_id": cid, "method": "POST", "url": CHAT_COMPLETIONS_URL, "body": body}
+                    for cid, body, _ in new
+                ]
+                try:
+                    batch_id = await self.service.submit(lines)
+                except Exception as exc:
+                    for _, _, future in new:
+                        _resolve(future, exc)
+                else:
+                    self.batches_submitted += 1
+                    self.requests_submitted += len(new)
+                    for custom_id, _, future in new:
+                        self._submitted[custom_id] = batch_id
+                        waiting[batch_id].append((custom_id, future))
+                    self._save_manifest()
+            await asyncio.gather(*(self._collect(b, items) for b, items in waiting.items()))
+        finally:
+            self._flushing = None
+            self._maybe_flush()
+
+    async def _collect(self, batch_id: str, items: list[tuple[str, asyncio.Future]]) -> None:
+        """Wait for ``batch_id`` to finish and hand each request its result."""
+        try:
+            results = parse_results(await self._wait(batch_id))
+        except Exception as exc:
+            results = {custom_id: exc for custom_id, _ in items}
+        for custom_id, future in items:
+            self._submitted.pop(custom_id, None)
+            missing = BatchFailedError(f"Request {custom_id} missing from batch {batch_id}")
+            _resolve(future, results.get(custom_id, missing))
+        self._save_manifest()
+
+    async def _wait(self, batch_id: str) -> list[str]:
+        while True:
+            try:
+                lines = await self.service.fetch(batch_id)
+            except Exception as exc:
+                # A flaky status check must not throw away a batch that is already paid for
+                if not is_retryable(exc):
+                    raise
+                lines = None
+            if lines is not None:
+                return lines
+            await asyncio.sleep(self.poll_interval)
+
+    def _save_manifest(self) -> None:
+        if self.manifest is None:
+            return
+        tmp = self.manifest.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._submitted))
+        os.replace(tmp, self.manifest)
+
+
+def _resolve(future: asyncio.Future, result: Completion | BaseException) -> None:
+    if future.done():  # the caller was cancelled
+        return
+    if isinstance(result, BaseException):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from .backends import Completion
+
+
+class CacheStats(BaseModel):
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """Deterministic cache of LLM responses with an in-memory LRU tier and optional SQLite tier.
+
+    Entries are keyed by model, sampling params, the exact messages array and a replica
+    index, so N simulations of the same config still get N independent responses while a
+    rerun of the same simulation ids replays them. At ``temperature == 0`` the replica is
+    ignored, since every replica would get the same answer anyway.
+
+    New entries and the access times of disk hits are buffered, and written in one
+    transaction at most every ``commit_interval`` seconds (and on ``close``), so a
+    cache hit or a new response does not each cost a commit. Entries still buffered
+    when the process dies are lost, and their requests are simply made again. Several
+    processes can share one SQLite file (as ``simulate --workers`` does); the size cap
+    applies to the file as a whole.
+
+    Args:
+        path: SQLite file for the persistent tier, or None for memory only.
+        max_memory_entries: Capacity of the in-memory LRU tier.
+        max_disk_bytes: Approximate size cap of the on-disk tier; least recently used
+            entries are evicted beyond it.
+        commit_interval: Seconds between writes to the disk tier.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_memory_entries: int = 1024,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        commit_interval: float = 1.0,
+    ):
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.commit_interval = commit_interval
+        self.stats = CacheStats()
+        self._memory: OrderedDict[str, Completion] = OrderedDict()
+        self._db: sqlite3.Connection | None = None
+        self._disk_bytes = 0
+        # Not yet written to disk: new entries (JSON, time) and access times of disk hits
+        self._writes: dict[str, tuple[str, float]] = {}
+        self._accessed: dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+        if path is not None:
+            # WAL and a busy timeout let worker processes share one cache file
+            self._db = sqlite3.connect(str(path), timeout=30.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            self._disk_bytes = self._size()
+
+    @staticmethod
+    def key(
+        model: str,
+        params: dict[str, Any],
+        api_messages: list[dict[str, Any]],
+        replica: int | None = None,
+    ) -> str:
+        if params.get("temperature") == 0:
+            replica = None
+        payload = json.dumps(
+            [model, params, api_messages, replica], sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Completion | None:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.stats.hits += 1
+            self.stats.memory_hits += 1
+            return value
+
+        if self._db is not None:
+            if key in self._writes:
+                row = self._writes[key]
+            else:
+                row = self._db.execute(
+                    "SELECT value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None:
+                self._accessed[key] = time.time()
+                self._maybe_flush()
+                value = Completion.model_validate_json(row[0])
+                self._remember(key, value)
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+                return value
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: str, value: Completion) -> None:
+        self._remember(key, value)
+        if self._db is None:
+            return
+        self._writes[key] = (value.model_dump_json(), time.time())
+        self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._flushed_at >= self.commit_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered entries and access times to the disk tier, in one transaction."""
+        self._flushed_at = time.monotonic()
+        if self._db is None or not (self._writes or self._accessed):
+            return
+        with self._db:
+            # Take the write lock up front; other processes may write to the file too
+            self._db.execute("BEGIN IMMEDIATE")
+            rows = [(key, data, len(data), at) for key, (data, at) in self._writes.items()]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO responses (key, value, size, accessed) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._db.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._writes.clear()
+            self._accessed.clear()
+            self._disk_bytes = self._size()
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict()
+
+    def _size(self) -> int:
+        """Bytes of responses on disk, including those written by other processes."""
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _remember(self, key: str, value: Completion) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Drop least recently used disk entries until the tier is back under 90% of its cap."""
+        target = self.max_disk_bytes * 0.9
+        while self._disk_bytes > target:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT 256"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._disk_bytes <= target:
+                    break
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._disk_bytes -= size
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        self._memory.clear()
+        self._writes.clear()
+        self._accessed.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._disk_bytes = 0
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
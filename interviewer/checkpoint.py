@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from .logging import _TRANSCRIPT_EXCLUDE
+from .models import Transcript
+from .serialize import offload
+
+
+class CheckpointStore:
+    """Persists in-progress simulation transcripts, one JSON file per simulation_id.
+
+    Each save atomically replaces the previous checkpoint, so a killed process
+    always leaves the last completed turn on disk.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, simulation_id: int) -> Path:
+        return self.directory / f"simulation_{simulation_id}.json"
+
+    def save(self, simulation_id: int, transcript: Transcript) -> None:
+        path = self._path(simulation_id)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(transcript.model_dump_json(exclude=_TRANSCRIPT_EXCLUDE))
+        os.replace(tmp, path)
+
+    async def save_async(self, simulation_id: int, transcript: Transcript) -> None:
+        """``save``, serializing and writing in a worker thread."""
+        await offload(self.save, simulation_id, transcript)
+
+    def load(self, simulation_id: int) -> Transcript | None:
+        path = self._path(simulation_id)
+        if not path.exists():
+            return None
+        return Transcript.model_validate_json(path.read_text())
+
+    def discard(self, simulation_id: int) -> None:
+        self._path(simulation_id).unlink(missing_ok=True)
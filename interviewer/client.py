@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+class ClientSettings(BaseModel):
+    """Connection-pool settings applied to newly created clients."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+
+_settings = ClientSettings()
+
+# (api_key, base_url) -> (client, event loop the client was created on)
+_clients: dict[tuple[str, str | None], tuple[AsyncOpenAI, asyncio.AbstractEventLoop | None]] = {}
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def configure_clients(**kwargs) -> ClientSettings:
+    """Update pool settings. Only clients created afterwards pick up the change.
+
+    Accepts the fields of ``ClientSettings`` as keyword arguments.
+    """
+    global _settings
+    _settings = ClientSettings(**{**_settings.model_dump(), **kwargs})
+    return _settings
+
+
+def get_client_settings() -> ClientSettings:
+    return _settings
+
+
+def _build_client(api_key: str, base_url: str | None) -> AsyncOpenAI:
+    # The SDK takes a while to import; only pay for it once a client is needed
+    import httpx
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=_settings.max_connections,
+            max_keepalive_connections=_settings.max_keepalive_connections,
+            keepalive_expiry=_settings.keepalive_expiry,
+        ),
+        http2=_settings.http2,
+    )
+    # Retries are handled by RetryPolicy in the agents, not the SDK
+    return AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+
+
+def get_client(api_key: str, base_url: str | None = None) -> AsyncOpenAI:
+    """Return the shared client for ``(api_key, base_url)``, creating it on first use.
+
+    Connection pools are bound to the event loop they were opened on, so a client
+    created under a previous ``asyncio.run`` is replaced rather than reused.
+    """
+    key = (api_key, base_url)
+    loop = _running_loop()
+    entry = _clients.get(key)
+    if entry is not None:
+        client, client_loop = entry
+        if client_loop is None or client_loop is loop or loop is None:
+            if client_loop is None and loop is not None:
+                _clients[key] = (client, loop)
+            return client
+    client = _build_client(api_key, base_url)
+    _clients[key] = (client, loop)
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close every pooled client owned by the current event loop and clear the registry."""
+    loop = _running_loop()
+    entries = list(_clients.items())
+    _clients.clear()
+    for _, (client, client_loop) in entries:
+        if client_loop is None or client_loop is loop:
+            await client.close()
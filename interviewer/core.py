@@ -1,94 +1,113 @@
 from __future__ import annotations
 
-import os
-from typing import Literal
-
-from dotenv import load_dotenv
-
-load_dotenv()
-
-from openai import AsyncOpenAI
+from collections.abc import AsyncIterator
+from typing import Any, Literal
 
+from .agent import BaseAgent
 from .defaults import (
     DEFAULT_OPENING_MAX_TOKENS,
     END_OF_INTERVIEW_RESPONSE,
     LAST_QUESTION_RESPONSE,
     OPENING_INSTRUCTION,
 )
-from .models import AgentConfig, AgentResponse, LLMCallInfo, Message
+from .models import AgentConfig, AgentResponse, Message
+from .prompt import PromptBuffer, format_messages
+from .records import Reply, Turn
 
+MessageType = Literal["opening_message", "next_message", "last_question", "end_of_interview"]
 
-class Interviewer:
-    """Generates interviewer responses using an LLM."""
+# Responses that don't need an LLM call
+_HARDCODED_RESPONSES: dict[str, str] = {
+    "last_question": LAST_QUESTION_RESPONSE,
+    "end_of_interview": END_OF_INTERVIEW_RESPONSE,
+}
 
-    def __init__(self, api_key: str | None = None):
-        self._api_key = api_key or os.environ.get("OPENAI_API_KEY")
-        if not self._api_key:
-            raise ValueError(
-                "OpenAI API key required. Pass api_key or set OPENAI_API_KEY env var."
-            )
 
-    def _get_client(self) -> AsyncOpenAI:
-        return AsyncOpenAI(api_key=self._api_key)
+class Interviewer(BaseAgent):
+    """Generates interviewer responses using an LLM."""
+
+    perspective = "interviewer"
 
-    def _format_messages(
-        self, messages: list[Message], config: AgentConfig
-    ) -> list[dict]:
+    def _format_messages(self, messages: list[Message], config: AgentConfig) -> list[dict]:
         """Build the OpenAI messages array from conversation history."""
-        api_messages: list[dict] = [
-            {"role": "system", "content": config.system_prompt},
-        ]
-        for msg in messages:
-            role = "assistant" if msg.role == "interviewer" else "user"
-            api_messages.append({"role": role, "content": msg.text})
-        return api_messages
+        return format_messages(config.system_prompt, messages, self.perspective)
 
-    async def generate_response(
+    def _request(
         self,
         messages: list[Message],
         config: AgentConfig,
-        message_type: Literal[
-            "opening_message", "next_message", "last_question", "end_of_interview"
-        ] = "next_message",
-    ) -> AgentResponse:
-        """Generate next interviewer response."""
-        # Hardcoded responses that don't need an LLM call
-        if message_type == "last_question":
-            return AgentResponse(text=LAST_QUESTION_RESPONSE)
-        if message_type == "end_of_interview":
-            return AgentResponse(text=END_OF_INTERVIEW_RESPONSE)
-
-        client = self._get_client()
-
+        message_type: MessageType,
+        prompt_buffer: PromptBuffer | None,
+    ) -> tuple[str, list[dict], dict[str, Any], tuple[int, int], str | None, str | None]:
+        """Model, API messages, params, message range, instruction and summary for one call."""
+        summary = None
         if message_type == "opening_message":
             api_messages = [
                 {"role": "system", "content": config.system_prompt},
                 {"role": "user", "content": OPENING_INSTRUCTION},
             ]
+            message_range, instruction = (0, 0), OPENING_INSTRUCTION
             max_tokens = DEFAULT_OPENING_MAX_TOKENS
         else:
-            api_messages = self._format_messages(messages, config)
+            api_messages, message_range, summary = self._history(messages, config, prompt_buffer)
+            instruction = None
+            if config.prompt_layout == "prefix_stable":
+                # Every turn extends the opening call's prompt
+                instruction = OPENING_INSTRUCTION
+                api_messages.insert(1, {"role": "user", "content": OPENING_INSTRUCTION})
             max_tokens = config.max_tokens
 
-        params = {
-            "temperature": config.temperature,
-            "max_completion_tokens": max_tokens,
-        }
-
-        response = await client.chat.completions.create(
-            model=config.model,
-            messages=api_messages,
-            **params,
-        )
-
-        text = response.choices[0].message.content or ""
-        usage = response.usage
-        llm_call_info = LLMCallInfo(
-            model=config.model,
-            messages=api_messages,
-            params=params,
-            input_tokens=usage.prompt_tokens if usage else 0,
-            output_tokens=usage.completion_tokens if usage else 0,
-        )
-
-        return AgentResponse(text=text, llm_call_info=llm_call_info)
+        params = self._params(config, max_tokens)
+        return config.model, api_messages, params, message_range, instruction, summary
+
+    async def generate_response(
+        self,
+        messages: list[Message],
+        config: AgentConfig,
+        message_type: MessageType = "next_message",
+        prompt_buffer: PromptBuffer | None = None,
+    ) -> AgentResponse:
+        """Generate next interviewer response.
+
+        Pass the conversation's ``PromptBuffer`` to build the prompt incrementally
+        instead of re-formatting the whole history. How much history is sent is set
+        by ``config.history``.
+        """
+        reply = await self.reply(messages, config, message_type, prompt_buffer)
+        return reply.to_response()
+
+    async def reply(
+        self,
+        messages: list[Message] | list[Turn],
+        config: AgentConfig,
+        message_type: MessageType = "next_message",
+        prompt_buffer: PromptBuffer | None = None,
+    ) -> Reply:
+        """``generate_response`` returning a compact ``Reply``, for the simulation hot path."""
+        if message_type in _HARDCODED_RESPONSES:
+            return Reply(_HARDCODED_RESPONSES[message_type])
+
+        return await self._complete(*self._request(messages, config, message_type, prompt_buffer))
+
+    async def stream_response(
+        self,
+        messages: list[Message],
+        config: AgentConfig,
+        message_type: MessageType = "next_message",
+        prompt_buffer: PromptBuffer | None = None,
+    ) -> AsyncIterator[str | AgentResponse]:
+        """Like ``generate_response``, but yield text deltas as they arrive.
+
+        The last item is the complete ``AgentResponse``, with ``LLMCallInfo`` and usage.
+        Hardcoded responses arrive as a single delta.
+        """
+        if message_type in _HARDCODED_RESPONSES:
+            text = _HARDCODED_RESPONSES[message_type]
+            yield text
+            yield AgentResponse(text=text)
+            return
+
+        async for chunk in self._stream(
+            *self._request(messages, config, message_type, prompt_buffer)
+        ):
+            yield chunk.to_response() if isinstance(chunk, Reply) else chunk
@@ -1,3 +1,5 @@
+import os
+
 DEFAULT_INTERVIEWER_SYSTEM_PROMPT = """You are a qualitative research interviewer. Be conversational and concise.
 
 Rules:
@@ -26,3 +28,19 @@ OPENING_INSTRUCTION = (
     "[Start the interview with a brief, friendly greeting and your first question. "
     "Keep it to 2 sentences max.]"
 )
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of an interview transcript. Combine the existing "
+    "summary, if any, with the new messages into one updated summary. Keep every fact, "
+    "opinion and example the participant gave and every topic already covered. "
+    "Be concise and write plain prose."
+)
+SUMMARY_PREFIX = "Summary of the earlier part of the conversation:\n"
+
+
+def load_prompt(value: str) -> str:
+    """If value is a path to an existing .md file, read and return its contents; otherwise return as-is."""
+    if value.endswith(".md") and os.path.isfile(value):
+        with open(value) as f:
+            return f.read().strip()
+    return value
@@ -0,0 +1,86 @@
+"""Pre-flight token and cost projections for simulation runs."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from .backends import MockBackend
+from .metrics import CallMetrics
+from .models import AgentConfig
+from .simulation import Simulation
+from .tokens import tokenizer_name
+
+# USD per million (input, output) tokens, at list prices; pass your own for other models
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+class RunEstimate(BaseModel):
+    """Projected usage of a simulation run.
+
+    Every response is assumed to use its full ``max_tokens``, so the token counts are
+    an upper bound on what the run can consume (retries aside).
+    """
+
+    num_simulations: int
+    max_turns: int
+    calls_per_simulation: int
+    input_tokens_per_simulation: int
+    output_tokens_per_simulation: int
+    tokenizer: str
+    cost_usd: float | None = None
+
+    @property
+    def total_input_tokens(self) -> int:
+        return self.input_tokens_per_simulation * self.num_simulations
+
+    @property
+    def total_output_tokens(self) -> int:
+        return self.output_tokens_per_simulation * self.num_simulations
+
+    @property
+    def total_tokens(self) -> int:
+        return self.total_input_tokens + self.total_output_tokens
+
+
+async def estimate_run(
+    interviewer_config: AgentConfig,
+    respondent_config: AgentConfig,
+    max_turns: int,
+    num_simulations: int,
+    prices: tuple[float, float] | None = None,
+) -> RunEstimate:
+    """Project the tokens and cost of ``num_simulations`` interviews without calling an LLM.
+
+    One interview is played out offline against a backend whose replies are exactly as
+    long as allowed, with the prompts the real run would build (including its history
+    policies). ``prices`` is USD per million input and output tokens; by default it is
+    looked up in ``MODEL_PRICES`` when both agents use the same model.
+    """
+    longest = max(interviewer_config.max_tokens, respondent_config.max_tokens)
+    backend = MockBackend(output_tokens=(longest, longest), seed=0)
+    # Its calls are recorded apart, so a dry run does not show up in ``call_metrics``
+    simulation = Simulation(backend=backend, metrics=CallMetrics())
+    transcript = await simulation.run(interviewer_config, respondent_config, max_turns=max_turns)
+    if prices is None and interviewer_config.model == respondent_config.model:
+        prices = MODEL_PRICES.get(interviewer_config.model)
+
+    estimate = RunEstimate(
+        num_simulations=num_simulations,
+        max_turns=max_turns,
+        calls_per_simulation=len(transcript.llm_calls),
+        input_tokens_per_simulation=transcript.total_input_tokens,
+        output_tokens_per_simulation=transcript.total_output_tokens,
+        tokenizer=tokenizer_name(interviewer_config.model),
+    )
+    if prices is not None:
+        input_price, output_price = prices
+        cost = estimate.total_input_tokens * input_price
+        cost += estimate.total_output_tokens * output_price
+        estimate.cost_usd = round(cost / 1_000_000, 2)
+    return estimate
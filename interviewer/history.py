@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .models import HistoryPolicy, Message
+    from .records import CallRecord, Reply
+
+Summarize = Callable[[str | None, int, int], Awaitable["Reply"]]
+
+
+def history_start(
+    policy: HistoryPolicy,
+    api_messages: list[dict[str, Any]],
+    count_tokens: Callable[[list[dict[str, Any]]], int],
+    stable: bool = False,
+) -> int:
+    """Index of the first conversation message to send under ``policy``.
+
+    ``api_messages`` is the untrimmed prompt: the system prompt followed by one entry
+    per conversation message. The most recent message is always kept. With ``stable``,
+    a window's start only moves in steps of ``max_messages``, so successive prompts
+    share a prefix between steps.
+    """
+    n = len(api_messages) - 1
+    if policy.strategy == "full" or n == 0:
+        return 0
+    if policy.strategy == "token_budget":
+        # Message i is api_messages[i + 1]; walk back from the last one while they fit
+        budget = policy.max_input_tokens - count_tokens(api_messages[:1])
+        budget -= count_tokens(api_messages[n:])
+        start = n - 1
+        while start > 0:
+            cost = count_tokens(api_messages[start : start + 1])
+            if cost > budget:
+                break
+            budget -= cost
+            start -= 1
+        return start
+    start = max(n - policy.max_messages, 0)
+    return start - start % policy.max_messages if stable else start
+
+
+class RollingSummary:
+    """Summary of the oldest messages of one conversation, refreshed in the background.
+
+    ``text`` summarizes ``messages[:covered]``. ``refresh`` starts an LLM call that
+    extends it and returns immediately; the new summary is used from the next call on.
+    The ``CallRecord``s of finished summary calls accumulate until ``drain``ed, so they
+    can be added to the transcript.
+    """
+
+    def __init__(self) -> None:
+        self.text: str | None = None
+        self.covered = 0
+        self._boundary: Message | None = None
+        self._task: asyncio.Task | None = None
+        self._calls: list[CallRecord] = []
+
+    def current(self, messages: list[Message]) -> tuple[str | None, int]:
+        """The summary and the number of messages it covers, if still valid for ``messages``."""
+        if self.covered and (
+            len(messages) < self.covered or messages[self.covered - 1] is not self._boundary
+        ):
+            # The history was rewritten: the summary no longer describes it
+            self.cancel()
+            self.text, self.covered, self._boundary = None, 0, None
+        return self.text, self.covered
+
+    def refresh(self, summarize: Summarize, messages: list[Message], upto: int) -> None:
+        """Summarize ``messages[:upto]`` in the background, unless already underway."""
+        if upto <= self.covered or (self._task and not self._task.done()):
+            return
+        previous, start, boundary = self.text, self.covered, messages[upto - 1]
+
+        async def run() -> None:
+            reply = await summarize(previous, start, upto)
+            if self.covered == start:
+                self.text, self.covered, self._boundary = reply.text, upto, boundary
+            if reply.call:
+                self._calls.append(reply.call)
+
+        self._task = asyncio.create_task(run())
+        # A failed summary is simply retried on a later refresh
+        self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    def drain(self) -> list[CallRecord]:
+        """Calls made for summaries finished since the last drain."""
+        calls, self._calls = self._calls, []
+        return calls
+
+    async def wait(self) -> None:
+        """Wait for a refresh in progress (for tests and orderly shutdown)."""
+        if self._task:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def cancel(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
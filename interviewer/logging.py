@@ -1,10 +1,32 @@
 from __future__ import annotations
 
+import asyncio
 import csv
+import io
 import json
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .models import Transcript
+from .results_index import (
+    PREVIEW_CHARS,
+    IndexEntry,
+    ResultsIndex,
+    open_index_writer,
+    results_format,
+)
+from .serialize import dumps, offload
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+# Per-call prompts are reconstructible and dominate transcript size, so results omit them.
+_TRANSCRIPT_EXCLUDE = {"llm_calls": {"__all__": {"messages"}}}
 
 
 def save_transcript(
@@ -22,14 +44,279 @@ def save_transcript(
     path = Path(path)
 
     if format == "json":
-        path.write_text(
-            transcript.model_dump_json(indent=2, exclude={"llm_calls": {"__all__": {"messages"}}})
-        )
+        data = transcript.model_dump(exclude=_TRANSCRIPT_EXCLUDE)
+        path.write_text(dumps(data, indent=True), encoding="utf-8")
     elif format == "csv":
-        with open(path, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["turn", "role", "text"])
-            for i, msg in enumerate(transcript.messages):
-                writer.writerow([i + 1, msg.role, msg.text])
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            f.write(transcript_csv(transcript))
     else:
         raise ValueError(f"Unsupported format: {format!r}. Use 'json' or 'csv'.")
+
+
+async def save_transcript_async(
+    transcript: Transcript,
+    path: str | Path,
+    format: str = "json",
+) -> None:
+    """``save_transcript``, serializing and writing in a worker thread."""
+    await offload(save_transcript, transcript, path, format)
+
+
+def transcript_csv(transcript: Transcript) -> str:
+    """A transcript's messages as CSV, with columns ``turn``, ``role`` and ``text``."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["turn", "role", "text"])
+    writer.writerows([i + 1, msg.role, msg.text] for i, msg in enumerate(transcript.messages))
+    return output.getvalue()
+
+
+def jsonl_record(simulation_id: int, transcript: Transcript) -> str:
+    """One JSONL results row, ``{"simulation_id": ..., "transcript": {...}}``, without newline."""
+    return _jsonl_row(simulation_id, transcript.model_dump_json(exclude=_TRANSCRIPT_EXCLUDE))
+
+
+def _jsonl_row(simulation_id: int, transcript_json: str) -> str:
+    return f'{{"simulation_id": {simulation_id}, "transcript": {transcript_json}}}'
+
+
+def encode_row(simulation_id: int, transcript: Transcript) -> tuple[str, IndexEntry]:
+    """A results row's transcript JSON and index summary, for ``TranscriptWriter.write_encoded``.
+
+    Encoding is the expensive part of writing a row, so it can be done elsewhere, such
+    as in the worker process that ran the simulation.
+    """
+    first = transcript.messages[0].text if transcript.messages else ""
+    entry = IndexEntry(
+        simulation_id=simulation_id,
+        offset=0,
+        length=0,
+        messages=len(transcript.messages),
+        preview=first[:PREVIEW_CHARS],
+        input_tokens=transcript.total_input_tokens,
+        output_tokens=transcript.total_output_tokens,
+    )
+    return transcript.model_dump_json(exclude=_TRANSCRIPT_EXCLUDE), entry
+
+
+class TranscriptWriter:
+    """Incrementally writes simulation results, one transcript per row.
+
+    Rows are appended as soon as they are written and flushed to disk every
+    ``flush_every`` rows, so memory stays flat and a crash loses at most one batch.
+
+    Args:
+        path: Output file path.
+        format: "csv" (columns ``simulation_id``, ``transcript``) or "jsonl"
+            (one ``{"simulation_id": ..., "transcript": {...}}`` object per line).
+            Inferred from the file extension if omitted.
+        append: Keep existing rows instead of truncating the file.
+        flush_every: Number of rows buffered between flushes.
+        index: Maintain the sidecar offset index (``results.jsonl.idx``) used for
+            random access by ``ResultsIndex``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        format: str | None = None,
+        append: bool = False,
+        flush_every: int = 10,
+        index: bool = True,
+    ):
+        self.path = Path(path)
+        self.format = format or results_format(self.path)
+        if self.format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported format: {self.format!r}. Use 'csv' or 'jsonl'.")
+        self.flush_every = max(1, flush_every)
+        self.rows_written = 0
+
+        if append and self.path.exists():
+            _truncate_partial_row(self.path)
+        is_new = not append or not self.path.exists() or self.path.stat().st_size == 0
+        self._index = open_index_writer(self.path, self.format, append) if index else None
+        self._file = open(self.path, "a" if append else "w", newline="", encoding="utf-8")
+        self._offset = 0 if is_new else self.path.stat().st_size
+        # Rows are formatted in memory first, so their byte offsets are known for the index
+        self._row = io.StringIO()
+        self._csv = csv.writer(self._row) if self.format == "csv" else None
+        if self._csv and is_new:
+            self._csv.writerow(["simulation_id", "transcript"])
+            self._write_row()
+        self._pending = 0
+
+    def _write_row(self) -> int:
+        """Write the formatted row to the file; return its byte offset."""
+        row = self._row.getvalue()
+        self._row.seek(0)
+        self._row.truncate()
+        self._file.write(row)
+        offset = self._offset
+        self._offset += len(row.encode())
+        return offset
+
+    def write(self, simulation_id: int, transcript: Transcript) -> None:
+        self.write_encoded(simulation_id, *encode_row(simulation_id, transcript))
+
+    def write_encoded(self, simulation_id: int, transcript_json: str, entry: IndexEntry) -> None:
+        """Write a row from ``encode_row``'s output; ``entry``'s offset and length are filled in."""
+        if self._csv:
+            self._csv.writerow([simulation_id, transcript_json])
+        else:
+            self._row.write(_jsonl_row(simulation_id, transcript_json) + "\n")
+        offset = self._write_row()
+        if self._index:
+            line_end = 2 if self._csv else 1  # csv ends rows with \r\n
+            length = self._offset - offset - line_end
+            self._index.write(replace(entry, offset=offset, length=length).line())
+        self.rows_written += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        if self._index:
+            # After the rows, so the index never points past the end of the file
+            self._index.flush()
+        self._pending = 0
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+            if self._index:
+                self._index.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _truncate_partial_row(path: Path, chunk_size: int = 1 << 16) -> None:
+    """Cut a row left incomplete by a crash off the end of ``path``, up to its last newline.
+
+    Otherwise the next row appended would be glued onto it, and both lost.
+    """
+    with open(path, "r+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - chunk_size)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline != -1:
+                end = start + newline + 1
+                break
+            end = start
+        f.truncate(end)
+
+
+class AsyncTranscriptWriter:
+    """A ``TranscriptWriter`` for async code, encoding and writing rows in a worker thread.
+
+    Rows are written in the order their calls were made, by a thread of their own, so
+    the event loop keeps running simulations while a transcript is serialized and
+    written. Takes the same arguments as ``TranscriptWriter``. The file is opened on
+    that thread too, when entering ``async with``, since resuming a run may rescan the
+    results file to rebuild its index.
+    """
+
+    def __init__(self, path: str | Path, **kwargs):
+        self.path = Path(path)
+        self._kwargs = kwargs
+        self._writer: TranscriptWriter | None = None
+        # One thread: rows reach the file in order, and the file is only used from it
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interviewer-writer")
+
+    @property
+    def rows_written(self) -> int:
+        return self._writer.rows_written if self._writer else 0
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._thread, fn, *args)
+
+    async def open(self) -> None:
+        """Open the results file on the writer thread."""
+        self._writer = await self._run(lambda: TranscriptWriter(self.path, **self._kwargs))
+
+    async def write(self, simulation_id: int, transcript: Transcript) -> None:
+        await self._run(self._writer.write, simulation_id, transcript)
+
+    async def write_many(self, rows: Iterable[tuple[int, Transcript]]) -> None:
+        """Write ``(simulation_id, transcript)`` rows in a single trip to the writer thread."""
+        rows = list(rows)
+
+        def write_all() -> None:
+            for simulation_id, transcript in rows:
+                self._writer.write(simulation_id, transcript)
+
+        await self._run(write_all)
+
+    async def write_encoded(
+        self, simulation_id: int, transcript_json: str, entry: IndexEntry
+    ) -> None:
+        await self._run(self._writer.write_encoded, simulation_id, transcript_json, entry)
+
+    async def flush(self) -> None:
+        await self._run(self._writer.flush)
+
+    async def close(self) -> None:
+        try:
+            if self._writer:
+                await self._run(self._writer.close)
+        finally:
+            self._thread.shutdown(wait=False)
+
+    async def __aenter__(self) -> Self:
+        try:
+            await self.open()
+        except BaseException:
+            self._thread.shutdown(wait=False)
+            raise
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+def read_transcripts(path: str | Path) -> Iterator[tuple[int, Transcript]]:
+    """Yield ``(simulation_id, transcript)`` pairs from a CSV or JSONL results file.
+
+    A truncated final row (e.g. from a run killed mid-write) is skipped, as are JSONL
+    lines without a transcript, such as progress lines in a saved batch stream.
+    """
+    path = Path(path)
+    if results_format(path) == "jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "transcript" not in row:
+                    continue
+                yield int(row["simulation_id"]), Transcript(**row["transcript"])
+    else:
+        # Transcript blobs routinely exceed csv's default 128 KiB field limit
+        csv.field_size_limit(sys.maxsize)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                try:
+                    data = json.loads(row["transcript"])
+                except (json.JSONDecodeError, TypeError):
+                    continue
+                yield int(row["simulation_id"]), Transcript(**data)
+
+
+def completed_simulation_ids(path: str | Path) -> set[int]:
+    """Return the simulation_ids with a complete row in a results file (empty if missing)."""
+    path = Path(path)
+    if not path.exists():
+        return set()
+    # Not a last row without its newline: appending truncates it, so it must be rerun
+    with ResultsIndex(path, partial=False) as index:
+        return {entry.simulation_id for entry in index.entries}
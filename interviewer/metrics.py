@@ -0,0 +1,242 @@
+"""Process-wide metrics for LLM calls, rendered in the Prometheus text format.
+
+Every agent call is timed with a ``CallTimer``, which fills in the timestamps saved
+on its ``LLMCallInfo`` and updates the shared ``call_metrics``: how many calls are
+queued and in flight, latency histograms, token counters and errors by type and
+HTTP status. The
+web server exposes them at ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .backends import Completion
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+RATE_BUCKETS = (5.0, 10.0, 25.0, 50.0, 100.0, 200.0, 400.0)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0-100) of ``values``; 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self.values: defaultdict[tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        self.values[self._key(labels)] += amount
+
+    def get(self, **labels: Any) -> float:
+        return self.values.get(self._key(labels), 0)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels: Any) -> None:
+        self.values[self._key(labels)] -= amount
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+        # label values -> (per-bucket counts, sum, count)
+        self.values: dict[tuple[str, ...], list[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        if key not in self.values:
+            self.values[key] = [[0] * len(self.buckets), 0.0, 0]
+        counts, _, _ = entry = self.values[key]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        for key, (counts, total, count) in sorted(self.values.items()):
+            for bound, n in zip((*self.buckets, math.inf), (*counts, count)):
+                le = "+Inf" if bound == math.inf else f"{bound:g}"
+                labels = _format_labels(self.labels, key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{labels} {n}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {total:g}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class CallMetrics:
+    """The LLM call metrics of this process."""
+
+    def __init__(self):
+        self.queued = Gauge(
+            "interviewer_llm_calls_queued", "Calls waiting for a scheduler slot or a retry"
+        )
+        self.in_flight = Gauge("interviewer_llm_calls_in_flight", "Calls sent to the provider")
+        self.calls = Counter("interviewer_llm_calls_total", "Completed calls", ("model", "source"))
+        self.errors = Counter(
+            "interviewer_llm_errors_total", "Failed call attempts", ("type", "status")
+        )
+        self.retries = Counter("interviewer_llm_retries_total", "Attempts retried")
+        self.tokens = Counter("interviewer_llm_tokens_total", "Tokens used", ("model", "kind"))
+        self.queue_seconds = Histogram(
+            "interviewer_llm_queue_seconds", "Wait before the final attempt was sent"
+        )
+        self.latency_seconds = Histogram(
+            "interviewer_llm_latency_seconds", "From sending to the full response", ("model",)
+        )
+        self.first_token_seconds = Histogram(
+            "interviewer_llm_first_token_seconds",
+            "From sending to the first streamed text",
+            ("model",),
+        )
+        self.output_tokens_per_second = Histogram(
+            "interviewer_llm_output_tokens_per_second",
+            "Generation speed of each call",
+            ("model",),
+            RATE_BUCKETS,
+        )
+
+    @property
+    def metrics(self) -> list[_Metric]:
+        return [value for value in vars(self).values() if isinstance(value, _Metric)]
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+call_metrics = CallMetrics()
+
+
+class CallTimer:
+    """Timestamps of one LLM call, from queueing to completion, mirrored into ``call_metrics``.
+
+    Call ``sent`` as each attempt starts, ``failed`` when one raises, ``first_token``
+    when streamed text arrives and ``completed`` with the result. ``close`` (in a
+    ``finally``) releases the gauges of a call that never completed.
+    """
+
+    def __init__(self, model: str, metrics: CallMetrics | None = None):
+        self.model = model
+        self.metrics = metrics or call_metrics
+        self.queued_at = time.time()
+        self.sent_at: float | None = None
+        self.first_token_at: float | None = None
+        self.completed_at: float | None = None
+        self._state = "queued"
+        self.metrics.queued.inc()
+
+    def _leave(self) -> None:
+        if self._state == "queued":
+            self.metrics.queued.dec()
+        elif self._state == "in_flight":
+            self.metrics.in_flight.dec()
+
+    def sent(self) -> None:
+        self._leave()
+        self._state = "in_flight"
+        self.metrics.in_flight.inc()
+        self.sent_at = time.time()
+        self.first_token_at = None
+
+    def failed(self, exc: BaseException) -> None:
+        self._leave()
+        self._state = "queued"
+        self.metrics.queued.inc()
+        # The provider's HTTP status, for errors that carry one (empty for timeouts etc.)
+        status = getattr(exc, "status_code", None) or ""
+        self.metrics.errors.inc(type=type(exc).__name__, status=status)
+
+    def first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.time()
+
+    def completed(self, completion: Completion, retries: int = 0, cache_hit: bool = False) -> None:
+        self._leave()
+        self._state = "done"
+        self.completed_at = time.time()
+        model, m = self.model, self.metrics
+        m.calls.inc(model=model, source="cache" if cache_hit else "provider")
+        m.retries.inc(retries)
+        m.tokens.inc(completion.input_tokens, model=model, kind="input")
+        m.tokens.inc(completion.output_tokens, model=model, kind="output")
+        m.tokens.inc(completion.cached_tokens, model=model, kind="cached")
+        if self.sent_at is None:
+            return
+        m.queue_seconds.observe(self.sent_at - self.queued_at)
+        m.latency_seconds.observe(self.completed_at - self.sent_at, model=model)
+        start = self.sent_at
+        if self.first_token_at is not None:
+            m.first_token_seconds.observe(self.first_token_at - self.sent_at, model=model)
+            start = self.first_token_at
+        if self.completed_at > start:
+            rate = completion.output_tokens / (self.completed_at - start)
+            m.output_tokens_per_second.observe(rate, model=model)
+
+    def close(self) -> None:
+        if self._state != "done":
+            self._leave()
+            self._state = "done"
+
+    def timing(self) -> dict[str, float | None]:
+        """The timestamps, as ``LLMCallInfo`` fields."""
+        return {
+            "queued_at": self.queued_at,
+            "sent_at": self.sent_at,
+            "first_token_at": self.first_token_at,
+            "completed_at": self.completed_at,
+        }
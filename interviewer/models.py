@@ -1,18 +1,11 @@
 from __future__ import annotations
 
-import os
 from datetime import datetime, timezone
 from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
-
-def load_prompt(value: str) -> str:
-    """If value is a path to an existing .md file, read and return its contents; otherwise return as-is."""
-    if value.endswith(".md") and os.path.isfile(value):
-        with open(value) as f:
-            return f.read().strip()
-    return value
+from .defaults import load_prompt
 
 
 class Message(BaseModel):
@@ -20,11 +13,44 @@ class Message(BaseModel):
     text: str
 
 
+class HistoryPolicy(BaseModel):
+    """How much of the conversation an agent sends with each call.
+
+    - ``full``: every message (the default).
+    - ``window``: only the last ``max_messages`` messages.
+    - ``token_budget``: the most recent messages that fit, with the system prompt, in
+      ``max_input_tokens``.
+    - ``summarize``: the recent messages verbatim, preceded by an LLM-written summary of
+      the older ones. The summary is refreshed in the background once ``max_messages``
+      messages have accumulated beyond the last one, so a call never waits for it; until
+      it is ready, the messages it will cover are sent verbatim.
+    """
+
+    strategy: Literal["full", "window", "token_budget", "summarize"] = "full"
+    max_messages: int = Field(default=20, ge=1)
+    max_input_tokens: int = Field(default=8000, ge=1)
+    summary_model: str | None = Field(default=None, description="Defaults to the agent's model")
+    summary_max_tokens: int = Field(default=300, ge=1)
+
+
 class AgentConfig(BaseModel):
+    """Settings for one agent.
+
+    With ``prompt_layout="prefix_stable"``, every prompt of a conversation starts with
+    the same bytes and extends the previous one, so providers' prompt caches can serve
+    the shared prefix at a discount. The interviewer's opening instruction stays in
+    place after the system prompt on every turn, so all simulations of one config
+    share it. ``window`` histories advance in steps of ``max_messages`` rather than
+    one message at a time, and OpenAI requests carry a ``prompt_cache_key`` derived
+    from the system prompt.
+    """
+
     system_prompt: str
     model: str = "gpt-4o-mini"
     temperature: float = 0.7
     max_tokens: int = 200
+    history: HistoryPolicy = Field(default_factory=HistoryPolicy)
+    prompt_layout: Literal["standard", "prefix_stable"] = "standard"
 
     @classmethod
     def from_prompt(cls, prompt: str, **kwargs: Any) -> AgentConfig:
@@ -33,11 +59,64 @@ class AgentConfig(BaseModel):
 
 
 class LLMCallInfo(BaseModel):
+    """Metadata for one LLM call.
+
+    The prompt is normally stored by reference rather than copied: the call saw the
+    system prompt identified by ``system_prompt_hash``, then the ``summary`` of earlier
+    messages if one was sent, then ``messages[start:end]`` of the transcript from
+    ``perspective``'s point of view, then an optional trailing ``instruction`` (which
+    the ``prefix_stable`` layout places right after the system prompt instead). Use
+    ``Transcript.call_messages`` to rebuild it. ``messages`` is only filled in for
+    prompts that cannot be expressed that way, such as the calls that write summaries
+    (which set ``summary_of`` to the range of messages they summarized).
+    """
+
     model: str
     messages: list[dict[str, Any]] = Field(default_factory=list)
+    perspective: Literal["interviewer", "respondent"] | None = None
+    system_prompt_hash: str | None = None
+    message_range: tuple[int, int] | None = None
+    instruction: str | None = None
+    summary: str | None = None
+    summary_of: tuple[int, int] | None = None
     params: dict[str, Any]
     input_tokens: int = Field(description="Number of input tokens used")
     output_tokens: int = Field(description="Number of output tokens used")
+    cached_tokens: int = Field(
+        default=0, description="Input tokens served from the provider's prompt cache"
+    )
+    retries: int = Field(default=0, description="Failed attempts retried before success")
+    cache_hit: bool = Field(default=False, description="Served from the response cache")
+    status_code: int | None = Field(
+        default=None, description="HTTP status of the provider's response (None if cached)"
+    )
+    queued_at: float | None = Field(default=None, description="Unix time the call was made")
+    sent_at: float | None = Field(default=None, description="Unix time the last attempt was sent")
+    first_token_at: float | None = Field(
+        default=None, description="Unix time the first text arrived, for streamed calls"
+    )
+    completed_at: float | None = Field(default=None, description="Unix time the call finished")
+
+    @property
+    def queue_seconds(self) -> float | None:
+        """Time spent waiting for the scheduler and retry backoff before the last attempt."""
+        if self.sent_at is None or self.queued_at is None:
+            return None
+        return self.sent_at - self.queued_at
+
+    @property
+    def latency_seconds(self) -> float | None:
+        """Time from sending the last attempt to the complete response."""
+        if self.sent_at is None or self.completed_at is None:
+            return None
+        return self.completed_at - self.sent_at
+
+    @property
+    def first_token_seconds(self) -> float | None:
+        """Time from sending the last attempt to its first streamed text."""
+        if self.sent_at is None or self.first_token_at is None:
+            return None
+        return self.first_token_at - self.sent_at
 
 
 class AgentResponse(BaseModel):
@@ -45,6 +124,23 @@ class AgentResponse(BaseModel):
     llm_call_info: LLMCallInfo | None = None
 
 
+class CallStats(BaseModel):
+    """Timing of a transcript's LLM calls, in seconds.
+
+    Calls served from the response cache count towards ``calls`` and ``cache_hits``
+    only.
+    """
+
+    calls: int = 0
+    cache_hits: int = 0
+    retries: int = 0
+    queue_seconds: float = 0.0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    mean_first_token_seconds: float | None = None
+    output_tokens_per_second: float | None = None
+
+
 class Transcript(BaseModel):
     messages: list[Message] = Field(default_factory=list)
     interviewer_config: AgentConfig | None = None
@@ -53,4 +149,72 @@ class Transcript(BaseModel):
     ended_at: str | None = None
     total_input_tokens: int = 0
     total_output_tokens: int = 0
+    total_cached_tokens: int = 0
     llm_calls: list[LLMCallInfo] = Field(default_factory=list)
+
+    def add_llm_call(self, call: LLMCallInfo) -> None:
+        self.llm_calls.append(call)
+        self.total_input_tokens += call.input_tokens
+        self.total_output_tokens += call.output_tokens
+        self.total_cached_tokens += call.cached_tokens
+
+    @property
+    def prompt_cache_ratio(self) -> float:
+        """Fraction of input tokens served from the provider's prompt cache."""
+        if not self.total_input_tokens:
+            return 0.0
+        return self.total_cached_tokens / self.total_input_tokens
+
+    @property
+    def call_stats(self) -> CallStats:
+        """Aggregate timing of ``llm_calls``."""
+        stats = CallStats(calls=len(self.llm_calls))
+        first_tokens: list[float] = []
+        output_tokens = 0
+        for call in self.llm_calls:
+            stats.cache_hits += call.cache_hit
+            stats.retries += call.retries
+            latency = call.latency_seconds
+            if latency is None:
+                continue
+            stats.queue_seconds += call.queue_seconds
+            stats.latency_seconds += latency
+            stats.max_latency_seconds = max(stats.max_latency_seconds, latency)
+            output_tokens += call.output_tokens
+            if call.first_token_seconds is not None:
+                first_tokens.append(call.first_token_seconds)
+        if first_tokens:
+            stats.mean_first_token_seconds = sum(first_tokens) / len(first_tokens)
+        if stats.latency_seconds:
+            stats.output_tokens_per_second = output_tokens / stats.latency_seconds
+        return stats
+
+    def call_messages(self, index: int) -> list[dict[str, Any]]:
+        """Reconstruct the full messages array sent for ``llm_calls[index]``."""
+        from .prompt import format_messages, prompt_hash, summary_message
+
+        call = self.llm_calls[index]
+        if call.message_range is None:
+            return call.messages
+
+        config = (
+            self.interviewer_config if call.perspective == "interviewer" else self.respondent_config
+        )
+        if config is None:
+            raise ValueError(f"Transcript has no {call.perspective} config to rebuild the prompt")
+        if prompt_hash(config.system_prompt) != call.system_prompt_hash:
+            raise ValueError(f"{call.perspective} system prompt differs from the one used")
+
+        start, end = call.message_range
+        api_messages = format_messages(
+            config.system_prompt, self.messages[start:end], call.perspective
+        )
+        if call.summary:
+            api_messages.insert(1, summary_message(call.summary))
+        if call.instruction:
+            instruction = {"role": "user", "content": call.instruction}
+            if config.prompt_layout == "prefix_stable":
+                api_messages.insert(1, instruction)
+            else:
+                api_messages.append(instruction)
+        return api_messages
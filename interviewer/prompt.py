@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from typing import TYPE_CHECKING, Literal
+
+from .defaults import SUMMARY_PREFIX
+from .history import RollingSummary
+
+if TYPE_CHECKING:
+    from .models import Message
+
+Perspective = Literal["interviewer", "respondent"]
+
+
+@lru_cache(maxsize=256)
+def prompt_hash(system_prompt: str) -> str:
+    """Short, stable fingerprint of a system prompt."""
+    return hashlib.sha256(system_prompt.encode()).hexdigest()[:16]
+
+
+def api_role(message_role: str, perspective: Perspective) -> str:
+    """The speaking agent's own messages are "assistant"; the other side's are "user"."""
+    return "assistant" if message_role == perspective else "user"
+
+
+def format_messages(
+    system_prompt: str, messages: list[Message], perspective: Perspective
+) -> list[dict]:
+    """Build the OpenAI messages array for one agent's view of the conversation."""
+    api_messages: list[dict] = [{"role": "system", "content": system_prompt}]
+    for msg in messages:
+        api_messages.append({"role": api_role(msg.role, perspective), "content": msg.text})
+    return api_messages
+
+
+def summary_message(summary: str) -> dict:
+    """The entry that stands in for the summarized messages, after the system prompt."""
+    return {"role": "system", "content": SUMMARY_PREFIX + summary}
+
+
+class PromptBuffer:
+    """Incrementally maintained messages array for one agent's view of one conversation.
+
+    ``build`` only maps messages added since the previous call, so a T-turn conversation
+    costs O(T) role mappings in total instead of O(T²). The output is identical to
+    ``format_messages``. If the system prompt changes or the history no longer extends
+    what was seen before, the buffer rebuilds from scratch.
+
+    ``summary`` holds the conversation's rolling summary for the ``summarize`` history
+    policy.
+    """
+
+    def __init__(self, perspective: Perspective):
+        self.perspective = perspective
+        self.summary = RollingSummary()
+        self._system_prompt: str | None = None
+        self._api_messages: list[dict] = []
+        self._last: Message | None = None
+
+    def build(self, system_prompt: str, messages: list[Message]) -> list[dict]:
+        synced = len(self._api_messages) - 1
+        if (
+            system_prompt != self._system_prompt
+            or len(messages) < synced
+            or (synced > 0 and messages[synced - 1] is not self._last)
+        ):
+            self._system_prompt = system_prompt
+            self._api_messages = [{"role": "system", "content": system_prompt}]
+            synced = 0
+
+        for msg in messages[synced:]:
+            self._api_messages.append(
+                {"role": api_role(msg.role, self.perspective), "content": msg.text}
+            )
+        self._last = messages[-1] if messages else None
+        # Shallow copy: callers may hold on to the array while the buffer keeps growing
+        return list(self._api_messages)
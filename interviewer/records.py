@@ -0,0 +1,121 @@
+"""Compact records for the per-turn hot path of agents and simulations.
+
+Every turn of a simulated interview produces a message, an agent reply and the
+metadata of its LLM call. As pydantic models, each of those is validated on
+construction and carries a per-instance ``__dict__``. Inside the agents and
+``Simulation.run`` they are kept instead as the immutable tuples below, with role
+strings interned, and converted to ``Message``, ``AgentResponse`` and
+``LLMCallInfo`` only where they leave the hot path: in the agents' public methods
+and when they are added to a ``Transcript``.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable
+from functools import cache
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+    from .models import AgentResponse, LLMCallInfo, Message, Transcript
+
+_ROLES = {role: sys.intern(role) for role in ("interviewer", "respondent")}
+
+
+def intern_role(role: str) -> str:
+    """The shared instance of a message role. Raises ValueError for an unknown role."""
+    try:
+        return _ROLES[role]
+    except KeyError:
+        raise ValueError(f"Unknown message role: {role!r}") from None
+
+
+class Turn(NamedTuple):
+    """One message of a conversation; stands in for ``Message`` wherever one is read."""
+
+    role: str
+    text: str
+
+    @classmethod
+    def of(cls, role: str, text: str) -> Turn:
+        return cls(intern_role(role), text)
+
+    @classmethod
+    def from_message(cls, message: Message) -> Turn:
+        return cls(intern_role(message.role), message.text)
+
+    def to_message(self) -> Message:
+        from .models import Message
+
+        return Message(role=self.role, text=self.text)
+
+
+class CallRecord(NamedTuple):
+    """The fields of ``LLMCallInfo``; see there for their meaning."""
+
+    model: str
+    params: dict[str, Any]
+    input_tokens: int
+    output_tokens: int
+    messages: list[dict[str, Any]] | None = None
+    perspective: str | None = None
+    system_prompt_hash: str | None = None
+    message_range: tuple[int, int] | None = None
+    instruction: str | None = None
+    summary: str | None = None
+    summary_of: tuple[int, int] | None = None
+    cached_tokens: int = 0
+    retries: int = 0
+    cache_hit: bool = False
+    status_code: int | None = None
+    queued_at: float | None = None
+    sent_at: float | None = None
+    first_token_at: float | None = None
+    completed_at: float | None = None
+
+    def _fields_set(self) -> dict[str, Any]:
+        fields = self._asdict()
+        if fields["messages"] is None:
+            del fields["messages"]  # the only field whose default is not None
+        return fields
+
+    def to_info(self) -> LLMCallInfo:
+        from .models import LLMCallInfo
+
+        return LLMCallInfo(**self._fields_set())
+
+
+class Reply(NamedTuple):
+    """An agent's reply: its text, and the LLM call that produced it (None if hardcoded)."""
+
+    text: str
+    call: CallRecord | None = None
+
+    def to_response(self) -> AgentResponse:
+        from .models import AgentResponse
+
+        return AgentResponse(
+            text=self.text, llm_call_info=self.call.to_info() if self.call else None
+        )
+
+
+@cache
+def _adapters() -> tuple[TypeAdapter[list[Message]], TypeAdapter[list[LLMCallInfo]]]:
+    from pydantic import TypeAdapter
+
+    from .models import LLMCallInfo, Message
+
+    return TypeAdapter(list[Message]), TypeAdapter(list[LLMCallInfo])
+
+
+def add_to_transcript(
+    transcript: Transcript, turns: Iterable[Turn], calls: Iterable[CallRecord]
+) -> None:
+    """Append ``turns`` and ``calls`` to ``transcript``, as its public models."""
+    # Validating each list in one go is much cheaper than building the models one by one
+    messages, infos = _adapters()
+    transcript.messages.extend(messages.validate_python([turn._asdict() for turn in turns]))
+    for info in infos.validate_python([call._fields_set() for call in calls]):
+        transcript.add_llm_call(info)
@@ -1,66 +1,41 @@
 from __future__ import annotations
 
-import os
+from .agent import BaseAgent
+from .models import AgentConfig, AgentResponse, Message
+from .prompt import PromptBuffer, format_messages
+from .records import Reply, Turn
 
-from openai import AsyncOpenAI
 
-from .models import AgentConfig, AgentResponse, LLMCallInfo, Message
-
-
-class SimulatedRespondent:
+class SimulatedRespondent(BaseAgent):
     """Generates simulated respondent responses using an LLM."""
 
-    def __init__(self, api_key: str | None = None):
-        self._api_key = api_key or os.environ.get("OPENAI_API_KEY")
-        if not self._api_key:
-            raise ValueError(
-                "OpenAI API key required. Pass api_key or set OPENAI_API_KEY env var."
-            )
-
-    def _get_client(self) -> AsyncOpenAI:
-        return AsyncOpenAI(api_key=self._api_key)
+    perspective = "respondent"
 
-    def _format_messages(
-        self, messages: list[Message], config: AgentConfig
-    ) -> list[dict]:
+    def _format_messages(self, messages: list[Message], config: AgentConfig) -> list[dict]:
         """Build the OpenAI messages array from the respondent's perspective."""
-        api_messages: list[dict] = [
-            {"role": "system", "content": config.system_prompt},
-        ]
-        for msg in messages:
-            # From respondent's perspective: respondent is "assistant", interviewer is "user"
-            role = "assistant" if msg.role == "respondent" else "user"
-            api_messages.append({"role": role, "content": msg.text})
-        return api_messages
+        # From respondent's perspective: respondent is "assistant", interviewer is "user"
+        return format_messages(config.system_prompt, messages, self.perspective)
 
     async def generate_response(
         self,
         messages: list[Message],
         config: AgentConfig,
+        prompt_buffer: PromptBuffer | None = None,
     ) -> AgentResponse:
-        """Generate a simulated respondent reply."""
-        client = self._get_client()
-        api_messages = self._format_messages(messages, config)
+        """Generate a simulated respondent reply, sending the history ``config.history`` allows."""
+        reply = await self.reply(messages, config, prompt_buffer)
+        return reply.to_response()
 
-        params = {
-            "temperature": config.temperature,
-            "max_completion_tokens": config.max_tokens,
-        }
-
-        response = await client.chat.completions.create(
-            model=config.model,
-            messages=api_messages,
-            **params,
-        )
-
-        text = response.choices[0].message.content or ""
-        usage = response.usage
-        llm_call_info = LLMCallInfo(
-            model=config.model,
-            messages=api_messages,
-            params=params,
-            input_tokens=usage.prompt_tokens if usage else 0,
-            output_tokens=usage.completion_tokens if usage else 0,
+    async def reply(
+        self,
+        messages: list[Message] | list[Turn],
+        config: AgentConfig,
+        prompt_buffer: PromptBuffer | None = None,
+    ) -> Reply:
+        """``generate_response`` returning a compact ``Reply``, for the simulation hot path."""
+        api_messages, message_range, summary = self._history(messages, config, prompt_buffer)
+
+        params = self._params(config, config.max_tokens)
+        return await self._complete(
+            config.model, api_messages, params, message_range, summary=summary
         )
-
-        return AgentResponse(text=text, llm_call_info=llm_call_info)
@@ -0,0 +1,310 @@
+"""Random access to large results files through a sidecar offset index.
+
+Next to ``results.jsonl`` (or ``.csv``), ``results.jsonl.idx`` lists each row's
+``simulation_id``, byte offset and length, plus what a listing needs: message count,
+a preview of the first message and token totals. ``TranscriptWriter`` keeps it up
+to date as it writes; otherwise it is built on first open, and extended when rows
+have been added since. Rows are read through ``mmap`` and only parsed into a
+``Transcript`` when asked for, so a file of any size opens instantly. Listing a file
+does not need pydantic or the transcript models at all.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import mmap
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from .models import Transcript
+
+INDEX_VERSION = 1
+PREVIEW_CHARS = 80
+
+
+def results_format(path: str | Path) -> str:
+    """Infer a results file format from its extension: ".jsonl" is JSONL, anything else CSV."""
+    return "jsonl" if Path(path).suffix.lower() == ".jsonl" else "csv"
+
+
+def index_path(path: str | Path) -> Path:
+    """The sidecar index of the results file at ``path``."""
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Where one row of a results file is, and a summary of its transcript."""
+
+    simulation_id: int
+    offset: int
+    length: int
+    messages: int
+    preview: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+    def line(self) -> str:
+        fields = [
+            self.simulation_id,
+            self.offset,
+            self.length,
+            self.messages,
+            self.input_tokens,
+            self.output_tokens,
+            self.preview,
+        ]
+        return json.dumps(fields) + "\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> IndexEntry:
+        sim_id, offset, length, messages, input_tokens, output_tokens, preview = json.loads(line)
+        return cls(
+            simulation_id=sim_id,
+            offset=offset,
+            length=length,
+            messages=messages,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            preview=preview,
+        )
+
+    @classmethod
+    def from_transcript(
+        cls, simulation_id: int, offset: int, length: int, transcript: dict[str, Any]
+    ) -> IndexEntry:
+        """An entry from a transcript's dump (or its parsed JSON)."""
+        messages = transcript.get("messages") or []
+        return cls(
+            simulation_id=simulation_id,
+            offset=offset,
+            length=length,
+            messages=len(messages),
+            preview=messages[0]["text"][:PREVIEW_CHARS] if messages else "",
+            input_tokens=transcript.get("total_input_tokens", 0),
+            output_tokens=transcript.get("total_output_tokens", 0),
+        )
+
+
+def parse_row(row: bytes, format: str) -> tuple[int, str] | None:
+    """``(simulation_id, transcript JSON)`` from one row, or None if it holds no transcript."""
+    text = row.decode()
+    if format == "jsonl":
+        # Rows are written as {"simulation_id": N, "transcript": {...}}; anything else
+        # (e.g. progress lines in a saved batch stream) is parsed in full to find out
+        prefix, sep, rest = text.partition(', "transcript": ')
+        if sep and prefix.startswith('{"simulation_id": ') and rest.rstrip().endswith("}"):
+            try:
+                return int(prefix[18:]), rest.rstrip()[:-1]
+            except ValueError:
+                pass
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict) or "transcript" not in data:
+            return None
+        return int(data["simulation_id"]), json.dumps(data["transcript"])
+    try:
+        sim_id, transcript_json = next(csv.reader([text]))
+        return int(sim_id), transcript_json
+    except (ValueError, StopIteration, csv.Error):
+        return None  # the header, or a truncated row
+
+
+class ResultsIndex:
+    """Random access to the transcripts of a CSV or JSONL results file.
+
+    ``entries`` is in file order. The sidecar index is read, checked against the
+    results file and brought up to date on construction.
+
+    Args:
+        path: The results file.
+        format: "csv" or "jsonl"; inferred from the file extension if omitted.
+        save: Write the index back to disk when it had to be built or extended.
+        partial: Index a last row without a line terminator. ``TranscriptWriter``
+            ends every row with one, so such a row may have been cut off by a crash.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        format: str | None = None,
+        save: bool = True,
+        partial: bool = True,
+    ):
+        self.path = Path(path)
+        self.format = format or results_format(self.path)
+        self.partial = partial
+        self.entries: list[IndexEntry] = []
+        self._by_id: dict[int, IndexEntry] | None = None
+        self._file = open(self.path, "rb")
+        size = self.path.stat().st_size
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._refresh(save)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def _row(self, offset: int, end: int) -> bytes:
+        return self._mmap[offset:end] if self._mmap is not None else b""
+
+    def _terminated(self, entry: IndexEntry) -> bool:
+        """Whether ``entry``'s row is still followed by its line terminator."""
+        return self._mmap is not None and self._mmap.find(b"\n", entry.end, entry.end + 2) != -1
+
+    def _refresh(self, save: bool) -> None:
+        """Load the sidecar index, and rescan whatever part of the file it does not cover."""
+        entries = _load_index(index_path(self.path))
+        size = len(self._mmap) if self._mmap is not None else 0
+        dropped = False
+        # Rows cut off by a crash, which appending truncates away (see TranscriptWriter)
+        while entries and not self.partial and not self._terminated(entries[-1]):
+            entries.pop()
+            dropped = True
+        if entries:
+            last = entries[-1]
+            row = parse_row(self._row(last.offset, last.end), self.format)
+            if last.end > size or row is None or row[0] != last.simulation_id:
+                entries = None  # the results file was rewritten since
+        if entries is None:
+            self.entries = self._scan(0)
+            changed = True
+        else:
+            self.entries = entries
+            start = entries[-1].end if entries else 0
+            added = self._scan(start) if start < size else []
+            self.entries.extend(added)
+            changed = dropped or bool(added)
+        if save and changed:
+            _save_index(index_path(self.path), self.entries)
+
+    def _scan(self, start: int) -> list[IndexEntry]:
+        """Index the rows from byte ``start`` to the end of the file."""
+        entries = []
+        for offset, end in _rows(self._mmap, start, self.partial):
+            row = parse_row(self._row(offset, end), self.format)
+            if row is None:
+                continue
+            sim_id, transcript_json = row
+            try:
+                transcript = json.loads(transcript_json)
+            except json.JSONDecodeError:
+                continue
+            entries.append(IndexEntry.from_transcript(sim_id, offset, end - offset, transcript))
+        return entries
+
+    def entry(self, simulation_id: int) -> IndexEntry | None:
+        if self._by_id is None:
+            self._by_id = {e.simulation_id: e for e in self.entries}
+        return self._by_id.get(simulation_id)
+
+    def load(self, simulation_id: int) -> Transcript:
+        """Parse and validate one transcript. Raises KeyError for an unknown id."""
+        from .models import Transcript
+
+        entry = self.entry(simulation_id)
+        if entry is None:
+            raise KeyError(simulation_id)
+        row = parse_row(self._row(entry.offset, entry.end), self.format)
+        return Transcript.model_validate_json(row[1])
+
+    def __iter__(self) -> Iterator[tuple[int, Transcript]]:
+        for entry in self.entries:
+            yield entry.simulation_id, self.load(entry.simulation_id)
+
+    def search(self, text: str, entries: list[IndexEntry] | None = None) -> list[IndexEntry]:
+        """The entries (of ``entries``, by default all) whose row contains ``text``, ignoring case."""
+        # Match the text as it is escaped in the file
+        needle = json.dumps(text, ensure_ascii=False)[1:-1]
+        if self.format == "csv":
+            needle = needle.replace('"', '""')
+        pattern = re.compile(re.escape(needle.encode()), re.IGNORECASE)
+        return [
+            e
+            for e in (self.entries if entries is None else entries)
+            if pattern.search(self._row(e.offset, e.end))
+        ]
+
+
+def _rows(data: mmap.mmap | None, start: int, partial: bool) -> Iterator[tuple[int, int]]:
+    """``(offset, end)`` of each line from ``start``, excluding its line terminator.
+
+    A last line without a terminator is only included with ``partial``.
+    """
+    if data is None:
+        return
+    size = len(data)
+    offset = start
+    while offset < size:
+        newline = data.find(b"\n", offset)
+        if newline == -1 and not partial:
+            return
+        end = size if newline == -1 else newline
+        stripped = end - 1 if end > offset and data[end - 1] == ord("\r") else end
+        if stripped > offset:
+            yield offset, stripped
+        offset = end + 1
+
+
+def _load_index(path: Path) -> list[IndexEntry] | None:
+    """Entries of a sidecar index, or None if it is missing or unreadable."""
+    if not path.exists():
+        return None
+    try:
+        with open(path) as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") != INDEX_VERSION:
+                return None
+            entries = []
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # partially written
+                entries.append(IndexEntry.from_line(line))
+            return entries
+    except (json.JSONDecodeError, ValueError):
+        return None
+
+
+def _save_index(path: Path, entries: list[IndexEntry]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(json.dumps({"version": INDEX_VERSION}) + "\n")
+        f.writelines(entry.line() for entry in entries)
+    tmp.replace(path)
+
+
+def open_index_writer(results_path: str | Path, format: str, append: bool) -> TextIO:
+    """The sidecar index of ``results_path``, opened for appending entries as rows are written.
+
+    When appending to a results file, the index is first brought up to date with it.
+    """
+    path = index_path(results_path)
+    if append and Path(results_path).exists():
+        ResultsIndex(results_path, format, partial=False).close()
+    else:
+        _save_index(path, [])
+    return open(path, "a")
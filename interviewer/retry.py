@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class RetryPolicy(BaseModel):
+    """How LLM calls are retried, timed out and cut off when the provider keeps failing."""
+
+    max_attempts: int = Field(default=5, ge=1, description="Attempts per call, including the first")
+    initial_backoff: float = Field(default=1.0, description="Seconds before the first retry")
+    max_backoff: float = Field(default=60.0, description="Upper bound on any single delay")
+    backoff_multiplier: float = 2.0
+    jitter: float = Field(
+        default=1.0, ge=0.0, le=1.0, description="Fraction of each delay that is randomized"
+    )
+    call_timeout: float | None = Field(default=120.0, description="Seconds allowed per attempt")
+    interview_timeout: float | None = Field(
+        default=None, description="Deadline for a whole simulated interview, in seconds"
+    )
+    circuit_breaker_threshold: int = Field(
+        default=10, ge=1, description="Consecutive failed calls that open the circuit"
+    )
+    circuit_breaker_cooldown: float = Field(
+        default=30.0, description="Seconds the circuit stays open before allowing a trial call"
+    )
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt`` (1-based), with jitter applied."""
+        delay = self.initial_backoff * self.backoff_multiplier ** (attempt - 1)
+        delay = min(self.max_backoff, delay)
+        return delay * (1 - self.jitter) + random.uniform(0, delay * self.jitter)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the provider while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops issuing calls after a run of consecutive failures.
+
+    Once ``threshold`` calls in a row have failed, calls are rejected with
+    ``CircuitOpenError`` for ``cooldown`` seconds. After that the circuit is half-open:
+    one trial call is let through while the rest are still rejected. Its success
+    closes the circuit; its failure, or no outcome within another cooldown (e.g. the
+    trial was cancelled), re-opens it.
+    """
+
+    def __init__(self, threshold: int = 10, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self._opened_at: float | None = None
+
+    @classmethod
+    def from_policy(cls, policy: RetryPolicy) -> CircuitBreaker:
+        return cls(policy.circuit_breaker_threshold, policy.circuit_breaker_cooldown)
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self.cooldown
+
+    def check(self) -> None:
+        if self.is_open:
+            raise CircuitOpenError(
+                f"Circuit open after {self.consecutive_failures} consecutive LLM call failures"
+            )
+        if self._opened_at is not None:
+            # Half-open: this call is the trial, so hold the others back for its outcome
+            self._opened_at = time.monotonic()
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.threshold:
+            self._opened_at = time.monotonic()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient failures: timeouts, connection errors, 408/409/429 and 5xx responses."""
+    from openai import APIConnectionError, APIStatusError
+
+    if isinstance(exc, (asyncio.TimeoutError, APIConnectionError)):
+        return True
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS_CODES or exc.status_code >= 500
+    return False
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds the provider asked us to wait, from ``Retry-After``/``retry-after-ms`` headers."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # HTTP-date form; fall back to our own backoff
+    return None
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[T]],
+    policy: RetryPolicy,
+    breaker: CircuitBreaker | None = None,
+    before_attempt: Callable[[], Awaitable[None]] | None = None,
+    on_error: Callable[[Exception], None] | None = None,
+) -> tuple[T, int]:
+    """Await ``func()`` under ``policy``, returning its result and the number of retries taken.
+
+    ``before_attempt`` (e.g. waiting for a rate-limit slot) runs ahead of every attempt
+    and does not count against ``call_timeout``. ``on_error`` sees every failed attempt.
+    Non-retryable errors, and the last error once attempts run out, are re-raised.
+    """
+    attempt = 0
+    while True:
+        if breaker:
+            breaker.check()
+        if before_attempt:
+            await before_attempt()
+        try:
+            if policy.call_timeout:
+                result = await asyncio.wait_for(func(), policy.call_timeout)
+            else:
+                result = await func()
+        except Exception as exc:
+            if on_error:
+                on_error(exc)
+            if not is_retryable(exc):
+                raise
+            if breaker:
+                breaker.record_failure()
+            attempt += 1
+            if attempt >= policy.max_attempts:
+                raise
+            delay = retry_after(exc)
+            delay = min(delay, policy.max_backoff) if delay is not None else policy.backoff(attempt)
+            await asyncio.sleep(delay)
+            continue
+        if breaker:
+            breaker.record_success()
+        return result, attempt
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import TypeVar
+
+T = TypeVar("T")
+I = TypeVar("I")
+
+
+class RateLimiter:
+    """Token bucket holding up to ``per_minute`` units, refilled continuously over a minute.
+
+    Waiters are served strictly in arrival order so that a large request cannot be
+    starved by a stream of small ones.
+    """
+
+    def __init__(self, per_minute: float):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.capacity = float(per_minute)
+        self._rate = self.capacity / 60.0
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        amount = min(float(amount), self.capacity)
+        async with self._lock:
+            self._refill()
+            while self._available < amount:
+                await asyncio.sleep((amount - self._available) / self._rate)
+                self._refill()
+            self._available -= amount
+
+
+class BudgetExceededError(RuntimeError):
+    """An LLM call could take total token usage past the scheduler's ``token_budget``."""
+
+
+class Scheduler:
+    """Bounds how much simulation work is in flight and paces LLM calls.
+
+    ``max_concurrency`` caps the number of simulations running at once (and so the number
+    of transcripts held in memory). Every LLM call additionally passes through
+    ``acquire()``, which enforces the requests-per-minute and tokens-per-minute budgets.
+    Calls queue in FIFO order, so turns from different simulations interleave fairly
+    instead of one simulation racing ahead.
+
+    With ``token_budget``, each call first ``reserve``s its worst case (prompt plus
+    ``max_completion_tokens``) and ``settle``s with its actual usage. A call that could
+    take usage past the budget raises ``BudgetExceededError`` before it is sent, so the
+    budget is never overspent.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        token_budget: int | None = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.token_budget = token_budget
+        self.tokens_used = 0
+        self._tokens_reserved = 0
+        self._requests = RateLimiter(requests_per_minute) if requests_per_minute else None
+        self._tokens = RateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self._queue_lock = asyncio.Lock()
+
+    def reserve(self, estimated_tokens: int) -> None:
+        """Set aside ``estimated_tokens`` of the token budget for one call."""
+        committed = self.tokens_used + self._tokens_reserved
+        if self.token_budget is not None and committed + estimated_tokens > self.token_budget:
+            raise BudgetExceededError(
+                f"Token budget of {self.token_budget:,} reached "
+                f"({self.tokens_used:,} used, {self._tokens_reserved:,} in flight)"
+            )
+        self._tokens_reserved += estimated_tokens
+
+    def settle(self, reserved_tokens: int, used_tokens: int) -> None:
+        """Release a reservation, charging the tokens the call actually used."""
+        self._tokens_reserved -= reserved_tokens
+        self.tokens_used += used_tokens
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        """Wait until one more LLM call fits in the rate budget."""
+        async with self._queue_lock:
+            if self._requests:
+                await self._requests.acquire(1)
+            if self._tokens and estimated_tokens:
+                await self._tokens.acquire(estimated_tokens)
+
+    async def as_completed(
+        self,
+        func: Callable[[I], Awaitable[T]],
+        items: Iterable[I],
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[tuple[I, T | Exception]]:
+        """Run ``func`` over ``items`` with at most ``max_concurrency`` in flight.
+
+        Yields ``(item, result)`` pairs in completion order. Items are pulled lazily, so
+        ``items`` may be a generator over an arbitrarily large range.
+
+        By default the first failure cancels the remaining work and is re-raised. With
+        ``return_exceptions=True`` a failure is yielded as ``(item, exception)`` and the
+        other items keep running.
+        """
+        iterator = iter(items)
+        results: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def worker() -> None:
+            try:
+                for item in iterator:
+                    try:
+                        result = await func(item)
+                    except Exception as exc:
+                        if not return_exceptions:
+                            raise
+                        result = exc
+                    await results.put((item, result))
+            except Exception as exc:
+                await results.put(exc)
+            finally:
+                await results.put(done)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        remaining = len(workers)
+        try:
+            while remaining:
+                entry = await results.get()
+                if entry is done:
+                    remaining -= 1
+                    continue
+                if isinstance(entry, Exception):
+                    raise entry
+                yield entry
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
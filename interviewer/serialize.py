@@ -0,0 +1,65 @@
+"""Fast JSON encoding, and a thread pool for serialization and file writes.
+
+``dumps`` uses ``orjson`` when it is installed (``pip install interviewer[fast]``)
+and the standard library otherwise. Transcripts themselves are encoded by
+pydantic's compiled serializer, which is faster still for compact JSON.
+
+Encoding a long transcript takes milliseconds, and writing it may block on the disk,
+during which an event loop running hundreds of simulations or server requests
+would stall. ``offload`` runs such work in a small shared thread pool instead:
+pydantic and file I/O release the GIL often enough that the loop keeps serving
+everything else in the meantime.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+@functools.cache
+def _orjson():
+    """The orjson module, or None if it is not installed."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """``obj`` as JSON: compact, or indented by two spaces with ``indent``.
+
+    Non-ASCII text is written as is, as pydantic does, rather than escaped.
+    """
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def executor() -> ThreadPoolExecutor:
+    """The shared pool that ``offload`` runs work in."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="interviewer-io"
+        )
+    return _executor
+
+
+async def offload(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run ``fn(*args, **kwargs)`` in the shared thread pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), functools.partial(fn, *args, **kwargs))
@@ -1,16 +1,61 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 from datetime import datetime, timezone
+from typing import Literal
 
+from .backends import LLMBackend
+from .cache import ResponseCache
 from .core import Interviewer
-from .models import AgentConfig, Message, Transcript
+from .metrics import CallMetrics
+from .models import AgentConfig, Transcript
+from .prompt import PromptBuffer
+from .records import CallRecord, Reply, Turn, add_to_transcript
+from .retry import CircuitBreaker, RetryPolicy
+from .scheduler import Scheduler
+
+Step = tuple[Literal["interviewer", "respondent"], str | None]
+
+
+def interview_plan(max_turns: int) -> list[Step]:
+    """The fixed sequence of (role, interviewer message_type) steps in a simulated interview.
+
+    Message ``i`` of a transcript is always produced by step ``i``, so a partial
+    transcript can be resumed from ``plan[len(transcript.messages):]``.
+    """
+    steps: list[Step] = [("interviewer", "opening_message")]
+    for _ in range(max_turns):
+        steps.append(("respondent", None))
+        steps.append(("interviewer", "next_message"))
+    steps.append(("interviewer", "last_question"))
+    steps.append(("respondent", None))
+    steps.append(("interviewer", "end_of_interview"))
+    return steps
 
 
 class Simulation:
     """Orchestrates a multi-turn automated interview between Interviewer and SimulatedRespondent."""
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        scheduler: Scheduler | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        cache: ResponseCache | None = None,
+        backend: LLMBackend | None = None,
+        metrics: CallMetrics | None = None,
+    ):
         self._api_key = api_key
+        self._base_url = base_url
+        self._scheduler = scheduler
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._circuit_breaker = circuit_breaker
+        self._cache = cache
+        self._backend = backend
+        self._metrics = metrics
 
     async def run(
         self,
@@ -18,6 +63,9 @@ class Simulation:
         respondent_config: AgentConfig,
         max_turns: int = 5,
         on_message: callable | None = None,
+        transcript: Transcript | None = None,
+        on_checkpoint: callable | None = None,
+        replica: int | None = None,
     ) -> Transcript:
         """Run a full automated interview.
 
@@ -26,65 +74,102 @@ class Simulation:
             respondent_config: Config for the respondent agent.
             max_turns: Number of interviewer→respondent exchanges (excluding opening/closing).
             on_message: Optional callback(Message) called after each message is generated.
+                If it returns an awaitable (e.g. a write to a session store), the
+                interview waits for it.
+            transcript: Optional partial transcript (e.g. from a checkpoint) to resume;
+                only the steps after its last message are run.
+            on_checkpoint: Optional callback(Transcript) called after each message, for
+                persisting mid-interview state. If it returns an awaitable (e.g.
+                ``CheckpointStore.save_async``), the interview waits for it.
+            replica: Replica index for the response cache (e.g. the simulation id), so
+                repeated simulations of one config stay distinct but replay on rerun.
 
         Returns:
             Transcript with all messages and metadata.
+
+        Raises:
+            asyncio.TimeoutError: If the retry policy's ``interview_timeout`` elapses.
         """
         from .respondent import SimulatedRespondent
 
-        interviewer = Interviewer(api_key=self._api_key)
-        respondent = SimulatedRespondent(api_key=self._api_key)
-
-        transcript = Transcript(
-            interviewer_config=interviewer_config,
-            respondent_config=respondent_config,
-        )
-        messages: list[Message] = []
-
-        def _add_message(role: str, text: str, llm_call_info=None):
-            msg = Message(role=role, text=text)
-            messages.append(msg)
-            transcript.messages.append(msg)
-            if llm_call_info:
-                transcript.llm_calls.append(llm_call_info)
-                transcript.total_input_tokens += llm_call_info.input_tokens
-                transcript.total_output_tokens += llm_call_info.output_tokens
-            if on_message:
-                on_message(msg)
-
-        # Opening message
-        opening = await interviewer.generate_response(
-            messages, interviewer_config, message_type="opening_message"
-        )
-        _add_message("interviewer", opening.text, opening.llm_call_info)
-
-        # Main conversation turns
-        for _ in range(max_turns):
-            # Respondent replies
-            resp = await respondent.generate_response(messages, respondent_config)
-            _add_message("respondent", resp.text, resp.llm_call_info)
-
-            # Interviewer follows up
-            follow_up = await interviewer.generate_response(
-                messages, interviewer_config, message_type="next_message"
+        agent_kwargs = {
+            "api_key": self._api_key,
+            "base_url": self._base_url,
+            "scheduler": self._scheduler,
+            "retry_policy": self._retry_policy,
+            "circuit_breaker": self._circuit_breaker,
+            "cache": self._cache,
+            "cache_replica": replica,
+            "backend": self._backend,
+            "metrics": self._metrics,
+        }
+        interviewer = Interviewer(**agent_kwargs)
+        respondent = SimulatedRespondent(**agent_kwargs)
+
+        if transcript is None:
+            transcript = Transcript(
+                interviewer_config=interviewer_config,
+                respondent_config=respondent_config,
             )
-            _add_message("interviewer", follow_up.text, follow_up.llm_call_info)
-
-        # Last question
-        last_q = await interviewer.generate_response(
-            messages, interviewer_config, message_type="last_question"
-        )
-        _add_message("interviewer", last_q.text, last_q.llm_call_info)
-
-        # Respondent answers last question
-        resp = await respondent.generate_response(messages, respondent_config)
-        _add_message("respondent", resp.text, resp.llm_call_info)
-
-        # End of interview
-        end = await interviewer.generate_response(
-            messages, interviewer_config, message_type="end_of_interview"
-        )
-        _add_message("interviewer", end.text, end.llm_call_info)
-
+        # Turns and calls are kept as compact records while the interview runs, and only
+        # added to the transcript as pydantic models when it is checkpointed, or at the end
+        turns = [Turn.from_message(m) for m in transcript.messages]
+        calls: list[CallRecord] = []
+        synced = len(turns)
+        interviewer_prompt = PromptBuffer("interviewer")
+        respondent_prompt = PromptBuffer("respondent")
+
+        def _sync() -> None:
+            nonlocal synced
+            add_to_transcript(transcript, turns[synced:], calls)
+            synced = len(turns)
+            calls.clear()
+
+        async def _add_message(role: str, reply: Reply) -> None:
+            turn = Turn.of(role, reply.text)
+            turns.append(turn)
+            # Summaries of older history written in the background since the last message
+            calls.extend(interviewer_prompt.summary.drain())
+            calls.extend(respondent_prompt.summary.drain())
+            if reply.call:
+                calls.append(reply.call)
+            if on_message:
+                added = on_message(turn.to_message())
+                if inspect.isawaitable(added):
+                    await added
+            if on_checkpoint:
+                _sync()
+                saved = on_checkpoint(transcript)
+                if inspect.isawaitable(saved):
+                    await saved
+
+        async def _play():
+            for role, message_type in interview_plan(max_turns)[len(turns) :]:
+                if role == "interviewer":
+                    reply = await interviewer.reply(
+                        turns,
+                        interviewer_config,
+                        message_type=message_type,
+                        prompt_buffer=interviewer_prompt,
+                    )
+                else:
+                    reply = await respondent.reply(
+                        turns, respondent_config, prompt_buffer=respondent_prompt
+                    )
+                await _add_message(role, reply)
+            # A summary still being written has been paid for: let it finish, so its
+            # call is counted in the transcript's usage
+            await interviewer_prompt.summary.wait()
+            await respondent_prompt.summary.wait()
+
+        try:
+            await asyncio.wait_for(_play(), self._retry_policy.interview_timeout)
+        finally:
+            interviewer_prompt.summary.cancel()
+            respondent_prompt.summary.cancel()
+
+        calls.extend(interviewer_prompt.summary.drain())
+        calls.extend(respondent_prompt.summary.drain())
+        _sync()
         transcript.ended_at = datetime.now(timezone.utc).isoformat()
         return transcript
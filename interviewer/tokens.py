@@ -0,0 +1,54 @@
+"""Offline token counting for chat prompts.
+
+Counts use ``tiktoken`` when it is installed (``pip install interviewer[tokens]``) and
+fall back to a ~4 characters per token estimate otherwise. Text is counted once and
+cached, so re-counting a growing conversation every turn only tokenizes the new
+messages.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+# Chat formatting overhead per OpenAI's guide: each message is wrapped in a few
+# special tokens, and the reply is primed with a few more.
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+DEFAULT_ENCODING = "o200k_base"
+
+
+@lru_cache(maxsize=64)
+def _encoding(model: str):
+    """The tiktoken encoding for ``model``, or None without tiktoken."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+@lru_cache(maxsize=65_536)
+def count_text_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    """Tokens in ``text`` for ``model``."""
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(model: str, api_messages: list[dict[str, Any]]) -> int:
+    """Prompt tokens for a chat completion request with ``api_messages``."""
+    total = TOKENS_PER_REPLY
+    for message in api_messages:
+        total += TOKENS_PER_MESSAGE + count_text_tokens(message.get("content") or "", model)
+    return total
+
+
+def tokenizer_name(model: str) -> str:
+    """The encoding used to count ``model``'s tokens, or "estimate" without tiktoken."""
+    encoding = _encoding(model)
+    return encoding.name if encoding is not None else "estimate"
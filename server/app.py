@@ -1,11 +1,57 @@
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from interviewer import (
+    ClientSettings,
+    LLMBackend,
+    aclose_clients,
+    call_metrics,
+    configure_clients,
+    create_backend,
+)
+
+from .jobs import JobManager
+from .routes import router, set_backend, set_job_manager, set_session_store
+from .session import (
+    SessionBusyError,
+    SessionStore,
+    VersionConflictError,
+    create_session_store,
+)
 
-from .routes import router
 
+def create_app(
+    client_settings: ClientSettings | None = None,
+    backend: LLMBackend | None = None,
+    max_concurrent_jobs: int = 4,
+    session_store: SessionStore | None = None,
+) -> FastAPI:
+    load_dotenv()  # settings below, and OPENAI_API_KEY, may come from a .env file
+    # INTERVIEWER_BACKEND=mock serves synthetic responses, e.g. for offline load tests
+    if backend is None and os.environ.get("INTERVIEWER_BACKEND"):
+        backend = create_backend(os.environ["INTERVIEWER_BACKEND"])
+    set_backend(backend)
+    jobs = JobManager(max_concurrency=max_concurrent_jobs)
+    set_job_manager(jobs)
+    # INTERVIEWER_SESSION_STORE=sqlite:sessions.db keeps sessions across restarts and workers
+    store = session_store or create_session_store()
+    set_session_store(store)
 
-def create_app() -> FastAPI:
-    app = FastAPI(title="AI Interviewer", version="0.1.0")
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if client_settings:
+            configure_clients(**client_settings.model_dump())
+        yield
+        await jobs.shutdown()
+        await aclose_clients()
+        store.close()
+
+    app = FastAPI(title="AI Interviewer", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -13,8 +59,20 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag"],
     )
 
+    # Lost races on a session surface as 409s the client can retry
+    @app.exception_handler(VersionConflictError)
+    @app.exception_handler(SessionBusyError)
+    async def session_conflict(request: Request, exc: Exception) -> JSONResponse:
+        return JSONResponse(status_code=409, content={"detail": str(exc)})
+
     app.include_router(router)
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        """LLM call metrics for Prometheus to scrape."""
+        return PlainTextResponse(call_metrics.render(), media_type="text/plain; version=0.0.4")
+
     return app
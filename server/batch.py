@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from interviewer import (
+    AgentConfig,
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMBackend,
+    RetryPolicy,
+    Scheduler,
+    Simulation,
+    Transcript,
+    jsonl_record,
+)
+from interviewer.serialize import dumps, offload
+
+MAX_BATCH_SIZE = 10_000
+MAX_BATCH_CONCURRENCY = 64
+
+
+class BatchRequest(BaseModel):
+    interviewer_config: AgentConfig
+    respondent_config: AgentConfig
+    max_turns: int = Field(default=5, ge=1)
+    count: int = Field(ge=1, le=MAX_BATCH_SIZE)
+    concurrency: int = Field(default=16, ge=1, le=MAX_BATCH_CONCURRENCY)
+    requests_per_minute: float | None = Field(default=None, gt=0)
+    tokens_per_minute: float | None = Field(default=None, gt=0)
+
+
+class BatchProgress(BaseModel):
+    """Aggregate progress of one batch, updated as simulations finish."""
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    total: int
+    completed: int = 0
+    failed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    status: Literal["running", "completed", "stopped", "cancelled"] = "running"
+    error: str | None = None
+
+
+# Progress of running and recently finished batches, for GET /simulations/batch/{id}
+_batches: dict[str, BatchProgress] = {}
+_MAX_FINISHED_BATCHES = 100
+
+
+def get_batch(batch_id: str) -> BatchProgress | None:
+    return _batches.get(batch_id)
+
+
+def _register(progress: BatchProgress) -> None:
+    finished = [b.id for b in _batches.values() if b.status != "running"]
+    for batch_id in finished[: max(len(finished) - _MAX_FINISHED_BATCHES, 0)]:
+        del _batches[batch_id]
+    _batches[progress.id] = progress
+
+
+def _line(data: dict[str, Any]) -> str:
+    return dumps(data) + "\n"
+
+
+async def run_batch(req: BatchRequest, backend: LLMBackend | None = None) -> AsyncIterator[str]:
+    """Run ``req.count`` simulations and yield NDJSON lines as they complete.
+
+    Each line is an object with a ``type``:
+
+    - ``started``: the initial ``BatchProgress`` (with the batch ``id``), sent first.
+    - ``transcript``: ``simulation_id`` and ``transcript``, in the same shape as a row
+      of a JSONL results file.
+    - ``error``: a ``simulation_id`` whose simulation failed after retries.
+    - ``progress``: the aggregate ``BatchProgress``, after every finished simulation.
+    - ``summary``: the final ``BatchProgress``, sent last.
+
+    If the provider keeps failing, the circuit breaker stops the batch early, with
+    status ``stopped``. Closing the stream cancels the simulations still running.
+    """
+    progress = BatchProgress(total=req.count)
+    _register(progress)
+    retry_policy = RetryPolicy()
+    scheduler = Scheduler(
+        max_concurrency=req.concurrency,
+        requests_per_minute=req.requests_per_minute,
+        tokens_per_minute=req.tokens_per_minute,
+    )
+    sim = Simulation(
+        scheduler=scheduler,
+        retry_policy=retry_policy,
+        circuit_breaker=CircuitBreaker.from_policy(retry_policy),
+        backend=backend,
+    )
+
+    async def run(sim_id: int) -> Transcript:
+        return await sim.run(req.interviewer_config, req.respondent_config, max_turns=req.max_turns)
+
+    yield _line({"type": "started", **progress.model_dump()})
+    results = scheduler.as_completed(run, range(1, req.count + 1), return_exceptions=True)
+    try:
+        # aclosing: leaving the loop early cancels the simulations still in flight
+        async with aclosing(results):
+            async for sim_id, transcript in results:
+                if isinstance(transcript, CircuitOpenError):
+                    progress.status, progress.error = "stopped", str(transcript)
+                    break
+                if isinstance(transcript, Exception):
+                    progress.failed += 1
+                    error = {"type": "error", "simulation_id": sim_id, "detail": str(transcript)}
+                    yield _line(error)
+                else:
+                    progress.completed += 1
+                    progress.input_tokens += transcript.total_input_tokens
+                    progress.output_tokens += transcript.total_output_tokens
+                    progress.cached_tokens += transcript.total_cached_tokens
+                    record = await offload(jsonl_record, sim_id, transcript)
+                    yield '{"type": "transcript", ' + record[1:] + "\n"
+                yield _line({"type": "progress", **progress.model_dump()})
+            else:
+                progress.status = "completed"
+    finally:
+        if progress.status == "running":
+            progress.status = "cancelled"
+    yield _line({"type": "summary", **progress.model_dump()})
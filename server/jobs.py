@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from interviewer import Message
+
+JobStatus = Literal["queued", "running", "completed", "failed", "cancelled"]
+FINISHED: frozenset[str] = frozenset({"completed", "failed", "cancelled"})
+
+
+class Job(BaseModel):
+    """A simulated interview running in the background for one session."""
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    session_id: str
+    max_turns: int
+    status: JobStatus = "queued"
+    messages: list[Message] = Field(default_factory=list)
+    error: str | None = None
+
+    _task: asyncio.Task | None = PrivateAttr(default=None)
+    _subscribers: list[asyncio.Queue] = PrivateAttr(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def summary(self) -> dict[str, Any]:
+        return {"status": self.status, "error": self.error, "total_messages": len(self.messages)}
+
+    def add_message(self, message: Message) -> None:
+        self.messages.append(message)
+        self._publish("message", message.model_dump())
+
+    def set_status(self, status: JobStatus, error: str | None = None) -> None:
+        self.status = status
+        self.error = error
+        self._publish("status", self.summary())
+
+    def _publish(self, event: str, data: dict[str, Any]) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait((event, data))
+
+    async def events(self) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Replay the job's progress so far, then follow it until it finishes.
+
+        Yields ``("message", message)`` for every generated message and
+        ``("status", summary)`` on each status change; the last event is always the
+        status that finished the job.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        seen = len(self.messages)
+        self._subscribers.append(queue)
+        try:
+            for message in self.messages[:seen]:
+                yield "message", message.model_dump()
+            yield "status", self.summary()
+            if self.finished:
+                return
+            while True:
+                event, data = await queue.get()
+                yield event, data
+                if event == "status" and data["status"] in FINISHED:
+                    return
+        finally:
+            self._subscribers.remove(queue)
+
+
+class JobManager:
+    """Runs jobs as background tasks, at most ``max_concurrency`` at a time.
+
+    Finished jobs stay queryable until more than ``max_finished`` have accumulated,
+    then the oldest are forgotten.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_finished: int = 1000):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.max_finished = max_finished
+        self._jobs: dict[str, Job] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def submit(self, job: Job, func: Callable[[Job], Awaitable[None]]) -> Job:
+        """Queue ``func(job)`` to run in the background and return ``job`` immediately."""
+        if self._semaphore is None:
+            # Created lazily so it belongs to the running event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._prune()
+        self._jobs[job.id] = job
+        job._task = asyncio.create_task(self._run(job, func))
+        return job
+
+    async def _run(self, job: Job, func: Callable[[Job], Awaitable[None]]) -> None:
+        try:
+            async with self._semaphore:
+                job.set_status("running")
+                await func(job)
+        except asyncio.CancelledError:
+            job.set_status("cancelled")
+        except Exception as exc:
+            job.set_status("failed", error=str(exc) or repr(exc))
+        else:
+            job.set_status("completed")
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def active_job(self, session_id: str) -> Job | None:
+        """The queued or running job for ``session_id``, if any."""
+        for job in self._jobs.values():
+            if job.session_id == session_id and not job.finished:
+                return job
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """Request cancellation; False if the job is unknown or already finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._task.cancel()
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancel all unfinished jobs and wait for them to stop."""
+        tasks = [job._task for job in self._jobs.values() if not job.finished]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Literal
-
-from fastapi import APIRouter, HTTPException, Query
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from functools import cache
+from typing import Any, Literal
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from interviewer import (
@@ -12,25 +17,137 @@ from interviewer import (
     DEFAULT_RESPONDENT_SYSTEM_PROMPT,
     DEFAULT_TEMPERATURE,
     AgentConfig,
+    AgentResponse,
     Interviewer,
+    LLMBackend,
     Message,
     Simulation,
-    save_transcript,
+    Transcript,
+    transcript_csv,
 )
 from interviewer.respondent import SimulatedRespondent
+from interviewer.serialize import offload
 
-from .session import Session, create_session, delete_session, get_session
+from .batch import BatchRequest, get_batch, run_batch
+from .jobs import Job, JobManager
+from .session import MemorySessionStore, Session, SessionStore
 
 router = APIRouter(prefix="/api")
 
 
-def _get_session_or_404(session_id: str) -> Session:
-    session = get_session(session_id)
+_backend: LLMBackend | None = None
+_jobs = JobManager()
+_store: SessionStore = MemorySessionStore()
+
+
+def set_backend(backend: LLMBackend | None) -> None:
+    """Use ``backend`` for every agent the routes create (None for the OpenAI default)."""
+    global _backend
+    _backend = backend
+    _get_interviewer.cache_clear()
+    _get_respondent.cache_clear()
+
+
+def set_session_store(store: SessionStore) -> None:
+    """Keep sessions in ``store``."""
+    global _store
+    _store = store
+
+
+def set_job_manager(manager: JobManager) -> None:
+    """Run ``/simulate-all`` jobs on ``manager``."""
+    global _jobs
+    _jobs = manager
+
+
+@cache
+def _get_interviewer() -> Interviewer:
+    """Process-wide interviewer; its client comes from the shared connection pool."""
+    return Interviewer(backend=_backend)
+
+
+@cache
+def _get_respondent() -> SimulatedRespondent:
+    return SimulatedRespondent(backend=_backend)
+
+
+async def _get_session_or_404(session_id: str) -> Session:
+    session = await _store.get(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     return session
 
 
+# --- Concurrency control ---
+#
+# Every read-modify-write of a session runs under the store's lock for that session, so
+# concurrent requests (from any worker, with a shared store) are applied one at a time.
+# Clients can make writes conditional with ``If-Match: <version>`` and make retries safe
+# with an ``Idempotency-Key`` header: a repeated key gets the first response back.
+
+
+def _expected_version(if_match: str | None) -> int | None:
+    if if_match is None:
+        return None
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a session version")
+
+
+def _check_version(session: Session, expected: int | None) -> None:
+    if expected is not None and session.version != expected:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Session is at version {session.version}, not {expected}",
+        )
+
+
+def _check_history(*configs: AgentConfig | None) -> None:
+    """Reject the ``summarize`` history policy for sessions.
+
+    Its summaries are written in the background between turns, and a session served
+    one request at a time (by any worker) has nowhere to wait for them or record their
+    calls. Batch runs support it.
+    """
+    if any(config and config.history.strategy == "summarize" for config in configs):
+        raise HTTPException(
+            status_code=422,
+            detail="The summarize history policy is not supported for sessions",
+        )
+
+
+@asynccontextmanager
+async def _locked_session(session_id: str) -> AsyncIterator[Session]:
+    """Hold the session's lock and yield a fresh copy of it."""
+    await _get_session_or_404(session_id)
+    if _jobs.active_job(session_id):
+        raise HTTPException(status_code=409, detail="A simulation is running")
+    async with _store.lock(session_id):
+        # Reload: another request may have changed the session while we waited
+        yield await _get_session_or_404(session_id)
+
+
+async def _idempotent(
+    session_id: str,
+    idempotency_key: str | None,
+    if_match: str | None,
+    handler: Callable[[Session], Awaitable[dict[str, Any]]],
+) -> dict[str, Any]:
+    """Run ``handler`` on the locked session, or replay its saved response for a repeated key."""
+    expected = _expected_version(if_match)
+    async with _locked_session(session_id) as session:
+        if idempotency_key:
+            saved = await _store.get_response(session_id, idempotency_key)
+            if saved is not None:
+                return saved
+        _check_version(session, expected)
+        result = await handler(session)
+        if idempotency_key:
+            await _store.put_response(session_id, idempotency_key, result)
+        return result
+
+
 # --- Request/Response models ---
 
 
@@ -58,189 +175,405 @@ class InterviewerResponse(BaseModel):
     respondent_message: MessageResponse | None = None
 
 
+# --- Server-Sent Events ---
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Disable proxy buffering so events reach the browser as they are sent
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_interviewer(
+    session_id: str,
+    message_type: str,
+    done: Callable[[Session, Message, AgentResponse], Awaitable[dict[str, Any]]],
+    idempotency_key: str | None = None,
+    if_match: str | None = None,
+    respondent_message: Message | None = None,
+) -> StreamingResponse:
+    """Stream the interviewer's next message as SSE.
+
+    Emits ``delta`` events (``{"text": ...}``) as tokens arrive, then a single ``done``
+    event with ``done(session, message, response)`` once the message is added to the
+    session, or an ``error`` event if generation fails. ``respondent_message``, if
+    given, is what the interviewer replies to; it is only added to the session, just
+    before the reply, once generation succeeds, so a failed request can be retried.
+    The session lock is held for the whole stream. A repeated idempotency key gets
+    only the original ``done`` event.
+    """
+    # Fail with a proper status code where that is still possible
+    session = await _get_session_or_404(session_id)
+    expected = _expected_version(if_match)
+    if not (idempotency_key and await _store.get_response(session_id, idempotency_key)):
+        _check_version(session, expected)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async with _locked_session(session_id) as session:
+                if idempotency_key:
+                    saved = await _store.get_response(session_id, idempotency_key)
+                    if saved is not None:
+                        yield _sse("done", saved)
+                        return
+                _check_version(session, expected)
+                pending = [respondent_message] if respondent_message else []
+                response = None
+                async for chunk in _get_interviewer().stream_response(
+                    [*session.messages, *pending],
+                    session.interviewer_config,
+                    message_type=message_type,
+                    prompt_buffer=session.interviewer_prompt,
+                ):
+                    if isinstance(chunk, AgentResponse):
+                        response = chunk
+                    else:
+                        yield _sse("delta", {"text": chunk})
+                msg = Message(role="interviewer", text=response.text)
+                for message in (*pending, msg):
+                    await _store.add_message(session, message)
+                result = await done(session, msg, response)
+                if idempotency_key:
+                    await _store.put_response(session_id, idempotency_key, result)
+        except HTTPException as exc:
+            yield _sse("error", {"detail": exc.detail})
+            return
+        except Exception as exc:
+            yield _sse("error", {"detail": str(exc)})
+            return
+        yield _sse("done", result)
+
+    return _sse_response(events())
+
+
+def _call_info_json(response: AgentResponse) -> dict[str, Any] | None:
+    info = response.llm_call_info
+    return info.model_dump(mode="json") if info else None
+
+
 # --- Endpoints ---
 
 
 @router.post("/sessions")
 async def api_create_session(req: CreateSessionRequest | None = None):
     if req:
-        session = create_session(req.interviewer_config, req.respondent_config)
+        _check_history(req.interviewer_config, req.respondent_config)
+        session = await _store.create(req.interviewer_config, req.respondent_config)
     else:
-        session = create_session()
+        session = await _store.create()
     return session.model_dump()
 
 
 @router.get("/sessions/{session_id}")
-async def api_get_session(session_id: str):
-    session = _get_session_or_404(session_id)
+async def api_get_session(session_id: str, response: Response):
+    session = await _get_session_or_404(session_id)
+    response.headers["ETag"] = f'"{session.version}"'
     return session.model_dump()
 
 
 @router.delete("/sessions/{session_id}")
-async def api_delete_session(session_id: str):
-    if not delete_session(session_id):
-        raise HTTPException(status_code=404, detail="Session not found")
+async def api_delete_session(session_id: str, if_match: str | None = Header(default=None)):
+    expected = _expected_version(if_match)
+    async with _locked_session(session_id) as session:
+        _check_version(session, expected)
+        await _store.delete(session_id)
     return {"status": "deleted"}
 
 
 @router.patch("/sessions/{session_id}/config")
-async def api_update_config(session_id: str, req: UpdateConfigRequest):
-    session = _get_session_or_404(session_id)
-    if req.interviewer_config:
-        session.interviewer_config = req.interviewer_config
-    if req.respondent_config:
-        session.respondent_config = req.respondent_config
-    return session.model_dump()
+async def api_update_config(
+    session_id: str, req: UpdateConfigRequest, if_match: str | None = Header(default=None)
+):
+    _check_history(req.interviewer_config, req.respondent_config)
+    expected = _expected_version(if_match)
+    async with _locked_session(session_id) as session:
+        _check_version(session, expected)
+        if req.interviewer_config:
+            session.interviewer_config = req.interviewer_config
+        if req.respondent_config:
+            session.respondent_config = req.respondent_config
+        await _store.save(session)
+        return session.model_dump()
 
 
 @router.post("/sessions/{session_id}/start")
-async def api_start_session(session_id: str):
-    session = _get_session_or_404(session_id)
-    interviewer = Interviewer()
-    response = await interviewer.generate_response(
-        session.messages, session.interviewer_config, message_type="opening_message"
-    )
-    msg = Message(role="interviewer", text=response.text)
-    session.messages.append(msg)
-    session.status = "active"
-    return {"message": msg.model_dump(), "llm_call_info": response.llm_call_info}
+async def api_start_session(
+    session_id: str,
+    idempotency_key: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
+    async def handler(session: Session) -> dict[str, Any]:
+        interviewer = _get_interviewer()
+        response = await interviewer.generate_response(
+            session.messages, session.interviewer_config, message_type="opening_message"
+        )
+        msg = Message(role="interviewer", text=response.text)
+        await _store.add_message(session, msg)
+        session.status = "active"
+        await _store.save(session)
+        return {
+            "message": msg.model_dump(),
+            "llm_call_info": _call_info_json(response),
+            "version": session.version,
+        }
+
+    return await _idempotent(session_id, idempotency_key, if_match, handler)
 
 
 @router.post("/sessions/{session_id}/messages")
-async def api_send_message(session_id: str, req: SendMessageRequest):
-    session = _get_session_or_404(session_id)
+async def api_send_message(
+    session_id: str,
+    req: SendMessageRequest,
+    idempotency_key: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
+    async def handler(session: Session) -> dict[str, Any]:
+        # Both messages are saved only once the reply succeeds, so a failure can be retried
+        user_msg = Message(role="respondent", text=req.text)
+        interviewer = _get_interviewer()
+        response = await interviewer.generate_response(
+            [*session.messages, user_msg],
+            session.interviewer_config,
+            message_type="next_message",
+            prompt_buffer=session.interviewer_prompt,
+        )
+        interviewer_msg = Message(role="interviewer", text=response.text)
+        await _store.add_message(session, user_msg)
+        await _store.add_message(session, interviewer_msg)
 
-    # Add user (respondent) message
-    user_msg = Message(role="respondent", text=req.text)
-    session.messages.append(user_msg)
+        return {
+            "respondent_message": user_msg.model_dump(),
+            "interviewer_message": interviewer_msg.model_dump(),
+            "llm_call_info": _call_info_json(response),
+            "version": session.version,
+        }
 
-    # Generate interviewer response
-    interviewer = Interviewer()
-    response = await interviewer.generate_response(
-        session.messages, session.interviewer_config, message_type="next_message"
+    return await _idempotent(session_id, idempotency_key, if_match, handler)
+
+
+@router.post("/sessions/{session_id}/start/stream")
+async def api_start_session_stream(
+    session_id: str,
+    idempotency_key: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
+    """Streaming ``/start``: the opening message as Server-Sent Events."""
+
+    async def done(session: Session, msg: Message, response: AgentResponse) -> dict[str, Any]:
+        session.status = "active"
+        await _store.save(session)
+        return {
+            "message": msg.model_dump(),
+            "llm_call_info": _call_info_json(response),
+            "version": session.version,
+        }
+
+    return await _stream_interviewer(
+        session_id, "opening_message", done, idempotency_key=idempotency_key, if_match=if_match
     )
-    interviewer_msg = Message(role="interviewer", text=response.text)
-    session.messages.append(interviewer_msg)
 
-    return {
-        "respondent_message": user_msg.model_dump(),
-        "interviewer_message": interviewer_msg.model_dump(),
-        "llm_call_info": response.llm_call_info,
-    }
+
+@router.post("/sessions/{session_id}/messages/stream")
+async def api_send_message_stream(
+    session_id: str,
+    req: SendMessageRequest,
+    idempotency_key: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
+    """Streaming ``/messages``: the interviewer's reply as Server-Sent Events."""
+    user_msg = Message(role="respondent", text=req.text)
+
+    async def done(session: Session, msg: Message, response: AgentResponse) -> dict[str, Any]:
+        return {
+            "respondent_message": user_msg.model_dump(),
+            "interviewer_message": msg.model_dump(),
+            "llm_call_info": _call_info_json(response),
+            "version": session.version,
+        }
+
+    return await _stream_interviewer(
+        session_id,
+        "next_message",
+        done,
+        idempotency_key=idempotency_key,
+        if_match=if_match,
+        respondent_message=user_msg,
+    )
 
 
 @router.post("/sessions/{session_id}/simulate-turn")
-async def api_simulate_turn(session_id: str):
+async def api_simulate_turn(
+    session_id: str,
+    idempotency_key: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
     """One turn: AI respondent replies, then interviewer follows up."""
-    session = _get_session_or_404(session_id)
 
-    respondent = SimulatedRespondent()
-    resp = await respondent.generate_response(session.messages, session.respondent_config)
-    resp_msg = Message(role="respondent", text=resp.text)
-    session.messages.append(resp_msg)
+    async def handler(session: Session) -> dict[str, Any]:
+        respondent = _get_respondent()
+        resp = await respondent.generate_response(
+            session.messages, session.respondent_config, prompt_buffer=session.respondent_prompt
+        )
+        resp_msg = Message(role="respondent", text=resp.text)
 
-    interviewer = Interviewer()
-    follow_up = await interviewer.generate_response(
-        session.messages, session.interviewer_config, message_type="next_message"
+        interviewer = _get_interviewer()
+        follow_up = await interviewer.generate_response(
+            [*session.messages, resp_msg],
+            session.interviewer_config,
+            message_type="next_message",
+            prompt_buffer=session.interviewer_prompt,
+        )
+        interviewer_msg = Message(role="interviewer", text=follow_up.text)
+        # Saved together, so a turn that fails part way leaves the session as it was
+        await _store.add_message(session, resp_msg)
+        await _store.add_message(session, interviewer_msg)
+
+        return {
+            "respondent_message": resp_msg.model_dump(),
+            "interviewer_message": interviewer_msg.model_dump(),
+            "version": session.version,
+        }
+
+    return await _idempotent(session_id, idempotency_key, if_match, handler)
+
+
+@router.post("/sessions/{session_id}/simulate-all", status_code=202)
+async def api_simulate_all(
+    session_id: str,
+    max_turns: int = Query(default=5),
+    idempotency_key: str | None = Header(default=None),
+    if_match: str | None = Header(default=None),
+):
+    """Start running the interview to completion as a background job.
+
+    Returns the job immediately; follow it with ``GET /jobs/{id}`` or the SSE stream
+    at ``GET /jobs/{id}/events``. The job holds the session's lock until it finishes.
+    """
+    session = await _get_session_or_404(session_id)
+    if idempotency_key:
+        saved = await _store.get_response(session_id, idempotency_key)
+        if saved is not None:
+            job = _jobs.get(saved["id"])
+            return job.model_dump() if job else saved
+    if _jobs.active_job(session_id):
+        raise HTTPException(status_code=409, detail="A simulation is already running")
+    _check_version(session, _expected_version(if_match))
+
+    async def run(job: Job) -> None:
+        async with _store.lock(session_id):
+            await _simulate(job, await _get_session_or_404(session_id))
+
+    job = _jobs.submit(Job(session_id=session_id, max_turns=max_turns), run)
+    if idempotency_key:
+        await _store.put_response(session_id, idempotency_key, job.model_dump())
+    return job.model_dump()
+
+
+async def _simulate(job: Job, session: Session) -> None:
+    """Run ``job`` on ``session`` (whose lock the caller holds)."""
+    # Continue from the session's messages: plan step i produces message i
+    turns_so_far = max(len(session.messages) - 1, 0) // 2
+    transcript = Transcript(
+        messages=session.messages,
+        interviewer_config=session.interviewer_config,
+        respondent_config=session.respondent_config,
     )
-    interviewer_msg = Message(role="interviewer", text=follow_up.text)
-    session.messages.append(interviewer_msg)
 
-    return {
-        "respondent_message": resp_msg.model_dump(),
-        "interviewer_message": interviewer_msg.model_dump(),
-    }
+    async def on_message(msg: Message) -> None:
+        await _store.add_message(session, msg)
+        job.add_message(msg)
 
+    await Simulation(backend=_backend).run(
+        session.interviewer_config,
+        session.respondent_config,
+        max_turns=turns_so_far + job.max_turns,
+        on_message=on_message,
+        transcript=transcript,
+    )
+    session.status = "ended"
+    await _store.save(session)
 
-@router.post("/sessions/{session_id}/simulate-all")
-async def api_simulate_all(session_id: str, max_turns: int = Query(default=5)):
-    """Run the interview to completion."""
-    session = _get_session_or_404(session_id)
 
-    interviewer = Interviewer()
-    respondent = SimulatedRespondent()
+def _get_job_or_404(job_id: str) -> Job:
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
-    # If no messages yet, generate opening
-    if not session.messages:
-        opening = await interviewer.generate_response(
-            session.messages, session.interviewer_config, message_type="opening_message"
-        )
-        session.messages.append(Message(role="interviewer", text=opening.text))
 
-    new_messages = []
-    for _ in range(max_turns):
-        resp = await respondent.generate_response(session.messages, session.respondent_config)
-        resp_msg = Message(role="respondent", text=resp.text)
-        session.messages.append(resp_msg)
-        new_messages.append(resp_msg)
+@router.get("/jobs/{job_id}")
+async def api_get_job(job_id: str):
+    return _get_job_or_404(job_id).model_dump()
 
-        follow_up = await interviewer.generate_response(
-            session.messages, session.interviewer_config, message_type="next_message"
-        )
-        int_msg = Message(role="interviewer", text=follow_up.text)
-        session.messages.append(int_msg)
-        new_messages.append(int_msg)
 
-    # Last question + response + end
-    last_q = await interviewer.generate_response(
-        session.messages, session.interviewer_config, message_type="last_question"
-    )
-    lq_msg = Message(role="interviewer", text=last_q.text)
-    session.messages.append(lq_msg)
-    new_messages.append(lq_msg)
+@router.get("/jobs/{job_id}/events")
+async def api_job_events(job_id: str):
+    """Server-Sent Events: ``message`` per generated message, ``status`` on each change."""
+    job = _get_job_or_404(job_id)
 
-    resp = await respondent.generate_response(session.messages, session.respondent_config)
-    resp_msg = Message(role="respondent", text=resp.text)
-    session.messages.append(resp_msg)
-    new_messages.append(resp_msg)
+    async def events() -> AsyncIterator[str]:
+        async for event, data in job.events():
+            yield _sse(event, data)
 
-    end = await interviewer.generate_response(
-        session.messages, session.interviewer_config, message_type="end_of_interview"
+    return _sse_response(events())
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def api_cancel_job(job_id: str):
+    job = _get_job_or_404(job_id)
+    if not _jobs.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status}")
+    return {"status": "cancelling"}
+
+
+@router.post("/simulations/batch")
+async def api_simulate_batch(req: BatchRequest):
+    """Run ``count`` independent simulations, streaming results back as NDJSON.
+
+    See ``server.batch.run_batch`` for the line types. Progress is also available at
+    ``GET /simulations/batch/{batch_id}`` while the batch runs.
+    """
+    return StreamingResponse(
+        run_batch(req, backend=_backend),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    end_msg = Message(role="interviewer", text=end.text)
-    session.messages.append(end_msg)
-    new_messages.append(end_msg)
 
-    session.status = "ended"
 
-    return {
-        "new_messages": [m.model_dump() for m in new_messages],
-        "total_messages": len(session.messages),
-    }
+@router.get("/simulations/batch/{batch_id}")
+async def api_get_batch(batch_id: str):
+    progress = get_batch(batch_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return progress.model_dump()
 
 
 @router.get("/sessions/{session_id}/transcript")
 async def api_get_transcript(
     session_id: str, format: Literal["json", "csv"] = Query(default="json")
 ):
-    from interviewer import Transcript
-
-    session = _get_session_or_404(session_id)
+    session = await _get_session_or_404(session_id)
     transcript = Transcript(
         messages=session.messages,
         interviewer_config=session.interviewer_config,
         respondent_config=session.respondent_config,
     )
 
+    # Serialized in a worker thread, so a long transcript does not hold up other requests
     if format == "csv":
-        import csv
-        import io
-
-        from fastapi.responses import StreamingResponse
-
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(["turn", "role", "text"])
-        for i, msg in enumerate(transcript.messages):
-            writer.writerow([i + 1, msg.role, msg.text])
-        output.seek(0)
-        return StreamingResponse(
-            iter([output.getvalue()]),
+        return Response(
+            await offload(transcript_csv, transcript),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=transcript.csv"},
         )
-    else:
-        return transcript.model_dump()
+    return Response(await offload(transcript.model_dump_json), media_type="application/json")
 
 
 @router.get("/config/defaults")
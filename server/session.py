@@ -1,17 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import os
+import sqlite3
+import time
 import uuid
-from typing import Literal
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from pathlib import Path
+from typing import Any, Literal, Protocol, TypeVar, runtime_checkable
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 from interviewer import (
     DEFAULT_INTERVIEWER_SYSTEM_PROMPT,
     DEFAULT_RESPONDENT_SYSTEM_PROMPT,
     AgentConfig,
     Message,
+    PromptBuffer,
 )
 
+T = TypeVar("T")
+
 
 class Session(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -23,32 +36,528 @@ class Session(BaseModel):
     )
     messages: list[Message] = Field(default_factory=list)
     status: Literal["created", "active", "ended"] = "created"
+    version: int = Field(default=0, description="Incremented by every write to the session")
+
+    # Per-perspective prompt buffers; not serialized, rebuilt on demand
+    _interviewer_prompt: PromptBuffer = PrivateAttr(
+        default_factory=lambda: PromptBuffer("interviewer")
+    )
+    _respondent_prompt: PromptBuffer = PrivateAttr(
+        default_factory=lambda: PromptBuffer("respondent")
+    )
+
+    @property
+    def interviewer_prompt(self) -> PromptBuffer:
+        return self._interviewer_prompt
+
+    @property
+    def respondent_prompt(self) -> PromptBuffer:
+        return self._respondent_prompt
+
+
+class VersionConflictError(RuntimeError):
+    """A session was written concurrently: the caller's copy is not the latest version."""
+
+
+class SessionBusyError(TimeoutError):
+    """A session's lock could not be acquired in time."""
+
+
+@runtime_checkable
+class SessionStore(Protocol):
+    """Where sessions live between requests.
+
+    Routes never mutate a session without telling the store: messages go through
+    ``add_message`` (an append, never a rewrite of the session) and config or status
+    changes are persisted with ``save``. Both bump ``Session.version`` and raise
+    ``VersionConflictError`` if the stored session has moved past the caller's copy.
+
+    Read-modify-write sequences run under ``lock(session_id)``, which serializes them
+    across tasks (and, for shared stores, across processes). Responses to requests
+    carrying an idempotency key are kept with ``put_response`` so a retried request
+    can be answered with ``get_response`` instead of being applied twice.
+
+    Access is async, so a store backed by a database keeps its I/O, and any waiting on
+    other writers, off the event loop.
+    """
+
+    async def create(
+        self,
+        interviewer_config: AgentConfig | None = None,
+        respondent_config: AgentConfig | None = None,
+    ) -> Session: ...
+
+    async def get(self, session_id: str) -> Session | None: ...
+
+    async def delete(self, session_id: str) -> bool: ...
+
+    async def add_message(self, session: Session, message: Message) -> None: ...
 
+    async def save(self, session: Session) -> None: ...
 
-# In-memory session store
-_sessions: dict[str, Session] = {}
+    def lock(self, session_id: str) -> AbstractAsyncContextManager[None]: ...
 
+    async def get_response(self, session_id: str, key: str) -> dict[str, Any] | None: ...
 
-def create_session(
-    interviewer_config: AgentConfig | None = None,
-    respondent_config: AgentConfig | None = None,
+    async def put_response(self, session_id: str, key: str, response: dict[str, Any]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class _LocalLocks:
+    """Per-key asyncio locks, dropped once no task holds or awaits them."""
+
+    def __init__(self) -> None:
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    @asynccontextmanager
+    async def hold(self, key: str, timeout: float | None = None) -> AsyncIterator[None]:
+        lock, users = self._locks.get(key, (None, 0))
+        lock = lock or asyncio.Lock()
+        self._locks[key] = (lock, users + 1)
+        try:
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout)
+            except asyncio.TimeoutError:
+                raise SessionBusyError(f"Session {key} is busy") from None
+            try:
+                yield
+            finally:
+                lock.release()
+        finally:
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
+
+
+def _new_session(
+    interviewer_config: AgentConfig | None, respondent_config: AgentConfig | None
 ) -> Session:
     session = Session()
     if interviewer_config:
         session.interviewer_config = interviewer_config
     if respondent_config:
         session.respondent_config = respondent_config
-    _sessions[session.id] = session
     return session
 
 
-def get_session(session_id: str) -> Session | None:
-    return _sessions.get(session_id)
+class MemorySessionStore:
+    """Sessions in process memory, evicted least-recently-used beyond ``max_sessions``.
+
+    With ``ttl``, a session not written for that many seconds expires. Sessions do not
+    survive a restart and are not shared between workers; locks are per process.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl: float | None = None,
+        max_responses: int = 10_000,
+        lock_timeout: float = 30.0,
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_responses = max_responses
+        self.lock_timeout = lock_timeout
+        # session id -> (session, monotonic time of last write), in access order
+        self._sessions: OrderedDict[str, tuple[Session, float]] = OrderedDict()
+        self._responses: OrderedDict[tuple[str, str], dict[str, Any]] = OrderedDict()
+        self._locks = _LocalLocks()
+
+    def _expired(self, updated: float) -> bool:
+        return self.ttl is not None and time.monotonic() - updated > self.ttl
+
+    def _put(self, session: Session) -> None:
+        """Store ``session`` as the most recently used, evicting beyond the limits."""
+        self._sessions[session.id] = (session, time.monotonic())
+        self._sessions.move_to_end(session.id)
+        # Drop expired sessions from the least recently used end, then enforce the cap
+        while self._sessions and self._expired(next(iter(self._sessions.values()))[1]):
+            self._sessions.popitem(last=False)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def _write(self, session: Session) -> None:
+        entry = self._sessions.get(session.id)
+        if entry is not None and entry[0] is not session:
+            raise VersionConflictError(f"Session {session.id} was replaced")
+        session.version += 1
+        # Re-inserted if it was evicted or expired meanwhile; deletes take the session's
+        # lock like writes do, so it is still in use and the write must not be lost
+        self._put(session)
+
+    async def create(
+        self,
+        interviewer_config: AgentConfig | None = None,
+        respondent_config: AgentConfig | None = None,
+    ) -> Session:
+        session = _new_session(interviewer_config, respondent_config)
+        self._put(session)
+        return session
+
+    async def get(self, session_id: str) -> Session | None:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if self._expired(entry[1]):
+            del self._sessions[session_id]
+            return None
+        self._sessions.move_to_end(session_id)
+        return entry[0]
+
+    async def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    async def add_message(self, session: Session, message: Message) -> None:
+        self._write(session)
+        session.messages.append(message)
+
+    async def save(self, session: Session) -> None:
+        self._write(session)
+
+    def lock(self, session_id: str) -> AbstractAsyncContextManager[None]:
+        return self._locks.hold(session_id, self.lock_timeout)
+
+    async def get_response(self, session_id: str, key: str) -> dict[str, Any] | None:
+        return self._responses.get((session_id, key))
+
+    async def put_response(self, session_id: str, key: str, response: dict[str, Any]) -> None:
+        self._responses[(session_id, key)] = response
+        while len(self._responses) > self.max_responses:
+            self._responses.popitem(last=False)
+
+    def close(self) -> None:
+        self._sessions.clear()
+        self._responses.clear()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteSessionStore:
+    """Sessions in a SQLite file, durable across restarts and shared between workers.
+
+    Each message is one appended row, so a turn costs a single small insert no matter
+    how long the session is. Loaded sessions are cached in memory and reused while
+    their version in the database is unchanged, so a session written by another
+    worker is reloaded on next access. A write from a stale copy is rejected with
+    ``VersionConflictError``.
+
+    ``lock`` is a lease row in the database, so it excludes other processes sharing
+    the file too. The holder renews it while the lock is held; a lease left behind by
+    a crashed worker expires after ``lock_lease`` seconds.
+
+    Every database call runs on a thread of the store's own, one at a time, so waiting
+    for another writer (up to SQLite's ``busy_timeout``) never blocks the event loop.
+
+    Args:
+        path: Database file.
+        ttl: Seconds after its last write at which a session expires, or None.
+        cache_size: Number of loaded sessions kept in memory.
+        lock_timeout: Seconds to wait for a session lock before ``SessionBusyError``.
+        lock_lease: Seconds a lock lease lasts without renewal.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl: float | None = None,
+        cache_size: int = 1024,
+        lock_timeout: float = 30.0,
+        lock_lease: float = 15.0,
+    ):
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.lock_timeout = lock_timeout
+        self.lock_lease = lock_lease
+        self._owner = uuid.uuid4().hex
+        self._locks = _LocalLocks()
+        self._cache: OrderedDict[str, Session] = OrderedDict()
+        # One thread: the connection's transactions must not interleave
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interviewer-sessions")
+        # Autocommit; multi-statement writes use explicit transactions
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                interviewer_config TEXT NOT NULL,
+                respondent_config TEXT NOT NULL,
+                status TEXT NOT NULL,
+                revision INTEGER NOT NULL DEFAULT 0,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                text TEXT NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            );
+            CREATE TABLE IF NOT EXISTS locks (
+                session_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS responses (
+                session_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                response TEXT NOT NULL,
+                PRIMARY KEY (session_id, key)
+            );
+            CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated);
+            """
+        )
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the database thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._thread, fn, *args)
+
+    def _cache_put(self, session: Session) -> None:
+        self._cache[session.id] = session
+        self._cache.move_to_end(session.id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _write(self, session: Session, sql: str, params: tuple) -> None:
+        """Run ``sql`` and advance the version in one transaction, if ``session`` is current."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            bumped = self._db.execute(
+                "UPDATE sessions SET revision = revision + 1, updated = ?"
+                " WHERE id = ? AND revision = ?",
+                (time.time(), session.id, session.version),
+            ).rowcount
+            if not bumped:
+                raise VersionConflictError(
+                    f"Session {session.id} changed since version {session.version}"
+                )
+            try:
+                self._db.execute(sql, params)
+            except sqlite3.IntegrityError as exc:
+                raise VersionConflictError(f"Session {session.id} changed concurrently") from exc
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            self._cache.pop(session.id, None)
+            raise
+        self._db.execute("COMMIT")
+        session.version += 1
+
+    def _purge_expired(self) -> None:
+        if self.ttl is None:
+            return
+        cutoff = time.time() - self.ttl
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute(
+            "DELETE FROM messages WHERE session_id IN (SELECT id FROM sessions WHERE updated < ?)",
+            (cutoff,),
+        )
+        self._db.execute(
+            "DELETE FROM responses WHERE session_id IN (SELECT id FROM sessions WHERE updated < ?)",
+            (cutoff,),
+        )
+        self._db.execute("DELETE FROM sessions WHERE updated < ?", (cutoff,))
+        self._db.execute("COMMIT")
+
+    def _create(
+        self,
+        interviewer_config: AgentConfig | None = None,
+        respondent_config: AgentConfig | None = None,
+    ) -> Session:
+        self._purge_expired()
+        session = _new_session(interviewer_config, respondent_config)
+        self._db.execute(
+            "INSERT INTO sessions (id, interviewer_config, respondent_config, status, updated)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                session.id,
+                session.interviewer_config.model_dump_json(),
+                session.respondent_config.model_dump_json(),
+                session.status,
+                time.time(),
+            ),
+        )
+        self._cache_put(session)
+        return session
+
+    async def create(
+        self,
+        interviewer_config: AgentConfig | None = None,
+        respondent_config: AgentConfig | None = None,
+    ) -> Session:
+        return await self._run(self._create, interviewer_config, respondent_config)
+
+    def _get(self, session_id: str) -> Session | None:
+        row = self._db.execute(
+            "SELECT interviewer_config, respondent_config, status, revision, updated"
+            " FROM sessions WHERE id = ?",
+            (session_id,),
+        ).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[4] > self.ttl):
+            self._cache.pop(session_id, None)
+            return None
+
+        cached = self._cache.get(session_id)
+        if cached is not None and cached.version == row[3]:
+            self._cache.move_to_end(session_id)
+            return cached
+
+        messages = self._db.execute(
+            "SELECT role, text FROM messages WHERE session_id = ? ORDER BY seq", (session_id,)
+        ).fetchall()
+        session = Session(
+            id=session_id,
+            interviewer_config=AgentConfig.model_validate_json(row[0]),
+            respondent_config=AgentConfig.model_validate_json(row[1]),
+            status=row[2],
+            messages=[Message(role=role, text=text) for role, text in messages],
+            version=row[3],
+        )
+        self._cache_put(session)
+        return session
+
+    async def get(self, session_id: str) -> Session | None:
+        return await self._run(self._get, session_id)
+
+    def _delete(self, session_id: str) -> bool:
+        self._cache.pop(session_id, None)
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        self._db.execute("DELETE FROM responses WHERE session_id = ?", (session_id,))
+        deleted = self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount
+        self._db.execute("COMMIT")
+        return deleted > 0
+
+    async def delete(self, session_id: str) -> bool:
+        return await self._run(self._delete, session_id)
+
+    def _add_message(self, session: Session, message: Message) -> None:
+        self._write(
+            session,
+            "INSERT INTO messages (session_id, seq, role, text) VALUES (?, ?, ?, ?)",
+            (session.id, len(session.messages), message.role, message.text),
+        )
+        session.messages.append(message)
+
+    async def add_message(self, session: Session, message: Message) -> None:
+        await self._run(self._add_message, session, message)
+
+    def _save(self, session: Session) -> None:
+        """Persist configs and status; messages are only ever written by ``add_message``."""
+        self._write(
+            session,
+            "UPDATE sessions SET interviewer_config = ?, respondent_config = ?, status = ?"
+            " WHERE id = ?",
+            (
+                session.interviewer_config.model_dump_json(),
+                session.respondent_config.model_dump_json(),
+                session.status,
+                session.id,
+            ),
+        )
+
+    async def save(self, session: Session) -> None:
+        await self._run(self._save, session)
+
+    def _try_lease(self, session_id: str) -> bool:
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute(
+            "DELETE FROM locks WHERE session_id = ? AND expires < ?", (session_id, now)
+        )
+        acquired = self._db.execute(
+            "INSERT OR IGNORE INTO locks (session_id, owner, expires) VALUES (?, ?, ?)",
+            (session_id, self._owner, now + self.lock_lease),
+        ).rowcount
+        self._db.execute("COMMIT")
+        return acquired > 0
+
+    def _extend_lease(self, session_id: str) -> None:
+        self._db.execute(
+            "UPDATE locks SET expires = ? WHERE session_id = ? AND owner = ?",
+            (time.time() + self.lock_lease, session_id, self._owner),
+        )
+
+    def _release_lease(self, session_id: str) -> None:
+        self._db.execute(
+            "DELETE FROM locks WHERE session_id = ? AND owner = ?", (session_id, self._owner)
+        )
+
+    async def _renew_lease(self, session_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lock_lease / 3)
+            await self._run(self._extend_lease, session_id)
+
+    @asynccontextmanager
+    async def _hold(self, session_id: str) -> AsyncIterator[None]:
+        deadline = time.monotonic() + self.lock_timeout
+        # Tasks in this process queue on an asyncio lock; only its holder polls the lease
+        async with self._locks.hold(session_id, self.lock_timeout):
+            delay = 0.005
+            while not await self._run(self._try_lease, session_id):
+                if time.monotonic() > deadline:
+                    raise SessionBusyError(f"Session {session_id} is locked by another worker")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.25)
+            renew = asyncio.create_task(self._renew_lease(session_id))
+            try:
+                yield
+            finally:
+                renew.cancel()
+                # Shielded: a cancelled request must still release its lease
+                await asyncio.shield(self._run(self._release_lease, session_id))
+
+    def lock(self, session_id: str) -> AbstractAsyncContextManager[None]:
+        return self._hold(session_id)
+
+    def _get_response(self, session_id: str, key: str) -> dict[str, Any] | None:
+        row = self._db.execute(
+            "SELECT response FROM responses WHERE session_id = ? AND key = ?",
+            (session_id, key),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def get_response(self, session_id: str, key: str) -> dict[str, Any] | None:
+        return await self._run(self._get_response, session_id, key)
+
+    def _put_response(self, session_id: str, key: str, response: dict[str, Any]) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses (session_id, key, response) VALUES (?, ?, ?)",
+            (session_id, key, json.dumps(response)),
+        )
+
+    async def put_response(self, session_id: str, key: str, response: dict[str, Any]) -> None:
+        await self._run(self._put_response, session_id, key, response)
+
+    def _close(self) -> None:
+        self._cache.clear()
+        self._db.execute("DELETE FROM locks WHERE owner = ?", (self._owner,))
+        self._db.close()
 
+    def close(self) -> None:
+        self._thread.submit(self._close).result()
+        self._thread.shutdown()
 
-def delete_session(session_id: str) -> bool:
-    return _sessions.pop(session_id, None) is not None
 
+def create_session_store(
+    url: str | None = None, ttl: float | None = None, max_sessions: int | None = None
+) -> SessionStore:
+    """Build a store from a URL: "memory" (default) or "sqlite:PATH".
 
-def list_sessions() -> list[Session]:
-    return list(_sessions.values())
+    Unset arguments fall back to ``INTERVIEWER_SESSION_STORE``,
+    ``INTERVIEWER_SESSION_TTL`` (seconds) and ``INTERVIEWER_MAX_SESSIONS``.
+    """
+    url = url or os.environ.get("INTERVIEWER_SESSION_STORE", "memory")
+    if ttl is None and os.environ.get("INTERVIEWER_SESSION_TTL"):
+        ttl = float(os.environ["INTERVIEWER_SESSION_TTL"])
+    if max_sessions is None:
+        max_sessions = int(os.environ.get("INTERVIEWER_MAX_SESSIONS", "10000"))
+    if url == "memory":
+        return MemorySessionStore(max_sessions=max_sessions, ttl=ttl)
+    if url.startswith("sqlite:"):
+        return SQLiteSessionStore(url.removeprefix("sqlite:"), ttl=ttl)
+    raise ValueError(f"Unknown session store: {url!r}. Use 'memory' or 'sqlite:PATH'.")
@@ -0,0 +1,11 @@
+"""Shared fixtures."""
+
+import pytest
+
+from interviewer.backends import MockBackend
+
+
+@pytest.fixture
+def mock_backend():
+    """Offline backend that records every request and answers with 5-token replies."""
+    return MockBackend(output_tokens=(5, 5), seed=0, record=True)
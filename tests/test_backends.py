@@ -0,0 +1,109 @@
+"""Tests for LLM backends."""
+
+import json
+
+import openai
+import pytest
+
+from interviewer.backends import (
+    Completion,
+    LLMBackend,
+    MockBackend,
+    OpenAIBackend,
+    create_backend,
+)
+from interviewer.retry import is_retryable
+
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+
+
+async def test_mock_generate_respects_max_tokens():
+    backend = MockBackend(output_tokens=(50, 50), seed=1, record=True)
+    completion = await backend.generate("m", MESSAGES, {"max_completion_tokens": 10})
+    assert completion.output_tokens == 10
+    assert completion.input_tokens > 0
+    assert completion.text.startswith("reply 1")
+    assert backend.requests == [{"model": "m", "messages": MESSAGES, "max_completion_tokens": 10}]
+
+
+async def test_mock_stream_yields_deltas_then_completion():
+    backend = MockBackend(output_tokens=(8, 8), seed=1)
+    chunks = [c async for c in backend.stream("m", MESSAGES, {})]
+    *deltas, final = chunks
+    assert all(isinstance(d, str) for d in deltas)
+    assert isinstance(final, Completion)
+    assert "".join(deltas) == final.text
+
+
+async def test_mock_failures_are_retryable():
+    backend = MockBackend(error_rate=0.5, rate_limit_rate=0.5, seed=0)
+    with pytest.raises(openai.APIStatusError) as info:
+        await backend.generate("m", MESSAGES, {})
+    assert info.value.status_code in (429, 500)
+    assert is_retryable(info.value)
+
+
+def test_create_backend():
+    assert isinstance(create_backend("mock", latency=0.1), MockBackend)
+    assert isinstance(create_backend("openai", api_key="sk-test"), OpenAIBackend)
+    assert isinstance(create_backend("mock"), LLMBackend)
+    with pytest.raises(ValueError):
+        create_backend("nope")
+
+
+async def test_mock_prompt_cache_reports_shared_prefix():
+    backend = MockBackend(prompt_cache_min_tokens=0, prompt_cache_increment=1)
+    first = await backend.generate("m", MESSAGES, {})
+    longer = [*MESSAGES, {"role": "assistant", "content": "hello"}]
+    second = await backend.generate("m", longer, {})
+    assert first.cached_tokens == 0
+    assert 0 < second.cached_tokens < second.input_tokens
+
+
+def test_openai_usage_includes_cached_tokens():
+    from types import SimpleNamespace
+
+    from interviewer.backends import _completion
+
+    details = SimpleNamespace(cached_tokens=1024)
+    usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=50, prompt_tokens_details=details)
+    assert _completion("hi", usage).cached_tokens == 1024
+    usage.prompt_tokens_details = None
+    assert _completion("hi", usage).cached_tokens == 0
+    assert _completion("hi", None) == Completion(text="hi")
+
+
+async def test_openai_generate_over_http(monkeypatch):
+    import httpx
+
+    sent = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "id": "c",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "m",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "hello"},
+                    }
+                ],
+                "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+            },
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    client = openai.AsyncOpenAI(api_key="sk-test", http_client=http_client)
+    monkeypatch.setattr(OpenAIBackend, "client", property(lambda self: client))
+    params = {"temperature": 0, "prompt_cache_key": "abc"}
+    completion = await OpenAIBackend(api_key="sk-test").generate("m", MESSAGES, params)
+    assert (completion.text, completion.input_tokens) == ("hello", 3)
+    assert completion.status_code == 200
+    assert sent[0]["prompt_cache_key"] == "abc"
+    assert params == {"temperature": 0, "prompt_cache_key": "abc"}
@@ -0,0 +1,115 @@
+"""Tests for running simulations through a batch API."""
+
+import asyncio
+import json
+
+import openai
+import pytest
+
+from interviewer.backends import MockBackend
+from interviewer.batch_api import BatchBackend, LocalBatchService, parse_results
+from interviewer.models import AgentConfig
+from interviewer.retry import RetryPolicy, is_retryable
+from interviewer.simulation import Simulation, interview_plan
+
+
+@pytest.fixture
+def configs():
+    return (
+        AgentConfig(system_prompt="You are a test interviewer."),
+        AgentConfig(system_prompt="You are a test respondent."),
+    )
+
+
+def _simulation(backend: BatchBackend) -> Simulation:
+    return Simulation(backend=backend, retry_policy=RetryPolicy(call_timeout=None))
+
+
+async def _run_all(backend: BatchBackend, configs, n: int, max_turns: int):
+    sim = _simulation(backend)
+
+    async def run(i: int):
+        with backend.participant():
+            return await sim.run(*configs, max_turns=max_turns, replica=i)
+
+    return await asyncio.gather(*(run(i) for i in range(n)))
+
+
+def _batch_sizes(directory) -> list[int]:
+    inputs = sorted(directory.glob("*.input.jsonl"), key=lambda p: p.stat().st_mtime_ns)
+    return [len(p.read_text().splitlines()) for p in inputs]
+
+
+async def test_simulations_advance_in_lockstep(mock_backend, configs, tmp_path):
+    service = LocalBatchService(tmp_path, mock_backend)
+    backend = BatchBackend(service, poll_interval=0.01)
+
+    transcripts = await _run_all(backend, configs, n=3, max_turns=2)
+
+    calls = len(interview_plan(2)) - 2  # last_question and end_of_interview are hardcoded
+    assert all(len(t.messages) == len(interview_plan(2)) for t in transcripts)
+    assert all(t.total_output_tokens == 5 * calls for t in transcripts)
+    # One batch per turn, each holding every simulation's request
+    assert backend.batches_submitted == calls
+    assert _batch_sizes(tmp_path) == [3] * calls
+
+
+async def test_resume_waits_for_submitted_batch(configs, tmp_path):
+    manifest = tmp_path / "batches.json"
+    slow = LocalBatchService(tmp_path / "service", MockBackend(seed=0), delay=3600)
+    backend = BatchBackend(slow, poll_interval=0.01, manifest=manifest)
+    task = asyncio.create_task(_run_all(backend, configs, n=2, max_turns=1))
+    while backend.batches_submitted == 0:
+        await asyncio.sleep(0.01)
+    task.cancel()  # the process dies while the first batch is in flight
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    backend._flushing.cancel()
+    assert len(json.loads(manifest.read_text())) == 2
+
+    service = LocalBatchService(tmp_path / "service", MockBackend(seed=0))
+    restarted = BatchBackend(service, poll_interval=0.01, manifest=manifest)
+    transcripts = await _run_all(restarted, configs, n=2, max_turns=1)
+
+    assert all(len(t.messages) == len(interview_plan(1)) for t in transcripts)
+    calls = len(interview_plan(1)) - 2
+    # The opening questions came from the batch submitted before the restart
+    assert restarted.batches_submitted == calls - 1
+    assert len(list((tmp_path / "service").glob("*.input.jsonl"))) == calls
+    assert json.loads(manifest.read_text()) == {}
+
+
+def test_parse_results_maps_errors_to_api_errors():
+    lines = [
+        json.dumps(
+            {
+                "custom_id": "a",
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [{"message": {"role": "assistant", "content": "Hi"}}],
+                        "usage": {
+                            "prompt_tokens": 10,
+                            "completion_tokens": 2,
+                            "total_tokens": 12,
+                            "prompt_tokens_details": {"cached_tokens": 4},
+                        },
+                    },
+                },
+                "error": None,
+            }
+        ),
+        json.dumps(
+            {
+                "custom_id": "b",
+                "response": {"status_code": 500, "body": {"error": {"message": "boom"}}},
+                "error": None,
+            }
+        ),
+    ]
+    results = parse_results(lines)
+    assert results["a"].text == "Hi"
+    assert (results["a"].input_tokens, results["a"].cached_tokens) == (10, 4)
+    assert results["a"].status_code == 200
+    assert isinstance(results["b"], openai.APIStatusError)
+    assert is_retryable(results["b"])
@@ -0,0 +1,53 @@
+"""Tests for the benchmark harness."""
+
+from cli.bench import BenchResult, regressions, run_point, sweep
+
+
+def _result(sims_per_sec: float, concurrency: int = 1) -> BenchResult:
+    return BenchResult(
+        suite="simulation",
+        num_simulations=10,
+        max_turns=2,
+        concurrency=concurrency,
+        seconds=1.0,
+        sims_per_sec=sims_per_sec,
+        turns=80,
+        p50_ms=1.0,
+        p95_ms=2.0,
+        p99_ms=3.0,
+        peak_rss_mib=50.0,
+    )
+
+
+def test_regressions_compare_matching_points():
+    baseline = [_result(100.0), _result(100.0, concurrency=8)]
+    results = [_result(70.0), _result(90.0, concurrency=8), _result(1.0, concurrency=64)]
+    slower = regressions(results, baseline, tolerance=0.2)
+    assert [(r.concurrency, b.sims_per_sec) for r, b in slower] == [(1, 100.0)]
+
+
+def test_run_point_simulation():
+    result = run_point("simulation", 3, 1, 2, latency=0.0)
+    # opening + 1 turn (2 messages) + closing question, answer and goodbye
+    assert result.turns == 3 * 6
+    assert result.sims_per_sec > 0
+    assert result.p50_ms <= result.p95_ms <= result.p99_ms
+    assert result.peak_heap_mib > 0
+
+
+def test_sweep_covers_every_point():
+    results = list(sweep(["server", "writer"], [2], [1], [1, 2], latency=0.0, allocations=False))
+    assert [(r.suite, r.concurrency) for r in results] == [
+        ("server", 1),
+        ("server", 2),
+        ("writer", 1),
+    ]
+    assert all(r.heap_kib_per_turn is None for r in results)
+    assert all(r.peak_rss_mib > 0 for r in results)
+
+
+def test_run_point_records_and_models_agree():
+    records = run_point("records", 3, 1, 2, latency=0.0)
+    models = run_point("models", 3, 1, 2, latency=0.0)
+    assert records.turns == models.turns == 3 * 6
+    assert records.heap_kib_per_turn < models.heap_kib_per_turn
@@ -0,0 +1,130 @@
+"""Tests for the LLM response cache."""
+
+from interviewer.backends import Completion
+from interviewer.cache import ResponseCache
+from interviewer.core import Interviewer
+from interviewer.models import AgentConfig
+from interviewer.simulation import Simulation
+
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+PARAMS = {"temperature": 0.7, "max_completion_tokens": 200}
+
+
+def test_key_depends_on_request_and_replica():
+    key = ResponseCache.key("m", PARAMS, MESSAGES, replica=1)
+    assert key == ResponseCache.key("m", dict(reversed(PARAMS.items())), MESSAGES, replica=1)
+    assert key != ResponseCache.key("m", PARAMS, MESSAGES, replica=2)
+    assert key != ResponseCache.key("other", PARAMS, MESSAGES, replica=1)
+    assert key != ResponseCache.key("m", PARAMS, MESSAGES[:1], replica=1)
+
+
+def test_replica_ignored_at_zero_temperature():
+    params = {**PARAMS, "temperature": 0}
+    key = ResponseCache.key("m", params, MESSAGES, 1)
+    assert key == ResponseCache.key("m", params, MESSAGES, 2)
+
+
+def test_memory_tier_is_lru():
+    cache = ResponseCache(max_memory_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, Completion(text=key))
+    cache.get("a")
+    cache.put("c", Completion(text="c"))
+    assert cache.get("b") is None
+    assert cache.get("a").text == "a"
+    assert cache.stats.hits == 2
+    assert cache.stats.misses == 1
+
+
+def test_disk_tier_persists(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path)
+    cache.put("k", Completion(text="hello", input_tokens=3, output_tokens=2))
+    cache.close()
+
+    reopened = ResponseCache(path)
+    value = reopened.get("k")
+    assert value.text == "hello"
+    assert value.output_tokens == 2
+    assert reopened.stats.disk_hits == 1
+    reopened.close()
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(
+        tmp_path / "cache.sqlite", max_memory_entries=1, max_disk_bytes=200, commit_interval=0
+    )
+    for i in range(10):
+        cache.put(f"k{i}", Completion(text="x" * 20))
+    assert cache.stats.evictions > 0
+    assert cache._disk_bytes <= 200
+    cache._memory.clear()
+    assert cache.get("k0") is None
+    assert cache.get("k9") is not None
+    cache.close()
+
+
+def test_shared_disk_tier_is_capped_as_a_whole(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    caches = [ResponseCache(path, max_disk_bytes=200, commit_interval=0) for _ in range(2)]
+    for i in range(10):
+        caches[i % 2].put(f"k{i}", Completion(text="x" * 20))
+    size = caches[0]._db.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert size <= 200
+    assert all(cache.stats.evictions for cache in caches)
+    for cache in caches:
+        cache.close()
+
+
+def test_disk_writes_are_batched(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path, max_memory_entries=1, commit_interval=60)
+    cache.put("a", Completion(text="a"))
+    cache.put("b", Completion(text="b"))
+    # Buffered entries are served before they reach the disk
+    assert cache.get("a").text == "a"
+    assert cache._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+
+    cache.flush()
+    with cache._db:
+        cache._db.execute("UPDATE responses SET accessed = 0")
+    cache._memory.clear()
+    assert cache.get("b").text == "b"
+    cache.close()
+
+    reopened = ResponseCache(path)
+    accessed = dict(reopened._db.execute("SELECT key, accessed FROM responses"))
+    assert accessed["a"] == 0 and accessed["b"] > 0
+    reopened.close()
+
+
+async def test_rerun_is_served_from_cache(mock_backend):
+    cache = ResponseCache()
+    interviewer_config = AgentConfig(system_prompt="interviewer")
+    respondent_config = AgentConfig(system_prompt="respondent")
+
+    first = await Simulation(cache=cache, backend=mock_backend).run(
+        interviewer_config, respondent_config, max_turns=1, replica=1
+    )
+    calls = len(mock_backend.requests)
+    second = await Simulation(cache=cache, backend=mock_backend).run(
+        interviewer_config, respondent_config, max_turns=1, replica=1
+    )
+    assert len(mock_backend.requests) == calls
+    assert [m.text for m in second.messages] == [m.text for m in first.messages]
+    assert all(call.cache_hit for call in second.llm_calls)
+
+    await Simulation(cache=cache, backend=mock_backend).run(
+        interviewer_config, respondent_config, max_turns=1, replica=2
+    )
+    assert len(mock_backend.requests) == 2 * calls
+
+
+async def test_streamed_response_is_cached(mock_backend):
+    interviewer = Interviewer(cache=ResponseCache(), backend=mock_backend)
+    config = AgentConfig(system_prompt="interviewer")
+    streamed = [c async for c in interviewer.stream_response([], config, "opening_message")]
+    replayed = [c async for c in interviewer.stream_response([], config, "opening_message")]
+    assert len(mock_backend.requests) == 1
+    assert replayed[0] == streamed[-1].text
+    assert replayed[-1].llm_call_info.cache_hit
@@ -0,0 +1,22 @@
+"""Tests for the command-line interface."""
+
+import pytest
+from typer.testing import CliRunner
+
+from cli.main import app
+
+
+@pytest.mark.parametrize("option", ["--backend", "--history", "--prompt-layout"])
+def test_simulate_rejects_unknown_choices(option):
+    result = CliRunner().invoke(app, ["simulate", option, "nope"])
+    assert result.exit_code == 2
+    assert "nope" in result.output
+
+
+def test_simulate_reports_call_stats_with_cache(tmp_path):
+    args = ["simulate", "--backend", "mock", "--mock-latency", "0", "-n", "2", "--max-turns", "1"]
+    args += ["--save", str(tmp_path / "results.jsonl"), "--cache", str(tmp_path / "cache.db")]
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 0, result.output
+    assert "Cache: 0 hit(s)" in result.output
+    assert "LLM calls:" in result.output
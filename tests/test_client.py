@@ -0,0 +1,45 @@
+"""Tests for the shared AsyncOpenAI client registry."""
+
+import pytest
+
+from interviewer.client import aclose_clients, configure_clients, get_client, get_client_settings
+from interviewer.core import Interviewer
+from interviewer.respondent import SimulatedRespondent
+
+
+@pytest.fixture(autouse=True)
+async def _reset_registry():
+    yield
+    await aclose_clients()
+
+
+async def test_same_key_reuses_client():
+    assert get_client("sk-test-a") is get_client("sk-test-a")
+
+
+async def test_different_key_or_base_url_gets_new_client():
+    a = get_client("sk-test-a")
+    assert get_client("sk-test-b") is not a
+    assert get_client("sk-test-a", "http://localhost:9999/v1") is not a
+
+
+async def test_agents_share_client():
+    interviewer = Interviewer(api_key="sk-test-shared")
+    respondent = SimulatedRespondent(api_key="sk-test-shared")
+    assert interviewer.backend.client is respondent.backend.client
+
+
+async def test_aclose_clears_registry():
+    a = get_client("sk-test-a")
+    await aclose_clients()
+    assert get_client("sk-test-a") is not a
+
+
+def test_configure_clients_updates_settings():
+    original = get_client_settings()
+    try:
+        settings = configure_clients(max_connections=7)
+        assert settings.max_connections == 7
+        assert settings.keepalive_expiry == original.keepalive_expiry
+    finally:
+        configure_clients(**original.model_dump())
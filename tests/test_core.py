@@ -1,10 +1,13 @@
 """Tests for Interviewer and SimulatedRespondent (hardcoded responses + message formatting)."""
 
+import asyncio
+
 import pytest
 
 from interviewer.core import Interviewer
 from interviewer.defaults import END_OF_INTERVIEW_RESPONSE, LAST_QUESTION_RESPONSE
-from interviewer.models import AgentConfig, Message
+from interviewer.models import AgentConfig, AgentResponse, Message
+from interviewer.retry import RetryPolicy
 
 
 @pytest.fixture
@@ -52,11 +55,12 @@ def test_format_messages(interviewer, config):
 
 def test_api_key_from_param():
     i = Interviewer(api_key="sk-test-123")
-    assert i._api_key == "sk-test-123"
+    assert i.backend.api_key == "sk-test-123"
 
 
 def test_api_key_missing_raises():
     import os
+
     # Temporarily remove env var if set
     old = os.environ.pop("OPENAI_API_KEY", None)
     try:
@@ -65,3 +69,67 @@ def test_api_key_missing_raises():
     finally:
         if old:
             os.environ["OPENAI_API_KEY"] = old
+
+
+async def _collect(stream):
+    chunks = [chunk async for chunk in stream]
+    return chunks[:-1], chunks[-1]
+
+
+async def test_stream_response_yields_deltas_then_response(mock_backend, config):
+    interviewer = Interviewer(backend=mock_backend)
+    messages = [Message(role="interviewer", text="Hi"), Message(role="respondent", text="Hey")]
+    deltas, resp = await _collect(interviewer.stream_response(messages, config))
+    assert isinstance(resp, AgentResponse)
+    assert "".join(deltas) == resp.text
+    assert len(deltas) > 1
+    assert resp.llm_call_info.message_range == (0, 2)
+    assert resp.llm_call_info.output_tokens == 5
+
+
+async def test_stream_response_hardcoded(interviewer, config):
+    deltas, resp = await _collect(
+        interviewer.stream_response([], config, message_type="last_question")
+    )
+    assert deltas == [LAST_QUESTION_RESPONSE]
+    assert resp.llm_call_info is None
+
+
+async def test_stream_response_retries_before_first_token(mock_backend, config):
+    failures = [asyncio.TimeoutError()]
+
+    class FlakyBackend:
+        def count_tokens(self, model, messages):
+            return 0
+
+        async def stream(self, model, messages, params):
+            if failures:
+                raise failures.pop(0)
+            async for chunk in mock_backend.stream(model, messages, params):
+                yield chunk
+
+    interviewer = Interviewer(
+        retry_policy=RetryPolicy(initial_backoff=0, jitter=0), backend=FlakyBackend()
+    )
+    _, resp = await _collect(interviewer.stream_response([], config, "opening_message"))
+    assert resp.llm_call_info.retries == 1
+
+
+async def test_stream_response_times_out_when_stalled(config):
+    class StallingBackend:
+        def count_tokens(self, model, messages):
+            return 0
+
+        async def stream(self, model, messages, params):
+            yield "Hello"
+            await asyncio.sleep(10)
+            yield "never"
+
+    interviewer = Interviewer(
+        retry_policy=RetryPolicy(call_timeout=0.05), backend=StallingBackend()
+    )
+    deltas = []
+    with pytest.raises(asyncio.TimeoutError):
+        async for chunk in interviewer.stream_response([], config, "opening_message"):
+            deltas.append(chunk)
+    assert deltas == ["Hello"]
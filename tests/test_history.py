@@ -0,0 +1,95 @@
+"""Tests for history policies: windows, token budgets and rolling summaries."""
+
+from interviewer import Interviewer, SimulatedRespondent, Simulation
+from interviewer.defaults import SUMMARY_PREFIX, SUMMARY_SYSTEM_PROMPT
+from interviewer.history import history_start
+from interviewer.models import AgentConfig, HistoryPolicy, Message
+from interviewer.prompt import PromptBuffer, format_messages
+
+HISTORY = [
+    Message(role="interviewer" if i % 2 == 0 else "respondent", text=f"message {i} " + "x" * 36)
+    for i in range(10)
+]
+
+
+def _count(api_messages):
+    return sum(len(m["content"]) // 4 + 4 for m in api_messages)
+
+
+def test_history_start():
+    api_messages = format_messages("sys", HISTORY, "interviewer")
+    assert history_start(HistoryPolicy(), api_messages, _count) == 0
+    window = HistoryPolicy(strategy="window", max_messages=4)
+    assert history_start(window, api_messages, _count) == 6
+    # Each message costs 16 tokens and the system prompt 4
+    budget = HistoryPolicy(strategy="token_budget", max_input_tokens=4 + 3 * 16)
+    assert history_start(budget, api_messages, _count) == 7
+    # The latest message is sent even if it alone is over budget
+    tiny = HistoryPolicy(strategy="token_budget", max_input_tokens=1)
+    assert history_start(tiny, api_messages, _count) == 9
+
+
+async def test_window_is_applied_and_recorded(mock_backend):
+    config = AgentConfig(
+        system_prompt="sys", history=HistoryPolicy(strategy="window", max_messages=3)
+    )
+    respondent = SimulatedRespondent(backend=mock_backend)
+    response = await respondent.generate_response(HISTORY[:9], config)
+
+    sent = mock_backend.requests[-1]["messages"]
+    assert [m["content"] for m in sent[1:]] == [m.text for m in HISTORY[6:9]]
+    assert response.llm_call_info.message_range == (6, 9)
+
+
+async def test_summarize_runs_in_background(mock_backend):
+    policy = HistoryPolicy(strategy="summarize", max_messages=2)
+    config = AgentConfig(system_prompt="sys", history=policy)
+    interviewer = Interviewer(backend=mock_backend)
+    buffer = PromptBuffer("interviewer")
+
+    # No summary yet: everything is sent, and a summary of the older messages is started
+    first = await interviewer.generate_response(HISTORY[:5], config, prompt_buffer=buffer)
+    assert first.llm_call_info.message_range == (0, 5)
+    await buffer.summary.wait()
+    assert buffer.summary.covered == 3
+    [summary_call] = buffer.summary.drain()
+    assert summary_call.summary_of == (0, 3)
+    assert summary_call.messages[0]["content"] == SUMMARY_SYSTEM_PROMPT
+
+    second = await interviewer.generate_response(HISTORY[:7], config, prompt_buffer=buffer)
+    info = second.llm_call_info
+    assert info.message_range == (3, 7)
+    assert info.summary == buffer.summary.text
+    # The next summary may already be underway, so find this call's request by its prompt
+    sent = [r for r in mock_backend.requests if r["messages"][0]["content"] == "sys"][-1]
+    sent = sent["messages"]
+    assert sent[1] == {"role": "system", "content": SUMMARY_PREFIX + info.summary}
+    assert [m["content"] for m in sent[2:]] == [m.text for m in HISTORY[3:7]]
+
+
+async def test_simulation_records_policy_and_summaries(mock_backend):
+    policy = HistoryPolicy(strategy="summarize", max_messages=2)
+    configs = [AgentConfig(system_prompt=p, history=policy) for p in ("int", "resp")]
+    transcript = await Simulation(backend=mock_backend).run(*configs, max_turns=6)
+
+    assert transcript.interviewer_config.history.strategy == "summarize"
+    summaries = [c for c in transcript.llm_calls if c.summary_of]
+    assert summaries
+    assert transcript.total_input_tokens == sum(c.input_tokens for c in transcript.llm_calls)
+    # Calls that used a summary can still be rebuilt exactly
+    for i, call in enumerate(transcript.llm_calls):
+        if call.summary:
+            assert transcript.call_messages(i)[1]["content"] == SUMMARY_PREFIX + call.summary
+
+
+async def test_simulation_records_every_summary_call(mock_backend):
+    policy = HistoryPolicy(strategy="summarize", max_messages=2)
+    configs = [AgentConfig(system_prompt=p, history=policy) for p in ("int", "resp")]
+    transcript = await Simulation(backend=mock_backend).run(*configs, max_turns=7)
+
+    # Including one still being written when the last message was generated
+    sent = [
+        r for r in mock_backend.requests if r["messages"][0]["content"] == SUMMARY_SYSTEM_PROMPT
+    ]
+    assert len([c for c in transcript.llm_calls if c.summary_of]) == len(sent)
+    assert len(transcript.llm_calls) == len(mock_backend.requests)
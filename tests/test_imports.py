@@ -0,0 +1,55 @@
+"""Tests that importing the package and CLI stays cheap."""
+
+import json
+import subprocess
+import sys
+
+import interviewer
+from interviewer.logging import TranscriptWriter
+from interviewer.models import AgentConfig, Message, Transcript
+
+HEAVY = ("openai", "httpx", "pydantic")
+
+
+def _loaded(code: str, modules: tuple[str, ...] = HEAVY) -> list[str]:
+    """Which of ``modules`` a fresh interpreter has imported after running ``code``."""
+    check = f"import sys; print(json.dumps([m for m in {list(modules)!r} if m in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, "-c", f"import json; {code}; {check}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def test_import_package_is_lazy():
+    assert _loaded("import interviewer") == []
+    assert _loaded("from interviewer import DEFAULT_MODEL, load_prompt") == []
+
+
+def test_import_cli_skips_sdk_and_models():
+    assert _loaded("import cli.main", (*HEAVY, "interviewer.models", "dotenv")) == []
+
+
+def test_sdk_loaded_only_for_a_client():
+    assert _loaded("import interviewer.simulation", ("openai", "httpx")) == []
+
+
+def test_listing_results_needs_no_models(tmp_path):
+    path = tmp_path / "results.jsonl"
+    transcript = Transcript(
+        messages=[Message(role="interviewer", text="Hello!")],
+        interviewer_config=AgentConfig(system_prompt="Test"),
+    )
+    with TranscriptWriter(path) as writer:
+        writer.write(1, transcript)
+
+    code = f"from interviewer import ResultsIndex; assert len(ResultsIndex({str(path)!r})) == 1"
+    assert _loaded(code) == []
+
+
+def test_every_export_resolves():
+    for name in interviewer.__all__:
+        assert getattr(interviewer, name) is not None
+    assert set(dir(interviewer)) >= set(interviewer.__all__)
@@ -0,0 +1,101 @@
+"""Tests for background simulation jobs and batches."""
+
+import asyncio
+import json
+
+from interviewer.models import AgentConfig, Message
+from server.batch import BatchRequest, get_batch, run_batch
+from server.jobs import Job, JobManager
+
+
+async def test_concurrency_limit_and_completion():
+    manager = JobManager(max_concurrency=2)
+    running = peak = 0
+
+    async def work(job: Job) -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        job.add_message(Message(role="interviewer", text=job.id))
+        running -= 1
+
+    jobs = [manager.submit(Job(session_id="s", max_turns=1), work) for _ in range(5)]
+    assert all(job.status == "queued" for job in jobs)
+    await asyncio.gather(*(job._task for job in jobs))
+    assert peak == 2
+    assert [job.status for job in jobs] == ["completed"] * 5
+    assert manager.active_job("s") is None
+
+
+async def test_failure_and_cancel():
+    manager = JobManager()
+
+    async def fail(job: Job) -> None:
+        raise RuntimeError("boom")
+
+    async def hang(job: Job) -> None:
+        await asyncio.sleep(60)
+
+    failed = manager.submit(Job(session_id="a", max_turns=1), fail)
+    hanging = manager.submit(Job(session_id="b", max_turns=1), hang)
+    await asyncio.sleep(0)
+    assert manager.active_job("b") is hanging
+    assert manager.cancel(hanging.id)
+    await asyncio.gather(failed._task, hanging._task)
+    assert (failed.status, failed.error) == ("failed", "boom")
+    assert hanging.status == "cancelled"
+    assert not manager.cancel(hanging.id)
+
+
+async def test_events_replay_then_follow():
+    manager = JobManager()
+    release = asyncio.Event()
+
+    async def work(job: Job) -> None:
+        job.add_message(Message(role="interviewer", text="first"))
+        await release.wait()
+        job.add_message(Message(role="respondent", text="second"))
+
+    job = manager.submit(Job(session_id="s", max_turns=1), work)
+    await asyncio.sleep(0)
+
+    async def collect():
+        return [event async for event in job.events()]
+
+    subscriber = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+    release.set()
+    events = await subscriber
+    assert [e for e, _ in events] == ["message", "status", "message", "status"]
+    assert events[0][1]["text"] == "first"
+    assert events[-1][1]["status"] == "completed"
+    # A late subscriber gets the full history and the final status
+    assert len([event async for event in job.events()]) == 3
+
+
+async def test_finished_jobs_are_pruned():
+    manager = JobManager(max_finished=2)
+
+    async def work(job: Job) -> None:
+        pass
+
+    jobs = [manager.submit(Job(session_id="s", max_turns=1), work) for _ in range(3)]
+    await asyncio.gather(*(job._task for job in jobs))
+    manager.submit(Job(session_id="s", max_turns=1), work)
+    assert manager.get(jobs[0].id) is None
+    assert manager.get(jobs[2].id) is not None
+
+
+async def test_closed_batch_stream_is_cancelled(mock_backend):
+    request = BatchRequest(
+        interviewer_config=AgentConfig(system_prompt="i"),
+        respondent_config=AgentConfig(system_prompt="r"),
+        max_turns=1,
+        count=100,
+    )
+    stream = run_batch(request, backend=mock_backend)
+    started = json.loads(await anext(stream))
+    await anext(stream)
+    await stream.aclose()
+    assert get_batch(started["id"]).status == "cancelled"
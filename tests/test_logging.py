@@ -2,11 +2,25 @@
 
 import csv
 import json
+import os
+import subprocess
+import sys
 import tempfile
+import threading
 from pathlib import Path
 
-from interviewer.logging import save_transcript
+import pytest
+
+from interviewer import serialize
+from interviewer.logging import (
+    AsyncTranscriptWriter,
+    TranscriptWriter,
+    read_transcripts,
+    save_transcript,
+    save_transcript_async,
+)
 from interviewer.models import AgentConfig, Message, Transcript
+from interviewer.results_index import ResultsIndex
 
 
 def _make_transcript() -> Transcript:
@@ -51,3 +65,144 @@ def test_save_csv():
     assert rows[1] == ["1", "interviewer", "Hello!"]
     assert rows[2] == ["2", "respondent", "Hi there."]
     Path(path).unlink()
+
+
+def test_writer_csv_roundtrip(tmp_path):
+    path = tmp_path / "results.csv"
+    with TranscriptWriter(path) as writer:
+        writer.write(1, _make_transcript())
+        writer.write(2, _make_transcript())
+
+    rows = list(read_transcripts(path))
+    assert [sim_id for sim_id, _ in rows] == [1, 2]
+    assert rows[0][1].messages[0].text == "Hello!"
+    assert rows[1][1].total_input_tokens == 150
+
+
+def test_writer_jsonl_roundtrip(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with TranscriptWriter(path) as writer:
+        assert writer.format == "jsonl"
+        writer.write(7, _make_transcript())
+
+    lines = path.read_text().splitlines()
+    assert json.loads(lines[0])["simulation_id"] == 7
+    [(sim_id, transcript)] = list(read_transcripts(path))
+    assert sim_id == 7
+    assert len(transcript.messages) == 3
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_results_are_utf8_whatever_the_locale(tmp_path, suffix):
+    path = tmp_path / f"results{suffix}"
+    text = "¿Qué tal?"
+    code = f"""
+from interviewer.logging import TranscriptWriter, read_transcripts
+from interviewer.models import AgentConfig, Message, Transcript
+transcript = Transcript(
+    messages=[Message(role="interviewer", text={text!a})],
+    interviewer_config=AgentConfig(system_prompt="Test"),
+)
+with TranscriptWriter({str(path)!r}) as writer:
+    writer.write(1, transcript)
+    writer.write(2, transcript)
+print(ascii([t.messages[0].text for _, t in read_transcripts({str(path)!r})]))
+"""
+    # Write and read back under a locale whose encoding is ASCII
+    env = {**os.environ, "LC_ALL": "C", "PYTHONUTF8": "0", "PYTHONCOERCECLOCALE": "0"}
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ascii([text, text])
+    with ResultsIndex(path) as index:
+        assert [t.messages[0].text for _, t in index] == [text, text]
+
+
+def test_writer_flushes_in_batches(tmp_path):
+    path = tmp_path / "results.jsonl"
+    writer = TranscriptWriter(path, flush_every=2)
+    writer.write(1, _make_transcript())
+    writer.write(2, _make_transcript())
+    # Readable before close: the batch of two has been flushed
+    assert len(list(read_transcripts(path))) == 2
+    writer.close()
+
+
+def test_writer_append_keeps_rows_and_single_header(tmp_path):
+    path = tmp_path / "results.csv"
+    with TranscriptWriter(path) as writer:
+        writer.write(1, _make_transcript())
+    with TranscriptWriter(path, append=True) as writer:
+        writer.write(2, _make_transcript())
+
+    assert [sim_id for sim_id, _ in read_transcripts(path)] == [1, 2]
+    assert path.read_text().count("simulation_id") == 1
+
+
+def test_read_skips_truncated_last_row(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with TranscriptWriter(path) as writer:
+        writer.write(1, _make_transcript())
+    with open(path, "a") as f:
+        f.write('{"simulation_id": 2, "transcript": {"messa')
+
+    assert [sim_id for sim_id, _ in read_transcripts(path)] == [1]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_append_after_truncated_row(tmp_path, suffix):
+    path = tmp_path / f"results{suffix}"
+    with TranscriptWriter(path) as writer:
+        writer.write(1, _make_transcript())
+        writer.write(2, _make_transcript())
+        writer.write(3, _make_transcript())
+    # A crash while row 3 was being written
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 40])
+
+    with TranscriptWriter(path, append=True) as writer:
+        writer.write(4, _make_transcript())
+        writer.write(5, _make_transcript())
+
+    assert [sim_id for sim_id, _ in read_transcripts(path)] == [1, 2, 4, 5]
+
+
+@pytest.mark.parametrize("orjson", [True, False])
+async def test_save_async_matches_pydantic_json(tmp_path, monkeypatch, orjson):
+    if not orjson:
+        monkeypatch.setattr(serialize, "_orjson", lambda: None)
+    t = _make_transcript()
+    t.messages.append(Message(role="respondent", text="Très bien, merci."))
+    path = tmp_path / "transcript.json"
+    await save_transcript_async(t, path)
+    assert path.read_text(encoding="utf-8") == t.model_dump_json(indent=2)
+
+    await save_transcript_async(t, tmp_path / "transcript.csv", format="csv")
+    rows = list(csv.reader((tmp_path / "transcript.csv").read_text(encoding="utf-8").splitlines()))
+    assert rows[-1] == ["4", "respondent", "Très bien, merci."]
+
+
+async def test_async_writer_keeps_row_order(tmp_path):
+    path = tmp_path / "results.jsonl"
+    async with AsyncTranscriptWriter(path, flush_every=3) as writer:
+        await writer.write(1, _make_transcript())
+        await writer.write_many((i, _make_transcript()) for i in range(2, 6))
+        assert writer.rows_written == 5
+
+    assert [sim_id for sim_id, _ in read_transcripts(path)] == [1, 2, 3, 4, 5]
+    with ResultsIndex(path, save=False) as index:
+        assert [e.simulation_id for e in index.entries] == [1, 2, 3, 4, 5]
+
+
+async def test_async_writer_opens_file_on_its_thread(tmp_path, monkeypatch):
+    opened_on = []
+    init = TranscriptWriter.__init__
+
+    def record_thread(self, *args, **kwargs):
+        opened_on.append(threading.current_thread().name)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(TranscriptWriter, "__init__", record_thread)
+    async with AsyncTranscriptWriter(tmp_path / "results.jsonl", append=True) as writer:
+        await writer.write(1, _make_transcript())
+    assert opened_on[0].startswith("interviewer-writer")
@@ -0,0 +1,81 @@
+"""Tests for LLM call timing and the Prometheus metrics."""
+
+import pytest
+
+from interviewer.backends import Completion, MockBackend
+from interviewer.core import Interviewer
+from interviewer.metrics import CallMetrics, CallTimer, Histogram, call_metrics, percentile
+from interviewer.models import AgentConfig
+from interviewer.retry import RetryPolicy
+from interviewer.scheduler import BudgetExceededError, Scheduler
+from interviewer.simulation import Simulation
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("model",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, model="m")
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{model="m",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{model="m",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{model="m",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{model="m"} 3' in lines
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_call_timer_tracks_gauges_and_errors():
+    metrics = CallMetrics()
+    timer = CallTimer("m", metrics)
+    assert metrics.queued.get() == 1
+    timer.sent()
+    assert (metrics.queued.get(), metrics.in_flight.get()) == (0, 1)
+    timer.failed(TimeoutError())
+    assert (metrics.queued.get(), metrics.in_flight.get()) == (1, 0)
+    timer.sent()
+    timer.completed(Completion(text="hi", input_tokens=10, output_tokens=2), retries=1)
+    timer.close()
+    assert (metrics.queued.get(), metrics.in_flight.get()) == (0, 0)
+    assert metrics.errors.get(type="TimeoutError", status="") == 1
+    assert metrics.tokens.get(model="m", kind="output") == 2
+    assert timer.queued_at <= timer.sent_at <= timer.completed_at
+
+
+async def test_simulation_records_call_timing():
+    backend = MockBackend(latency=0.01, output_tokens=(5, 5), seed=0, rate_limit_rate=0.5)
+    rate_limited = call_metrics.errors.get(type="RateLimitError", status=429)
+    sim = Simulation(backend=backend, retry_policy=RetryPolicy(initial_backoff=0.01, jitter=0))
+    configs = (AgentConfig(system_prompt="Interviewer."), AgentConfig(system_prompt="Respondent."))
+    transcript = await sim.run(*configs, max_turns=2)
+
+    for call in transcript.llm_calls:
+        assert call.status_code == 200
+        assert call.queued_at <= call.sent_at <= call.completed_at
+        assert call.latency_seconds >= 0.001
+    stats = transcript.call_stats
+    assert stats.calls == len(transcript.llm_calls)
+    assert stats.retries == sum(c.retries for c in transcript.llm_calls) > 0
+    rate_limited = call_metrics.errors.get(type="RateLimitError", status=429) - rate_limited
+    assert rate_limited == stats.retries
+    assert stats.max_latency_seconds <= stats.latency_seconds
+    assert stats.output_tokens_per_second == pytest.approx(
+        transcript.total_output_tokens / stats.latency_seconds
+    )
+
+
+async def test_budget_stop_releases_queued_gauge(mock_backend):
+    interviewer = Interviewer(backend=mock_backend, scheduler=Scheduler(token_budget=1))
+    config = AgentConfig(system_prompt="Interviewer.")
+    queued = call_metrics.queued.get()
+    with pytest.raises(BudgetExceededError):
+        await interviewer.generate_response([], config)
+    with pytest.raises(BudgetExceededError):
+        async for _ in interviewer.stream_response([], config):
+            pass
+    assert call_metrics.queued.get() == queued
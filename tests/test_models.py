@@ -3,6 +3,8 @@
 import os
 import tempfile
 
+import pytest
+
 from interviewer.defaults import (
     DEFAULT_INTERVIEWER_SYSTEM_PROMPT,
     DEFAULT_MAX_TOKENS,
@@ -14,7 +16,15 @@ from interviewer.defaults import (
     LAST_QUESTION_RESPONSE,
     OPENING_INSTRUCTION,
 )
-from interviewer.models import AgentConfig, AgentResponse, LLMCallInfo, Message, Transcript, load_prompt
+from interviewer.models import (
+    AgentConfig,
+    AgentResponse,
+    LLMCallInfo,
+    Message,
+    Transcript,
+    load_prompt,
+)
+from interviewer.records import CallRecord, Reply, Turn, add_to_transcript
 
 
 def test_defaults():
@@ -124,3 +134,25 @@ def test_transcript():
     msg = Message(role="interviewer", text="Hi")
     t.messages.append(msg)
     assert len(t.messages) == 1
+
+
+def test_records_convert_to_models():
+    turn = Turn.of(" interviewer"[1:], "Hi")  # a distinct string object
+    assert turn.role is Turn.of("interviewer", "Hello").role  # interned
+    assert turn.to_message() == Message(role="interviewer", text="Hi")
+    assert Turn.from_message(turn.to_message()) == turn
+    with pytest.raises(ValueError):
+        Turn.of("narrator", "Once upon a time")
+
+    call = CallRecord(model="gpt-4o-mini", params={}, input_tokens=10, output_tokens=5)
+    assert call.to_info() == LLMCallInfo(
+        model="gpt-4o-mini", params={}, input_tokens=10, output_tokens=5
+    )
+    assert Reply("Hi", call).to_response().llm_call_info == call.to_info()
+    assert Reply("Bye").to_response() == AgentResponse(text="Bye")
+
+    t = Transcript()
+    add_to_transcript(t, [turn], [call, call._replace(messages=[{"role": "user"}])])
+    assert t.messages == [turn.to_message()]
+    assert t.llm_calls[1].messages == [{"role": "user"}]
+    assert t.total_input_tokens == 20
@@ -0,0 +1,82 @@
+"""Tests for prompt formatting and the incremental PromptBuffer."""
+
+import itertools
+
+from interviewer.models import Message
+from interviewer.prompt import PromptBuffer, format_messages, prompt_hash
+
+HISTORY = [
+    Message(role="interviewer", text="Hello!"),
+    Message(role="respondent", text="Hi there."),
+    Message(role="interviewer", text="Tell me more."),
+    Message(role="respondent", text="Sure."),
+]
+
+
+def test_prompt_hash_is_stable():
+    assert prompt_hash("abc") == prompt_hash("abc")
+    assert prompt_hash("abc") != prompt_hash("abd")
+
+
+def test_buffer_matches_full_rebuild_each_turn():
+    for perspective in ("interviewer", "respondent"):
+        buffer = PromptBuffer(perspective)
+        for n in range(len(HISTORY) + 1):
+            expected = format_messages("sys", HISTORY[:n], perspective)
+            assert buffer.build("sys", HISTORY[:n]) == expected
+
+
+def test_buffer_only_maps_new_messages():
+    buffer = PromptBuffer("interviewer")
+    first = buffer.build("sys", HISTORY[:2])
+    second = buffer.build("sys", HISTORY[:3])
+    # Existing entries are reused, not re-created
+    assert second[1] is first[1]
+    # Returned arrays are independent snapshots
+    assert len(first) == 3
+
+
+def test_buffer_rebuilds_on_system_prompt_change():
+    buffer = PromptBuffer("interviewer")
+    buffer.build("sys", HISTORY)
+    assert buffer.build("new sys", HISTORY) == format_messages("new sys", HISTORY, "interviewer")
+
+
+def test_buffer_rebuilds_on_divergent_history():
+    buffer = PromptBuffer("respondent")
+    buffer.build("sys", HISTORY)
+    other = [Message(role="interviewer", text="Different opening")]
+    assert buffer.build("sys", other) == format_messages("sys", other, "respondent")
+    replaced = HISTORY[:1] + [Message(role="respondent", text="Edited")]
+    assert buffer.build("sys", replaced) == format_messages("sys", replaced, "respondent")
+
+
+async def test_prefix_stable_prompts_extend_each_other():
+    from interviewer import AgentConfig, HistoryPolicy, MockBackend, Simulation
+
+    backend = MockBackend(
+        output_tokens=(5, 5), record=True, prompt_cache_min_tokens=0, prompt_cache_increment=1
+    )
+    window = HistoryPolicy(strategy="window", max_messages=4)
+    configs = [
+        AgentConfig(system_prompt=p, history=window, prompt_layout="prefix_stable")
+        for p in ("int", "resp")
+    ]
+    transcript = await Simulation(backend=backend).run(*configs, max_turns=8)
+
+    interviewer_prompts = [
+        r["messages"] for r in backend.requests if r["messages"][0]["content"] == "int"
+    ]
+    # Between window steps, each prompt starts with the whole previous one
+    extended = sum(
+        later[: len(earlier)] == earlier
+        for earlier, later in itertools.pairwise(interviewer_prompts)
+    )
+    assert extended >= len(interviewer_prompts) // 2
+    opening = interviewer_prompts[0][1]
+    assert all(p[1] == opening for p in interviewer_prompts)
+
+    for i, request in enumerate(backend.requests):
+        assert transcript.call_messages(i) == request["messages"]
+    assert transcript.total_cached_tokens == sum(c.cached_tokens for c in transcript.llm_calls)
+    assert 0 < transcript.prompt_cache_ratio < 1
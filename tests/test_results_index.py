@@ -0,0 +1,88 @@
+"""Tests for the sidecar offset index of results files."""
+
+import pytest
+
+from interviewer.logging import TranscriptWriter, completed_simulation_ids
+from interviewer.models import Message, Transcript
+from interviewer.results_index import ResultsIndex, _load_index, index_path
+
+
+def _transcript(text: str) -> Transcript:
+    return Transcript(
+        messages=[Message(role="interviewer", text=text), Message(role="respondent", text="Ok.")],
+        total_input_tokens=100,
+        total_output_tokens=20,
+    )
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_writer_index_matches_scan(tmp_path, suffix):
+    path = tmp_path / f"results{suffix}"
+    with TranscriptWriter(path) as writer:
+        writer.write(3, _transcript('She said "hi" — twice,\nthen left.'))
+        writer.write(1, _transcript("Hello!"))
+    with TranscriptWriter(path, append=True) as writer:
+        writer.write(2, _transcript("Welcome back."))
+
+    written = _load_index(index_path(path))
+    index_path(path).unlink()
+    with ResultsIndex(path) as index:
+        assert index.entries == written
+        assert [e.simulation_id for e in index.entries] == [3, 1, 2]
+        assert index.entry(1).messages == 2
+        assert index.entry(2).input_tokens == 100
+        assert index.load(3).messages[0].text == 'She said "hi" — twice,\nthen left.'
+        assert [e.simulation_id for e in index.search('SAID "HI" —')] == [3]
+    assert index_path(path).exists()
+
+
+def test_index_extends_and_rebuilds(tmp_path):
+    path = tmp_path / "results.jsonl"
+    with TranscriptWriter(path) as writer:
+        writer.write(1, _transcript("First"))
+    with TranscriptWriter(path, append=True, index=False) as writer:
+        writer.write(2, _transcript("Second"))
+    with open(path, "a") as f:
+        f.write('{"simulation_id": 3, "transcript": {"messa')  # killed mid-write
+
+    with ResultsIndex(path) as index:
+        assert [e.simulation_id for e in index.entries] == [1, 2]
+    assert len(_load_index(index_path(path))) == 2
+
+    with TranscriptWriter(path, index=False) as writer:  # overwrites the file
+        writer.write(9, _transcript("Replaced"))
+    with ResultsIndex(path) as index:
+        assert [e.preview for e in index.entries] == ["Replaced"]
+        with pytest.raises(KeyError):
+            index.load(1)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+@pytest.mark.parametrize("cut", [1, 40])
+def test_resume_after_truncated_row(tmp_path, suffix, cut):
+    path = tmp_path / f"results{suffix}"
+    with TranscriptWriter(path) as writer:
+        for sim_id in (1, 2, 3):
+            writer.write(sim_id, _transcript("Hello!"))
+    # A crash while row 3 was being written, after its index entry (cut=1: all but the newline)
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - cut])
+
+    assert completed_simulation_ids(path) == {1, 2}
+    with TranscriptWriter(path, append=True) as writer:
+        writer.write(4, _transcript("Hello!"))
+        writer.write(5, _transcript("Hello!"))
+
+    with ResultsIndex(path) as index:
+        assert [e.simulation_id for e in index.entries] == [1, 2, 4, 5]
+        written = index.entries
+    index_path(path).unlink()
+    with ResultsIndex(path) as index:
+        assert index.entries == written
+
+
+def test_empty_results_file(tmp_path):
+    path = tmp_path / "results.csv"
+    path.touch()
+    with ResultsIndex(path) as index:
+        assert len(index) == 0
@@ -0,0 +1,151 @@
+"""Tests for the LLM retry policy and circuit breaker."""
+
+import httpx
+import openai
+import pytest
+
+from interviewer.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retry,
+    is_retryable,
+    retry_after,
+)
+from interviewer.scheduler import Scheduler
+
+FAST = RetryPolicy(initial_backoff=0.001, max_backoff=0.01, max_attempts=3)
+
+
+def _status_error(status: int, headers: dict | None = None) -> openai.APIStatusError:
+    response = httpx.Response(
+        status, headers=headers or {}, request=httpx.Request("POST", "https://api.test/v1")
+    )
+    cls = openai.RateLimitError if status == 429 else openai.APIStatusError
+    return cls("error", response=response, body=None)
+
+
+def _flaky(failures: list[Exception], result="ok"):
+    calls = {"n": 0}
+
+    async def func():
+        calls["n"] += 1
+        if failures:
+            raise failures.pop(0)
+        return result
+
+    return func, calls
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(initial_backoff=1.0, max_backoff=4.0, jitter=0.0)
+    assert [policy.backoff(n) for n in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 4.0]
+    jittered = RetryPolicy(initial_backoff=1.0, jitter=1.0)
+    assert all(0.0 <= jittered.backoff(1) <= 1.0 for _ in range(20))
+
+
+def test_retryable_classification():
+    assert is_retryable(_status_error(429))
+    assert is_retryable(_status_error(503))
+    assert not is_retryable(_status_error(400))
+    assert not is_retryable(ValueError())
+
+
+def test_retry_after_header():
+    assert retry_after(_status_error(429, {"retry-after": "2"})) == 2.0
+    assert retry_after(_status_error(429, {"retry-after-ms": "250"})) == 0.25
+    assert retry_after(_status_error(429)) is None
+
+
+async def test_retries_then_succeeds():
+    func, calls = _flaky([_status_error(429), _status_error(500)])
+    result, retries = await call_with_retry(func, FAST)
+    assert result == "ok"
+    assert retries == 2
+    assert calls["n"] == 3
+
+
+async def test_gives_up_after_max_attempts():
+    func, calls = _flaky([_status_error(500)] * 5)
+    with pytest.raises(openai.APIStatusError):
+        await call_with_retry(func, FAST)
+    assert calls["n"] == FAST.max_attempts
+
+
+async def test_non_retryable_raises_immediately():
+    func, calls = _flaky([_status_error(400)])
+    with pytest.raises(openai.APIStatusError):
+        await call_with_retry(func, FAST)
+    assert calls["n"] == 1
+
+
+async def test_circuit_breaker_opens_on_sustained_failures():
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    func, _ = _flaky([_status_error(500)] * 5)
+    with pytest.raises(CircuitOpenError):
+        await call_with_retry(func, FAST, breaker)
+    assert breaker.is_open
+
+    breaker.record_success()
+    assert not breaker.is_open
+
+
+def test_circuit_breaker_lets_one_trial_call_through(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("interviewer.retry.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(threshold=1, cooldown=30)
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    now[0] = 31
+    breaker.check()  # the trial
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_failure()
+    now[0] = 60
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    # A trial that never reports back only blocks calls for one more cooldown
+    now[0] = 62
+    breaker.check()
+    now[0] = 93
+    breaker.check()
+    breaker.record_success()
+    breaker.check()
+    breaker.check()
+
+
+async def test_agent_records_retries(mock_backend):
+    from interviewer.models import AgentConfig
+    from interviewer.respondent import SimulatedRespondent
+
+    failures = [_status_error(429)]
+
+    class FlakyBackend:
+        def count_tokens(self, model, messages):
+            return mock_backend.count_tokens(model, messages)
+
+        async def generate(self, model, messages, params):
+            if failures:
+                raise failures.pop(0)
+            return await mock_backend.generate(model, messages, params)
+
+    respondent = SimulatedRespondent(retry_policy=FAST, backend=FlakyBackend())
+    resp = await respondent.generate_response([], AgentConfig(system_prompt="test"))
+    assert resp.llm_call_info.retries == 1
+
+
+async def test_failed_item_is_isolated():
+    scheduler = Scheduler(max_concurrency=2)
+
+    async def job(i: int) -> int:
+        if i == 1:
+            raise RuntimeError("boom")
+        return i
+
+    pairs = scheduler.as_completed(job, range(4), return_exceptions=True)
+    results = dict([pair async for pair in pairs])
+    assert isinstance(results.pop(1), RuntimeError)
+    assert results == {0: 0, 2: 2, 3: 3}
@@ -0,0 +1,71 @@
+"""Tests for the simulation scheduler and rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from interviewer import AgentConfig, Simulation
+from interviewer.scheduler import BudgetExceededError, RateLimiter, Scheduler
+
+
+async def test_rate_limiter_waits_when_bucket_empty():
+    limiter = RateLimiter(per_minute=6000)  # 100 units/second
+    await limiter.acquire(6000)
+    start = time.monotonic()
+    await limiter.acquire(10)
+    assert time.monotonic() - start >= 0.08
+
+
+async def test_as_completed_bounds_concurrency():
+    scheduler = Scheduler(max_concurrency=3)
+    in_flight = 0
+    peak = 0
+
+    async def job(i: int) -> int:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return i * 2
+
+    results = dict([pair async for pair in scheduler.as_completed(job, range(10))])
+    assert results == {i: i * 2 for i in range(10)}
+    assert peak == 3
+
+
+async def test_as_completed_propagates_errors():
+    scheduler = Scheduler(max_concurrency=2)
+
+    async def job(i: int) -> int:
+        if i == 3:
+            raise RuntimeError("boom")
+        return i
+
+    with pytest.raises(RuntimeError, match="boom"):
+        async for _ in scheduler.as_completed(job, range(10)):
+            pass
+
+
+def test_invalid_concurrency():
+    with pytest.raises(ValueError):
+        Scheduler(max_concurrency=0)
+
+
+def test_token_budget_counts_reservations_in_flight():
+    scheduler = Scheduler(token_budget=1000)
+    scheduler.reserve(600)
+    with pytest.raises(BudgetExceededError):
+        scheduler.reserve(500)
+    scheduler.settle(600, 300)
+    scheduler.reserve(500)
+    assert scheduler.tokens_used == 300
+
+
+async def test_simulation_stops_at_token_budget(mock_backend):
+    scheduler = Scheduler(token_budget=1500)
+    configs = [AgentConfig(system_prompt=p, max_tokens=50) for p in ("int", "resp")]
+    with pytest.raises(BudgetExceededError):
+        await Simulation(scheduler=scheduler, backend=mock_backend).run(*configs, max_turns=20)
+    assert 0 < scheduler.tokens_used <= 1500
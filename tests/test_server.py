@@ -0,0 +1,231 @@
+"""Tests for the streaming (SSE), job, batch and concurrency-control server endpoints."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from server.app import create_app
+
+
+@pytest.fixture
+def client(mock_backend):
+    with TestClient(create_app(backend=mock_backend)) as client:
+        yield client
+
+
+def _events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+def test_start_and_message_stream(client):
+    session_id = client.post("/api/sessions").json()["id"]
+
+    response = client.post(f"/api/sessions/{session_id}/start/stream")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    *deltas, (name, done) = events
+    assert name == "done"
+    assert {event for event, _ in deltas} == {"delta"}
+    assert "".join(d["text"] for _, d in deltas) == done["message"]["text"]
+    assert done["llm_call_info"]["output_tokens"] == 5
+
+    response = client.post(f"/api/sessions/{session_id}/messages/stream", json={"text": "Hi"})
+    name, done = _events(response.text)[-1]
+    assert done["respondent_message"]["text"] == "Hi"
+
+    session = client.get(f"/api/sessions/{session_id}").json()
+    assert session["status"] == "active"
+    assert [m["role"] for m in session["messages"]] == ["interviewer", "respondent", "interviewer"]
+
+
+def test_transcript_export(client):
+    session_id = client.post("/api/sessions").json()["id"]
+    client.post(f"/api/sessions/{session_id}/start")
+
+    transcript = client.get(f"/api/sessions/{session_id}/transcript").json()
+    [message] = transcript["messages"]
+    response = client.get(f"/api/sessions/{session_id}/transcript?format=csv")
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == ["turn,role,text", f"1,interviewer,{message['text']}"]
+
+
+def test_simulate_all_runs_as_job(client):
+    session_id = client.post("/api/sessions").json()["id"]
+
+    response = client.post(f"/api/sessions/{session_id}/simulate-all?max_turns=2")
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    events = _events(client.get(f"/api/jobs/{job_id}/events").text)
+    messages = [data for event, data in events if event == "message"]
+    assert events[-1] == ("status", {"status": "completed", "error": None, "total_messages": 8})
+    assert len(messages) == 8
+
+    job = client.get(f"/api/jobs/{job_id}").json()
+    assert job["status"] == "completed"
+    session = client.get(f"/api/sessions/{session_id}").json()
+    assert session["status"] == "ended"
+    assert [m["text"] for m in session["messages"]] == [m["text"] for m in messages]
+
+    assert client.post(f"/api/jobs/{job_id}/cancel").status_code == 409
+    assert client.get("/api/jobs/unknown").status_code == 404
+
+
+def _batch_request(**overrides) -> dict:
+    return {
+        "interviewer_config": {"system_prompt": "interviewer"},
+        "respondent_config": {"system_prompt": "respondent"},
+        "max_turns": 1,
+        "count": 4,
+        "concurrency": 2,
+        **overrides,
+    }
+
+
+def test_batch_streams_ndjson(client):
+    response = client.post("/api/simulations/batch", json=_batch_request())
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert lines[0]["type"] == "started"
+    transcripts = [line for line in lines if line["type"] == "transcript"]
+    assert sorted(t["simulation_id"] for t in transcripts) == [1, 2, 3, 4]
+    assert [line["completed"] for line in lines if line["type"] == "progress"] == [1, 2, 3, 4]
+
+    summary = lines[-1]
+    assert summary["type"] == "summary"
+    assert summary["status"] == "completed"
+    assert summary["output_tokens"] == sum(
+        t["transcript"]["total_output_tokens"] for t in transcripts
+    )
+    assert client.get(f"/api/simulations/batch/{summary['id']}").json()["status"] == "completed"
+
+
+def test_batch_validates_size(client):
+    response = client.post("/api/simulations/batch", json=_batch_request(count=0))
+    assert response.status_code == 422
+
+
+def test_sessions_reject_summarize_history(client):
+    config = {"system_prompt": "sys", "history": {"strategy": "summarize"}}
+    response = client.post("/api/sessions", json={"interviewer_config": config})
+    assert response.status_code == 422
+
+    session_id = client.post("/api/sessions").json()["id"]
+    response = client.patch(
+        f"/api/sessions/{session_id}/config", json={"respondent_config": config}
+    )
+    assert response.status_code == 422
+    assert client.get(f"/api/sessions/{session_id}").json()["version"] == 0
+
+
+def test_idempotency_key_replays_response(client, mock_backend):
+    session_id = client.post("/api/sessions").json()["id"]
+    client.post(f"/api/sessions/{session_id}/start")
+    headers = {"Idempotency-Key": "turn-1"}
+
+    url = f"/api/sessions/{session_id}/messages"
+    first = client.post(url, json={"text": "Hi"}, headers=headers)
+    calls = mock_backend.calls
+    retry = client.post(url, json={"text": "Hi"}, headers=headers)
+    assert retry.json() == first.json()
+    assert mock_backend.calls == calls
+    assert len(client.get(f"/api/sessions/{session_id}").json()["messages"]) == 3
+
+    stream_headers = {"Idempotency-Key": "turn-2"}
+    url = f"/api/sessions/{session_id}/messages/stream"
+    done = _events(client.post(url, json={"text": "More"}, headers=stream_headers).text)[-1]
+    replay = _events(client.post(url, json={"text": "More"}, headers=stream_headers).text)
+    assert replay == [done]
+
+
+@pytest.mark.parametrize("endpoint", ["messages", "messages/stream", "simulate-turn"])
+def test_retry_after_failure_saves_messages_once(mock_backend, monkeypatch, endpoint):
+    import openai
+
+    from interviewer.backends import _status_error
+
+    with TestClient(create_app(backend=mock_backend), raise_server_exceptions=False) as client:
+        session_id = client.post("/api/sessions").json()["id"]
+        client.post(f"/api/sessions/{session_id}/start")
+        url = f"/api/sessions/{session_id}/{endpoint}"
+        request = {"json": {"text": "my answer"}} if endpoint != "simulate-turn" else {}
+        headers = {"Idempotency-Key": "k1"}
+
+        # Fail the interviewer's call; for simulate-turn, after the respondent's succeeded
+        attempts = []
+
+        def fail():
+            attempts.append(1)
+            if endpoint != "simulate-turn" or len(attempts) > 1:
+                raise _status_error(openai.BadRequestError, 400, "Mock bad request")
+
+        monkeypatch.setattr(mock_backend, "_maybe_fail", fail)
+        failed = client.post(url, headers=headers, **request)
+        if endpoint.endswith("stream"):
+            assert _events(failed.text)[-1][0] == "error"
+        else:
+            assert failed.status_code == 500
+        assert len(client.get(f"/api/sessions/{session_id}").json()["messages"]) == 1
+
+        monkeypatch.undo()
+        assert client.post(url, headers=headers, **request).status_code == 200
+        messages = client.get(f"/api/sessions/{session_id}").json()["messages"]
+    assert [m["role"] for m in messages] == ["interviewer", "respondent", "interviewer"]
+
+
+def test_if_match_rejects_stale_version(client):
+    session_id = client.post("/api/sessions").json()["id"]
+    response = client.get(f"/api/sessions/{session_id}")
+    version = response.json()["version"]
+    assert response.headers["etag"] == f'"{version}"'
+
+    started = client.post(f"/api/sessions/{session_id}/start", headers={"If-Match": str(version)})
+    assert started.json()["version"] > version
+
+    stale = client.post(
+        f"/api/sessions/{session_id}/messages", json={"text": "Hi"}, headers={"If-Match": '"0"'}
+    )
+    assert stale.status_code == 409
+    patch = client.patch(
+        f"/api/sessions/{session_id}/config", json={}, headers={"If-Match": str(version)}
+    )
+    assert patch.status_code == 409
+    assert len(client.get(f"/api/sessions/{session_id}").json()["messages"]) == 1
+
+
+async def test_concurrent_messages_are_serialized(mock_backend):
+    import httpx
+
+    mock_backend.latency = 0.01
+    app = create_app(backend=mock_backend)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        session_id = (await client.post("/api/sessions")).json()["id"]
+        await client.post(f"/api/sessions/{session_id}/start")
+        url = f"/api/sessions/{session_id}/messages"
+        responses = await asyncio.gather(
+            *(client.post(url, json={"text": f"answer {i}"}) for i in range(5))
+        )
+        assert all(r.status_code == 200 for r in responses)
+        messages = (await client.get(f"/api/sessions/{session_id}")).json()["messages"]
+    # Each request's respondent message is immediately followed by its own reply
+    assert [m["role"] for m in messages] == ["interviewer"] + ["respondent", "interviewer"] * 5
+    assert sorted(r.json()["version"] for r in responses) == [4, 6, 8, 10, 12]
+
+
+def test_metrics_endpoint(client):
+    session_id = client.post("/api/sessions").json()["id"]
+    client.post(f"/api/sessions/{session_id}/start/stream")
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE interviewer_llm_latency_seconds histogram" in response.text
+    assert 'interviewer_llm_first_token_seconds_count{model="gpt-4o-mini"}' in response.text
+    assert "interviewer_llm_calls_in_flight 0" in response.text
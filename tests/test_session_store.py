@@ -0,0 +1,182 @@
+"""Tests for the server session stores."""
+
+import asyncio
+import time
+
+import pytest
+
+from interviewer.models import AgentConfig, Message
+from server.session import (
+    MemorySessionStore,
+    SessionBusyError,
+    SessionStore,
+    SQLiteSessionStore,
+    VersionConflictError,
+    create_session_store,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemorySessionStore()
+    else:
+        store = SQLiteSessionStore(tmp_path / "sessions.db")
+    yield store
+    store.close()
+
+
+async def test_session_lifecycle(store):
+    assert isinstance(store, SessionStore)
+    session = await store.create(interviewer_config=AgentConfig(system_prompt="custom"))
+    await store.add_message(session, Message(role="interviewer", text="Hello"))
+    await store.add_message(session, Message(role="respondent", text="Hi"))
+    session.status = "active"
+    await store.save(session)
+
+    loaded = await store.get(session.id)
+    assert loaded.interviewer_config.system_prompt == "custom"
+    assert [m.text for m in loaded.messages] == ["Hello", "Hi"]
+    assert loaded.status == "active"
+
+    assert await store.delete(session.id)
+    assert await store.get(session.id) is None
+    assert not await store.delete(session.id)
+
+
+async def test_writes_bump_version(store):
+    session = await store.create()
+    assert session.version == 0
+    await store.add_message(session, Message(role="interviewer", text="Hello"))
+    await store.save(session)
+    assert session.version == 2
+    assert (await store.get(session.id)).version == 2
+
+
+async def test_lock_serializes_writers(store):
+    session = await store.create()
+    order = []
+
+    async def write(name: str) -> None:
+        async with store.lock(session.id):
+            order.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name} end")
+
+    await asyncio.gather(write("a"), write("b"))
+    assert order == ["a start", "a end", "b start", "b end"]
+
+
+async def test_idempotent_responses(store):
+    session = await store.create()
+    assert await store.get_response(session.id, "key") is None
+    await store.put_response(session.id, "key", {"version": 1})
+    assert await store.get_response(session.id, "key") == {"version": 1}
+    assert await store.get_response(session.id, "other") is None
+
+
+async def test_memory_store_evicts_least_recently_used():
+    store = MemorySessionStore(max_sessions=2)
+    a, b = await store.create(), await store.create()
+    await store.get(a.id)
+    await store.create()
+    assert await store.get(b.id) is None
+    assert await store.get(a.id) is a
+    assert len(store) == 2
+
+
+async def test_memory_store_keeps_writes_to_evicted_session():
+    store = MemorySessionStore(max_sessions=1)
+    session = await store.create()
+    await store.create()  # evicts the session while a request still holds it
+    await store.add_message(session, Message(role="interviewer", text="Hello"))
+    assert await store.get(session.id) is session
+    assert [m.text for m in session.messages] == ["Hello"]
+
+
+async def test_memory_store_expires_idle_sessions():
+    store = MemorySessionStore(ttl=0.01)
+    session = await store.create()
+    await asyncio.sleep(0.02)
+    assert await store.get(session.id) is None
+
+
+async def test_sqlite_store_is_durable_and_append_only(tmp_path):
+    path = tmp_path / "sessions.db"
+    store = SQLiteSessionStore(path)
+    session = await store.create()
+    for i in range(3):
+        await store.add_message(session, Message(role="interviewer", text=str(i)))
+    store.close()
+
+    reopened = SQLiteSessionStore(path)
+    loaded = await reopened.get(session.id)
+    assert [m.text for m in loaded.messages] == ["0", "1", "2"]
+    rows = reopened._db.execute("SELECT seq FROM messages ORDER BY seq").fetchall()
+    assert rows == [(0,), (1,), (2,)]
+    reopened.close()
+
+
+async def test_sqlite_store_sees_writes_from_other_workers(tmp_path):
+    path = tmp_path / "sessions.db"
+    first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    session = await first.create()
+    assert (await second.get(session.id)).messages == []
+
+    await first.add_message(session, Message(role="interviewer", text="Hello"))
+    assert [m.text for m in (await second.get(session.id)).messages] == ["Hello"]
+    # Unchanged sessions are served from the in-memory cache
+    assert await second.get(session.id) is await second.get(session.id)
+    first.close()
+    second.close()
+
+
+def test_create_session_store(tmp_path, monkeypatch):
+    assert isinstance(create_session_store("memory"), MemorySessionStore)
+    store = create_session_store(f"sqlite:{tmp_path / 'sessions.db'}", ttl=60)
+    assert isinstance(store, SQLiteSessionStore)
+    assert store.ttl == 60
+    store.close()
+
+    monkeypatch.setenv("INTERVIEWER_MAX_SESSIONS", "5")
+    assert create_session_store().max_sessions == 5
+    with pytest.raises(ValueError):
+        create_session_store("redis://localhost")
+
+
+async def test_sqlite_store_rejects_stale_writes(tmp_path):
+    a = SQLiteSessionStore(tmp_path / "sessions.db")
+    b = SQLiteSessionStore(tmp_path / "sessions.db")
+    session = await a.create()
+    stale = await b.get(session.id)
+    await a.add_message(session, Message(role="interviewer", text="Hello"))
+
+    with pytest.raises(VersionConflictError):
+        await b.add_message(stale, Message(role="interviewer", text="Hello again"))
+    fresh = await b.get(session.id)
+    assert [m.text for m in fresh.messages] == ["Hello"]
+    await b.add_message(fresh, Message(role="respondent", text="Hi"))
+    assert fresh.version == 2
+
+
+async def test_sqlite_lock_excludes_other_workers(tmp_path):
+    a = SQLiteSessionStore(tmp_path / "sessions.db")
+    b = SQLiteSessionStore(tmp_path / "sessions.db", lock_timeout=0.05)
+    session = await a.create()
+    async with a.lock(session.id):
+        with pytest.raises(SessionBusyError):
+            async with b.lock(session.id):
+                pass
+    async with b.lock(session.id):
+        pass
+
+
+async def test_sqlite_lock_lease_expires(tmp_path):
+    a = SQLiteSessionStore(tmp_path / "sessions.db", lock_lease=0.05)
+    b = SQLiteSessionStore(tmp_path / "sessions.db", lock_timeout=1)
+    session = await a.create()
+    # A worker that dies holding the lock never renews or releases its lease
+    assert a._try_lease(session.id)
+    start = time.monotonic()
+    async with b.lock(session.id):
+        assert time.monotonic() - start >= 0.04
@@ -0,0 +1,104 @@
+"""Tests for Simulation.run, resuming and checkpointing."""
+
+import pytest
+
+from interviewer.checkpoint import CheckpointStore
+from interviewer.logging import TranscriptWriter, completed_simulation_ids
+from interviewer.models import AgentConfig, Message, Transcript
+from interviewer.simulation import Simulation, interview_plan
+
+
+@pytest.fixture
+def configs():
+    return (
+        AgentConfig(system_prompt="You are a test interviewer."),
+        AgentConfig(system_prompt="You are a test respondent."),
+    )
+
+
+def test_interview_plan():
+    plan = interview_plan(2)
+    assert len(plan) == 1 + 2 * 2 + 3
+    assert plan[0] == ("interviewer", "opening_message")
+    assert plan[-1] == ("interviewer", "end_of_interview")
+
+
+async def test_run_full_interview(mock_backend, configs):
+    transcript = await Simulation(backend=mock_backend).run(*configs, max_turns=2)
+    assert len(transcript.messages) == len(interview_plan(2))
+    assert [m.role for m in transcript.messages[:3]] == ["interviewer", "respondent", "interviewer"]
+    # last_question and end_of_interview are hardcoded, so two fewer LLM calls than messages
+    assert len(mock_backend.requests) == len(transcript.messages) - 2
+    assert transcript.total_output_tokens == 5 * len(mock_backend.requests)
+    assert transcript.ended_at is not None
+
+
+async def test_run_resumes_partial_transcript(mock_backend, configs):
+    partial = Transcript(
+        messages=[
+            Message(role="interviewer", text="Hello!"),
+            Message(role="respondent", text="Hi."),
+        ]
+    )
+    transcript = await Simulation(backend=mock_backend).run(
+        *configs, max_turns=1, transcript=partial
+    )
+    assert transcript.messages[0].text == "Hello!"
+    assert len(transcript.messages) == len(interview_plan(1))
+    # Resumes at the interviewer follow-up: one LLM call there plus the final respondent answer
+    assert len(mock_backend.requests) == 2
+
+
+async def test_checkpoint_after_every_message(mock_backend, configs, tmp_path):
+    store = CheckpointStore(tmp_path)
+    seen: list[int] = []
+
+    def on_checkpoint(t: Transcript):
+        store.save(1, t)
+        seen.append(len(t.messages))
+
+    await Simulation(backend=mock_backend).run(*configs, max_turns=1, on_checkpoint=on_checkpoint)
+    assert seen == list(range(1, len(interview_plan(1)) + 1))
+    assert len(store.load(1).messages) == len(interview_plan(1))
+
+    store.discard(1)
+    assert store.load(1) is None
+
+
+async def test_async_checkpoint_is_awaited(mock_backend, configs, tmp_path):
+    store = CheckpointStore(tmp_path)
+    saved: list[int] = []
+
+    async def on_checkpoint(t: Transcript):
+        await store.save_async(1, t)
+        saved.append(len(store.load(1).messages))
+
+    await Simulation(backend=mock_backend).run(*configs, max_turns=1, on_checkpoint=on_checkpoint)
+    assert saved == list(range(1, len(interview_plan(1)) + 1))
+
+
+def test_completed_simulation_ids(tmp_path):
+    path = tmp_path / "results.jsonl"
+    assert completed_simulation_ids(path) == set()
+    with TranscriptWriter(path) as writer:
+        writer.write(1, Transcript())
+        writer.write(3, Transcript())
+    assert completed_simulation_ids(path) == {1, 3}
+
+
+async def test_llm_calls_reference_transcript_messages(mock_backend, configs):
+    transcript = await Simulation(backend=mock_backend).run(*configs, max_turns=2)
+    assert all(call.messages == [] for call in transcript.llm_calls)
+    for i, sent in enumerate(mock_backend.requests):
+        assert transcript.call_messages(i) == sent["messages"]
+
+    # References survive a save/load round trip
+    reloaded = Transcript.model_validate_json(transcript.model_dump_json())
+    assert reloaded.call_messages(3) == mock_backend.requests[3]["messages"]
+
+
+async def test_call_messages_rejects_changed_system_prompt(mock_backend, configs):
+    transcript = await Simulation(backend=mock_backend).run(*configs, max_turns=1)
+    transcript.interviewer_config = AgentConfig(system_prompt="A different prompt")
+    with pytest.raises(ValueError, match="system prompt"):
+        transcript.call_messages(0)
@@ -0,0 +1,44 @@
+"""Tests for offline token counting and run estimates."""
+
+from interviewer import AgentConfig, Simulation, count_tokens, estimate_run
+from interviewer.backends import MockBackend
+from interviewer.metrics import call_metrics
+from interviewer.tokens import TOKENS_PER_MESSAGE, TOKENS_PER_REPLY, count_text_tokens
+
+
+def test_count_tokens_adds_chat_overhead():
+    api_messages = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hello"}]
+    text = count_text_tokens("sys", "gpt-4o-mini") + count_text_tokens("hello", "gpt-4o-mini")
+    overhead = 2 * TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+    assert count_tokens("gpt-4o-mini", api_messages) == text + overhead
+
+
+def test_text_counts_are_cached():
+    count_text_tokens.cache_clear()
+    api_messages = [{"role": "user", "content": f"message {i}"} for i in range(50)]
+    count_tokens("gpt-4o-mini", api_messages)
+    count_tokens("gpt-4o-mini", [*api_messages, {"role": "user", "content": "new"}])
+    info = count_text_tokens.cache_info()
+    assert (info.misses, info.hits) == (51, 50)
+
+
+async def test_estimate_bounds_a_real_run():
+    configs = [AgentConfig(system_prompt=p, max_tokens=40) for p in ("int", "resp")]
+    estimate = await estimate_run(*configs, max_turns=3, num_simulations=100)
+    assert estimate.calls_per_simulation == 8
+    assert estimate.total_tokens == 100 * (
+        estimate.input_tokens_per_simulation + estimate.output_tokens_per_simulation
+    )
+    assert estimate.cost_usd is not None
+
+    backend = MockBackend(output_tokens=(5, 40), seed=1)
+    transcript = await Simulation(backend=backend).run(*configs, max_turns=3)
+    assert transcript.total_input_tokens <= estimate.input_tokens_per_simulation
+    assert transcript.total_output_tokens <= estimate.output_tokens_per_simulation
+
+
+async def test_estimate_is_not_recorded_in_call_metrics():
+    configs = [AgentConfig(system_prompt=p) for p in ("int", "resp")]
+    calls = call_metrics.calls.get(model=configs[0].model, source="provider")
+    await estimate_run(*configs, max_turns=2, num_simulations=10)
+    assert call_metrics.calls.get(model=configs[0].model, source="provider") == calls
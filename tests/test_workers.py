@@ -0,0 +1,36 @@
+"""Tests for sharding a simulate run across worker processes."""
+
+from cli.simulate import Shard, run_sharded
+from interviewer.models import AgentConfig
+from interviewer.results_index import ResultsIndex
+from interviewer.retry import RetryPolicy
+from interviewer.simulation import interview_plan
+
+
+def _shard(n: int, **kwargs) -> Shard:
+    return Shard(
+        worker=0,
+        simulation_ids=list(range(1, n + 1)),
+        interviewer_config=AgentConfig(system_prompt="You are a test interviewer."),
+        respondent_config=AgentConfig(system_prompt="You are a test respondent."),
+        max_turns=1,
+        retry_policy=RetryPolicy(),
+        max_concurrency=2,
+        backend="mock",
+        mock_latency=0.0,
+        **kwargs,
+    )
+
+
+def test_workers_merge_into_one_file(tmp_path):
+    path = tmp_path / "results.jsonl"
+    run_sharded(_shard(7), workers=2, save_path=str(path), verbose=False)
+
+    with ResultsIndex(path) as index:
+        assert sorted(e.simulation_id for e in index.entries) == list(range(1, 8))
+        assert all(len(t.messages) == len(interview_plan(1)) for _, t in index)
+
+    # Resuming runs only the missing ids, still in one file
+    run_sharded(_shard(9, resume=True), workers=2, save_path=str(path), verbose=False)
+    with ResultsIndex(path) as index:
+        assert sorted(e.simulation_id for e in index.entries) == list(range(1, 10))